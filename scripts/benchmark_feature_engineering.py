@@ -0,0 +1,90 @@
+"""
+Benchmark FeatureEngineeringTransformer against per-column inserts.
+
+The reference implementation inserts every engineered column with
+X[name] = ..., like the transformer did before it built one block. Run with
+uv run python scripts/benchmark_feature_engineering.py
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import typer
+
+from src.preprocessing.feature_engineering import _COMPARISONS, FeatureEngineeringTransformer
+
+app = typer.Typer()
+
+
+def make_data(rows: int, columns: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        rng.integers(0, 1000, size=(rows, columns)).astype(np.float64),
+        columns=[f"x{i}" for i in range(columns)],
+    )
+
+
+def make_config(n_features: int, columns: int) -> dict:
+    """Config with about n_features engineered columns, spread evenly over the four kinds."""
+    per_kind = max(n_features // 4, 1)
+    col = [f"x{i % columns}" for i in range(per_kind)]
+    return {
+        "polynomial_features": [{"column": c, "degrees": [2]} for c in col],
+        "binary_indicators": [
+            {"name": f"ind{i}", "condition": {"column": c, "operator": ">", "value": 500}}
+            for i, c in enumerate(col)
+        ],
+        "log_transforms": list(dict.fromkeys(col)),
+        "interactions": [
+            {"name": f"int{i}", "columns": [c, f"x{(i + 1) % columns}"]} for i, c in enumerate(col)
+        ],
+    }
+
+
+def reference_transform(X: pd.DataFrame, config: dict) -> pd.DataFrame:
+    """One insert per engineered column."""
+    X = X.copy(deep=True)
+    for spec in config["polynomial_features"]:
+        for degree in spec["degrees"]:
+            X[f"{spec['column']}_squared"] = X[spec["column"]] ** degree
+    for spec in config["binary_indicators"]:
+        condition = spec["condition"]
+        compare = _COMPARISONS[condition["operator"]]
+        X[spec["name"]] = compare(X[condition["column"]], condition["value"]).astype(int)
+    for column in config["log_transforms"]:
+        X[f"{column}_log"] = np.log1p(X[column])
+    for spec in config["interactions"]:
+        X[spec["name"]] = X[spec["columns"][0]]
+        for col in spec["columns"][1:]:
+            X[spec["name"]] = X[spec["name"]] * X[col]
+    return X
+
+
+def best_of(repeats: int, func) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+@app.command()
+def main(rows: int = 20_000, columns: int = 80, repeats: int = 3) -> None:
+    X = make_data(rows, columns)
+    print(f"{rows:,} rows, {columns} input columns, best of {repeats}")
+    print(f"{'features':>8} {'reference':>11} {'block':>11} {'speedup':>8}")
+
+    for n_features in (8, 40, 100, 200, 400, 800):
+        config = make_config(n_features, columns)
+        transformer = FeatureEngineeringTransformer(config).fit(X)
+
+        reference = best_of(repeats, lambda: reference_transform(X, config))
+        block = best_of(repeats, lambda: transformer.transform(X))
+
+        print(f"{n_features:>8} {reference:>10.3f}s {block:>10.3f}s {reference / block:>7.1f}x")
+
+
+if __name__ == "__main__":
+    app()
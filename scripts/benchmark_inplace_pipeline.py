@@ -0,0 +1,69 @@
+"""
+Benchmark peak memory of fit_transform with and without preprocessing.inplace.
+
+Peak memory is measured with tracemalloc, which also tracks numpy buffers.
+Run with
+uv run python scripts/benchmark_inplace_pipeline.py
+"""
+
+import time
+import tracemalloc
+
+import numpy as np
+from omegaconf import open_dict
+import pandas as pd
+import typer
+
+from src.config.hydra_loader import load_config
+from src.config.paths import CONFIG_DIR
+from src.preprocessing.sklearn_pipeline_builder import build_pipeline
+
+app = typer.Typer()
+
+
+def make_data(rows: int, columns: int) -> pd.DataFrame:
+    """Wide numeric frame with 5% missing values."""
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(rows, columns))
+    values[rng.random(size=values.shape) < 0.05] = np.nan
+    df = pd.DataFrame(values, columns=[f"x{i}" for i in range(columns)])
+    df["Id"] = np.arange(rows)
+    df["SalePrice"] = rng.integers(100_000, 400_000, size=rows)
+    return df
+
+
+def measure(df: pd.DataFrame, inplace: bool) -> tuple[float, float]:
+    cfg = load_config(CONFIG_DIR, "config")
+    with open_dict(cfg):
+        cfg.preprocessing.inplace = inplace
+        cfg.preprocessing.pipeline = [
+            {"step": "drop_columns"},
+            {"step": "categorical_transforms"},
+            {"step": "imputation"},
+            {"step": "scaling"},
+        ]
+    pipeline = build_pipeline(cfg)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    pipeline.fit_transform(df)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2**20, elapsed
+
+
+@app.command()
+def main(rows: int = 50_000, columns: int = 500) -> None:
+    df = make_data(rows, columns)
+    size = df.memory_usage(deep=True).sum() / 2**20
+    print(f"{rows:,} rows x {df.shape[1]} columns, {size:.0f} MiB")
+    print(f"{'inplace':>8} {'peak':>10} {'peak/data':>10} {'time':>8}")
+
+    for inplace in (False, True):
+        peak, elapsed = measure(df, inplace)
+        print(f"{inplace!s:>8} {peak:>7.0f} MiB {peak / size:>9.1f}x {elapsed:>7.2f}s")
+
+
+if __name__ == "__main__":
+    app()
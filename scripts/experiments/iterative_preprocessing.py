@@ -10,6 +10,7 @@ from src.adapters.factory import create_data_repository
 from src.config.hydra_loader import load_config
 from src.config.paths import CONFIG_DIR
 from src.preprocessing.sklearn_pipeline_builder import build_pipeline
+from src.preprocessing.step_cache import fit_transform_cached, step_cache_from_config
 from src.utils.mlflow_setup import setup_mlflow
 
 
@@ -57,14 +58,19 @@ def main():
 
     # Build preprocessing pipeline from config
     pipeline = build_pipeline(cfg)
+    step_cache = step_cache_from_config(cfg.preprocessing)
 
     with mlflow.start_run(run_name=cfg.run_name):
         # Log config params
         mlflow.log_param("test_size", cfg.training.test_size)
         mlflow.log_param("random_state", cfg.training.random_state)
 
-        # Fit pipeline and transform data
-        X_train_transformed = pipeline.fit_transform(X_train)
+        # Fit pipeline and transform data, loading unchanged steps from the step cache
+        if step_cache is not None:
+            X_train_transformed = fit_transform_cached(pipeline, X_train, step_cache)
+            mlflow.log_metrics(step_cache.metrics())
+        else:
+            X_train_transformed = pipeline.fit_transform(X_train)
         X_test_transformed = pipeline.transform(X_test)
 
         # Select only numeric columns for simple experiment
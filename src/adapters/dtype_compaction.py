@@ -0,0 +1,214 @@
+from loguru import logger
+import numpy as np
+import pandas as pd
+import polars as pl
+
+# Integer widths tried in order, smallest first
+_INT_DTYPES = ("int8", "int16", "int32")
+
+# Dtypes the schema may cast to; other entries record columns that stay as they are
+_COMPACT_DTYPES = {"category", "float32", *_INT_DTYPES}
+
+
+def infer_compact_schema(df: pd.DataFrame, max_category_ratio: float = 0.5) -> dict[str, str]:
+    """
+    Infer the most compact safe dtype for every column.
+
+    - String columns with few distinct values become "category"
+    - Integer columns get the smallest integer width holding their range
+    - Float columns become "float32" if every value round-trips exactly
+
+    Args:
+        df: Frame to inspect
+        max_category_ratio: Maximum distinct/rows ratio for a string column to become categorical
+
+    Returns:
+        Mapping of every column name to its target dtype (the current dtype if it cannot shrink)
+    """
+    return {
+        column: _compact_dtype(df[column], max_category_ratio) or str(df[column].dtype)
+        for column in df.columns
+    }
+
+
+def infer_categories(df: pd.DataFrame, schema: dict[str, str]) -> dict[str, list]:
+    """
+    Sorted levels of every column the schema makes categorical.
+
+    Persisted next to the schema, they give every load and every batch the
+    same category dtype, so frames concatenate without falling back to object.
+
+    Args:
+        df: Frame to inspect
+        schema: Mapping of column name to target dtype, see infer_compact_schema
+
+    Returns:
+        Mapping of categorical column name to its sorted levels
+    """
+    return {
+        column: sorted(df[column].dropna().unique().tolist())
+        for column, target in schema.items()
+        if target == "category" and column in df.columns
+    }
+
+
+def infer_compact_schema_lazy(
+    lf: pl.LazyFrame, max_category_ratio: float = 0.5
+) -> tuple[dict[str, str], dict[str, list]]:
+    """
+    Infer the compact schema and the categories of a lazy frame.
+
+    Same rules as infer_compact_schema and infer_categories, computed with
+    streaming aggregates, so the whole dataset decides the schema without
+    being materialized. Integer columns with missing values load as floats
+    in pandas, so they follow the float rule.
+
+    Args:
+        lf: Lazy scan over the dataset
+        max_category_ratio: Maximum distinct/rows ratio for a string column to become categorical
+
+    Returns:
+        Tuple of (mapping of every column name to its target dtype, categories)
+    """
+    schema = lf.collect_schema()
+    pandas_dtypes = lf.head(0).collect().to_pandas().dtypes
+
+    aggregates = [pl.len().alias("__rows")]
+    for column, dtype in schema.items():
+        values = pl.col(column)
+        if dtype.is_integer():
+            aggregates += [
+                values.min().alias(f"{column}__min"),
+                values.max().alias(f"{column}__max"),
+                values.null_count().alias(f"{column}__nulls"),
+            ]
+        if dtype.is_numeric():
+            as_float = values.cast(pl.Float64)
+            roundtrip = as_float.cast(pl.Float32).cast(pl.Float64) == as_float
+            aggregates.append(roundtrip.all().alias(f"{column}__float32"))
+        elif dtype in (pl.String, pl.Categorical):
+            aggregates.append(values.drop_nulls().n_unique().alias(f"{column}__distinct"))
+    stats = lf.select(aggregates).collect().row(0, named=True)
+
+    compact = {}
+    for column, dtype in schema.items():
+        target = None
+        if dtype.is_integer() and not stats[f"{column}__nulls"]:
+            low, high = stats[f"{column}__min"], stats[f"{column}__max"]
+            for name in _INT_DTYPES:
+                if low is None or (np.iinfo(name).min <= low and high <= np.iinfo(name).max):
+                    target = name
+                    break
+        elif dtype.is_numeric() and stats[f"{column}__float32"]:
+            target = "float32"
+        elif f"{column}__distinct" in stats and stats["__rows"]:
+            if stats[f"{column}__distinct"] / stats["__rows"] <= max_category_ratio:
+                target = "category"
+        compact[column] = target or str(pandas_dtypes[column])
+
+    categorical = [column for column, target in compact.items() if target == "category"]
+    categories = {}
+    if categorical:
+        levels = lf.select(
+            pl.col(column).cast(pl.String).drop_nulls().unique().sort().implode()
+            for column in categorical
+        ).collect()
+        categories = {column: levels[column][0].to_list() for column in categorical}
+
+    return compact, categories
+
+
+def apply_compact_schema(
+    df: pd.DataFrame, schema: dict[str, str], categories: dict[str, list] | None = None
+) -> tuple[pd.DataFrame, dict[str, int]]:
+    """
+    Cast columns to their compact dtype and measure the memory saved.
+
+    A cast is skipped if it is no longer safe for this data (e.g. new rows
+    outside the int16 range, or a level missing from the persisted
+    categories), so applying a persisted schema never loses information.
+
+    Args:
+        df: Frame to compact
+        schema: Mapping of column name to target dtype, see infer_compact_schema
+        categories: Fixed levels of categorical columns, see infer_categories
+
+    Returns:
+        Tuple of (compacted frame, bytes saved per column)
+    """
+    categories = categories or {}
+    casts = {}
+    for column, target in schema.items():
+        if target not in _COMPACT_DTYPES or column not in df.columns:
+            continue
+        if target == "category" and column in categories:
+            dtype = pd.CategoricalDtype(categories[column])
+            if df[column].dtype == dtype:
+                continue
+            if not df[column].dropna().isin(dtype.categories).all():
+                logger.warning(
+                    f"Skipping cast of {column}: levels outside its persisted categories"
+                )
+                continue
+            casts[column] = dtype
+            continue
+        if target == str(df[column].dtype):
+            continue
+        if target != "category" and not _is_safe_cast(df[column], target):
+            logger.warning(f"Skipping unsafe cast of {column} to {target}")
+            continue
+        casts[column] = target
+
+    if not casts:
+        return df, {}
+
+    before = df[list(casts)].memory_usage(index=False, deep=True)
+    df = df.astype(casts)
+    after = df[list(casts)].memory_usage(index=False, deep=True)
+
+    return df, {column: int(before[column] - after[column]) for column in casts}
+
+
+def _compact_dtype(series: pd.Series, max_category_ratio: float) -> str | None:
+    """
+    Smallest safe dtype for a single column, or None to keep it.
+    """
+    if pd.api.types.is_bool_dtype(series):
+        return None
+
+    if pd.api.types.is_integer_dtype(series):
+        for dtype in _INT_DTYPES:
+            if _is_safe_cast(series, dtype):
+                return dtype
+        return None
+
+    if pd.api.types.is_float_dtype(series):
+        return "float32" if _is_safe_cast(series, "float32") else None
+
+    is_string = pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
+    if not is_string or len(series) == 0:
+        return None
+
+    if series.nunique(dropna=True) / len(series) <= max_category_ratio:
+        return "category"
+
+    return None
+
+
+def _is_safe_cast(series: pd.Series, dtype: str) -> bool:
+    """
+    Check that casting a numeric column to dtype keeps every value.
+    """
+    if not pd.api.types.is_numeric_dtype(series):
+        return False
+
+    values = series.to_numpy()
+
+    if dtype.startswith("int"):
+        if not pd.api.types.is_integer_dtype(series):
+            return False
+        info = np.iinfo(dtype)
+        return len(values) == 0 or (values.min() >= info.min and values.max() <= info.max)
+
+    narrowed = values.astype(dtype)
+    return bool(np.array_equal(narrowed.astype(values.dtype), values, equal_nan=True))
@@ -1,6 +1,7 @@
 from omegaconf import DictConfig
 
 from src.adapters.filesystem_repository import FileSystemDataRepository
+from src.adapters.sqlite_repository import SQLiteDataRepository
 from src.domain.ports.data_repository import DataRepository
 
 
@@ -10,10 +11,10 @@ def create_data_repository(config: DictConfig) -> DataRepository:
 
     Args:
         config: Hydra DictConfig containing repository configuration
-                Expected: config.data.repository_type = "filesystem" | "postgresql" | "s3" | "api"
+                Expected: config.data.repository_type = "filesystem" | "sqlite"
 
     Returns:
-        DataRepository implementation (e.g., FileSystemDataRepository)
+        DataRepository implementation (FileSystemDataRepository or SQLiteDataRepository)
 
     Raises:
         ValueError: If repository_type is unknown or unsupported
@@ -26,8 +27,10 @@ def create_data_repository(config: DictConfig) -> DataRepository:
     match repo_type:
         case "filesystem":
             return FileSystemDataRepository(config)
+        case "sqlite":
+            return SQLiteDataRepository(config)
         case _:
             raise ValueError(
                 f"Unknown repository type: '{repo_type}'. "
-                f"Supported types: filesystem (postgresql, s3, api coming soon)"
+                f"Supported types: filesystem, sqlite (postgresql, s3, api coming soon)"
             )
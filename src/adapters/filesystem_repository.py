@@ -1,12 +1,52 @@
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 import json
+import operator
+import os
 from pathlib import Path
+import shutil
+import threading
+import time
 
 from loguru import logger
+import numpy as np
 from omegaconf import DictConfig
 import pandas as pd
 import polars as pl
+import pyarrow as pa
+from pyarrow import feather
 
+from src.adapters.dtype_compaction import (
+    apply_compact_schema,
+    infer_categories,
+    infer_compact_schema,
+    infer_compact_schema_lazy,
+)
+from src.adapters.frame_cache import DEFAULT_MAX_BYTES, FrameCache, shared_frame_cache
 from src.config.paths import PROJECT_ROOT
+from src.domain.models.data_models import Aggregation, RowFilter
+from src.utils.fingerprint import file_fingerprint
+
+# Options passed to the CSV parser; part of the raw cache key
+RAW_CSV_OPTIONS = {
+    "try_parse_dates": True,
+    "infer_schema_length": 10000,
+    "null_values": "NA",
+}
+
+# Interim file suffixes that select the memory-mappable Arrow IPC format
+IPC_SUFFIXES = (".arrow", ".feather", ".ipc")
+
+DEFAULT_BATCH_ROWS = 100_000
+
+_OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
 
 
 class FileSystemDataRepository:
@@ -47,10 +87,64 @@ class FileSystemDataRepository:
                 getattr(data_config, "metadata_path", "data/interim/interim_metadata.json")
             )
 
+        # Binary sidecar cache of the parsed raw CSV, enabled by default
+        self.raw_cache = bool(getattr(data_config, "raw_cache", True))
+
+        # Row identity for append_raw and upsert_interim, indexed next to the metadata
+        self.id_column = getattr(data_config, "id_column", "Id")
+        self.id_index_path = self.metadata_path.with_name(
+            f"{self.metadata_path.stem}.id_index.npy"
+        )
+
+        # upsert_interim writes its rows as delta files, merged into the interim data at this count
+        self.delta_dir = self.interim_path.with_name(f"{self.interim_path.name}.deltas")
+        self.max_interim_deltas = int(getattr(data_config, "max_interim_deltas", 8))
+
+        # Process-wide LRU cache of loaded raw frames, shared by all repositories
+        cache_config = getattr(data_config, "frame_cache", None) or {}
+        self.frame_cache: FrameCache | None = None
+        if cache_config.get("enabled", True):
+            self.frame_cache = shared_frame_cache(
+                int(cache_config.get("max_bytes", DEFAULT_MAX_BYTES))
+            )
+
+        # Opt-in dtype compaction driven by the schema persisted in the metadata JSON
+        self.compact_dtypes = bool(getattr(data_config, "compact_dtypes", False))
+        self.max_category_ratio = float(getattr(data_config, "max_category_ratio", 0.5))
+        self.last_compaction_report: dict[str, int] = {}
+        # Dataset -> (schema, categories), read from the metadata or inferred once per process
+        self._dtype_schemas: dict[str, tuple[dict[str, str], dict[str, list]]] = {}
+
+        # Interim storage format: "parquet" or memory-mapped "ipc", defaults by file suffix
+        default_format = "ipc" if self.interim_path.suffix in IPC_SUFFIXES else "parquet"
+        self.interim_format = getattr(data_config, "interim_format", None) or default_format
+        if self.interim_format not in ("parquet", "ipc"):
+            raise ValueError(
+                f"Unknown interim format: '{self.interim_format}'. Supported formats: parquet, ipc"
+            )
+
+        # Parquet layout: optional hive partitioning, row group size, codec and statistics
+        parquet_config = getattr(data_config, "interim_parquet", None) or {}
+        self.partition_by = list(parquet_config.get("partition_by", None) or [])
+        self.row_group_size = parquet_config.get("row_group_size", None)
+        self.compression = parquet_config.get("compression", "snappy")
+        self.compression_level = parquet_config.get("compression_level", None)
+        self.statistics = bool(parquet_config.get("statistics", True))
+        if self.partition_by and self.interim_format == "ipc":
+            raise ValueError("Partitioned interim data requires the parquet interim format")
+
+        # Write interim data on a background thread, see save_interim
+        self.background_save = bool(getattr(data_config, "background_save", False))
+        self._save_executor: ThreadPoolExecutor | None = None
+        self._pending_save: Future | None = None
+
         logger.debug("FileSystemDataRepository initialized:")
         logger.debug(f"  Raw path: {self.raw_path}")
         logger.debug(f"  Interim path: {self.interim_path}")
         logger.debug(f"  Metadata path: {self.metadata_path}")
+        logger.debug(f"  Interim format: {self.interim_format}")
+        if self.partition_by:
+            logger.debug(f"  Interim partitioned by: {self.partition_by}")
 
     def _resolve_path(self, path_str: str) -> Path:
         """
@@ -67,46 +161,518 @@ class FileSystemDataRepository:
             path = PROJECT_ROOT / path
         return path
 
-    def load_raw(self) -> pd.DataFrame:
+    def load_raw(
+        self,
+        columns: list[str] | None = None,
+        exclude_columns: list[str] | None = None,
+        filters: list[RowFilter] | None = None,
+    ) -> pd.DataFrame:
         """
         Load raw dataset from CSV file.
 
         Uses Polars for efficient CSV parsing with automatic type inference,
         then converts to pandas for compatibility with sklearn.
 
+        If the raw cache is enabled, the parsed frame is stored as an Arrow IPC
+        sidecar next to the CSV and reused as long as the CSV and parse options
+        are unchanged.
+
+        Column selection and row filters are pushed into the lazy scan, so
+        excluded columns and filtered rows are never materialized.
+
+        With compact_dtypes enabled, columns are narrowed as described by the
+        persisted dtype schema, see _compact.
+
+        Args:
+            columns: Columns to load (default: all)
+            exclude_columns: Columns to skip
+            filters: Row filters, combined with AND
+
         Returns:
             pd.DataFrame: Raw house pricing data with all original features
         """
         logger.debug(f"Loading raw data from {self.raw_path}")
 
-        df = pl.read_csv(
-            self.raw_path,
-            try_parse_dates=True,
-            infer_schema_length=10000,
-            null_values="NA",
-        ).to_pandas()
+        def load() -> pd.DataFrame:
+            lf = self._apply_query(self._scan_raw(), columns, exclude_columns, filters)
+            return self._compact(lf.collect().to_pandas(), "raw")
+
+        df = self._cached_raw("pandas", columns, exclude_columns, filters, load)
 
         logger.debug(f"Loaded raw data: {df.shape[0]} rows, {df.shape[1]} columns")
         return df
 
-    def load_interim(self) -> pd.DataFrame:
+    def load_raw_polars(
+        self,
+        columns: list[str] | None = None,
+        exclude_columns: list[str] | None = None,
+        filters: list[RowFilter] | None = None,
+    ) -> pl.DataFrame:
+        """
+        Load raw dataset as a Polars DataFrame, without converting to pandas.
+
+        Args:
+            columns: Columns to load (default: all)
+            exclude_columns: Columns to skip
+            filters: Row filters, combined with AND
+
+        Returns:
+            pl.DataFrame: Raw house pricing data
+        """
+        logger.debug(f"Loading raw data from {self.raw_path}")
+
+        def load() -> pl.DataFrame:
+            return self._apply_query(self._scan_raw(), columns, exclude_columns, filters).collect()
+
+        df = self._cached_raw("polars", columns, exclude_columns, filters, load)
+
+        logger.debug(f"Loaded raw data: {df.shape[0]} rows, {df.shape[1]} columns")
+        return df
+
+    def _cached_raw(
+        self,
+        kind: str,
+        columns: list[str] | None,
+        exclude_columns: list[str] | None,
+        filters: list[RowFilter] | None,
+        load: Callable[[], pd.DataFrame | pl.DataFrame],
+    ) -> pd.DataFrame | pl.DataFrame:
+        """
+        Serve a raw load from the process-wide frame cache.
+
+        The key combines the resolved raw path, the fingerprint of the CSV and
+        its parse options and every load option, so a changed file or query
+        never hits a stale entry.
+
+        Args:
+            kind: "pandas" or "polars", the frame type returned by load
+            columns: Columns to load
+            exclude_columns: Columns to skip
+            filters: Row filters
+            load: Loads the frame on a cache miss
+
+        Returns:
+            The loaded frame
+        """
+        if self.frame_cache is None or not self.raw_path.exists():
+            return load()
+
+        key = (
+            kind,
+            str(self.raw_path.resolve()),
+            file_fingerprint(self.raw_path, **RAW_CSV_OPTIONS),
+            None if columns is None else tuple(columns),
+            tuple(exclude_columns or ()),
+            tuple(filters or ()),
+            self.compact_dtypes,
+        )
+        return self.frame_cache.get_or_load(key, load)
+
+    def iter_raw_batches(
+        self,
+        batch_rows: int = DEFAULT_BATCH_ROWS,
+        columns: list[str] | None = None,
+        exclude_columns: list[str] | None = None,
+        filters: list[RowFilter] | None = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream the raw dataset in batches of at most batch_rows rows.
+
+        The CSV (or its sidecar cache) is read by the Polars streaming engine,
+        so memory use is bounded by the batch size, not by the file size.
+        Column types are inferred once and are the same for every batch.
+
+        Args:
+            batch_rows: Maximum number of rows per batch
+            columns: Columns to load (default: all)
+            exclude_columns: Columns to skip
+            filters: Row filters, combined with AND
+
+        Yields:
+            pd.DataFrame: Consecutive batches of raw data
+        """
+        logger.debug(f"Streaming raw data from {self.raw_path} in batches of {batch_rows}")
+
+        lf = self._apply_query(self._scan_raw(), columns, exclude_columns, filters)
+        for batch in lf.collect_batches(chunk_size=batch_rows):
+            yield self._compact(batch.to_pandas(), "raw")
+
+    def raw_cache_path(self) -> Path:
+        """
+        Path of the binary sidecar cache for the current raw CSV.
+
+        The file name embeds a fingerprint of the CSV content, size, mtime and
+        parse options, so any change to either yields a new cache file.
+
+        Returns:
+            Path of the Arrow IPC cache file next to the raw CSV
+        """
+        fingerprint = file_fingerprint(self.raw_path, **RAW_CSV_OPTIONS)
+        return self.raw_path.with_name(f"{self.raw_path.name}.{fingerprint}.arrow")
+
+    def _scan_raw(self) -> pl.LazyFrame:
+        """
+        Lazily scan the raw data, through the sidecar cache if enabled.
+
+        Returns:
+            pl.LazyFrame: Lazy scan over the raw data
+        """
+        if self.raw_cache:
+            cache_path = self._ensure_raw_cache()
+            if cache_path is not None:
+                return pl.scan_ipc(cache_path)
+
+        return pl.scan_csv(self.raw_path, **RAW_CSV_OPTIONS)
+
+    def _ensure_raw_cache(self) -> Path | None:
         """
-        Load interim preprocessed dataset from Parquet file.
+        Make sure the sidecar cache for the raw CSV exists.
+
+        Returns:
+            Path of the cache file, or None if it could not be written
+        """
+        cache_path = self.raw_cache_path()
+
+        if cache_path.exists():
+            logger.debug(f"Raw cache hit: {cache_path}")
+            return cache_path
+
+        logger.debug(f"Raw cache miss, parsing {self.raw_path}")
+        try:
+            self._write_raw_cache(cache_path)
+        except OSError as e:
+            # A read-only data directory must not break loading
+            logger.warning(f"Could not write raw cache {cache_path}: {e}")
+            return None
+
+        return cache_path
+
+    def _write_raw_cache(self, cache_path: Path, scan: pl.LazyFrame | None = None) -> None:
+        """
+        Atomically write the raw cache and remove stale cache files.
+
+        The CSV is streamed into the cache file, so building it takes memory
+        bounded by the streaming engine's chunks, not by the file size.
+
+        Args:
+            cache_path: Target cache file
+            scan: Rows to write instead of the parsed CSV, e.g. the previous
+                cache followed by appended rows
+        """
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        if scan is None:
+            scan = pl.scan_csv(self.raw_path, **RAW_CSV_OPTIONS)
+        try:
+            scan.sink_ipc(tmp_path, compression="uncompressed")
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        for stale in self.raw_path.parent.glob(f"{self.raw_path.name}.*.arrow"):
+            if stale != cache_path:
+                logger.debug(f"Removing stale raw cache {stale}")
+                stale.unlink(missing_ok=True)
+
+    def load_interim(
+        self,
+        columns: list[str] | None = None,
+        exclude_columns: list[str] | None = None,
+        filters: list[RowFilter] | None = None,
+    ) -> pd.DataFrame:
+        """
+        Load interim preprocessed dataset from Parquet or Arrow IPC file.
+
+        In IPC format the file is memory-mapped and the returned frame uses
+        Arrow-backed dtypes that reference the mapped pages without copying,
+        so several processes reading the same file share the page cache.
+
+        For a hive-partitioned dataset, filters on partition columns skip whole
+        partition directories, and filters on other columns skip row groups
+        whose statistics cannot match.
+
+        Args:
+            columns: Columns to load (default: all)
+            exclude_columns: Columns to skip
+            filters: Row filters, combined with AND
 
         Returns:
             pd.DataFrame: Preprocessed data after initial transformations
         """
+        self.wait_for_save()
+        logger.debug(f"Loading interim data from {self.interim_path}")
+
+        # Delta files of upsert_interim are merged by the lazy scan
+        is_query = columns is not None or bool(exclude_columns) or bool(filters)
+        is_query = is_query or bool(self._delta_paths())
+
+        if self.interim_format == "ipc" and not is_query:
+            df = self._read_interim_ipc().to_pandas(types_mapper=pd.ArrowDtype)
+        elif self.interim_format == "ipc":
+            lf = self._apply_query(self._scan_interim(), columns, exclude_columns, filters)
+            df = lf.collect().to_pandas(use_pyarrow_extension_array=True)
+        elif not is_query and self.interim_path.is_file():
+            df = pd.read_parquet(self.interim_path)
+        else:
+            lf = self._apply_query(self._scan_interim(), columns, exclude_columns, filters)
+            df = lf.collect().to_pandas()
+
+        if self.interim_format != "ipc":
+            # IPC frames stay zero-copy, compaction would materialize them
+            df = self._compact(df, "interim")
+
+        logger.debug(f"Loaded interim data: {df.shape[0]} rows, {df.shape[1]} columns")
+        return df
+
+    def load_interim_polars(
+        self,
+        columns: list[str] | None = None,
+        exclude_columns: list[str] | None = None,
+        filters: list[RowFilter] | None = None,
+    ) -> pl.DataFrame:
+        """
+        Load interim preprocessed dataset as a Polars DataFrame.
+
+        In IPC format the file is memory-mapped and not copied.
+
+        Args:
+            columns: Columns to load (default: all)
+            exclude_columns: Columns to skip
+            filters: Row filters, combined with AND
+
+        Returns:
+            pl.DataFrame: Preprocessed data after initial transformations
+        """
+        self.wait_for_save()
         logger.debug(f"Loading interim data from {self.interim_path}")
 
-        df = pd.read_parquet(self.interim_path)
+        lf = self._apply_query(self._scan_interim(), columns, exclude_columns, filters)
+        df = lf.collect()
 
         logger.debug(f"Loaded interim data: {df.shape[0]} rows, {df.shape[1]} columns")
         return df
 
+    def iter_interim_batches(
+        self,
+        batch_rows: int = DEFAULT_BATCH_ROWS,
+        columns: list[str] | None = None,
+        exclude_columns: list[str] | None = None,
+        filters: list[RowFilter] | None = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream the interim dataset in batches of at most batch_rows rows.
+
+        Parquet is read row group by row group and IPC record batches are read
+        from the memory-mapped file, so memory use stays bounded.
+
+        Args:
+            batch_rows: Maximum number of rows per batch
+            columns: Columns to load (default: all)
+            exclude_columns: Columns to skip
+            filters: Row filters, combined with AND
+
+        Yields:
+            pd.DataFrame: Consecutive batches of interim data
+        """
+        self.wait_for_save()
+        logger.debug(f"Streaming interim data from {self.interim_path} in batches of {batch_rows}")
+
+        lf = self._apply_query(self._scan_interim(), columns, exclude_columns, filters)
+        for batch in lf.collect_batches(chunk_size=batch_rows):
+            yield batch.to_pandas(use_pyarrow_extension_array=self.interim_format == "ipc")
+
+    def _scan_interim(self) -> pl.LazyFrame:
+        """
+        Lazily scan the interim data, with the delta files of upsert_interim.
+
+        A row is replaced when a later delta file holds its id, so the scan
+        gives the same rows as rewriting the data on every upsert.
+
+        Returns:
+            pl.LazyFrame: Lazy scan over the interim data
+        """
+        if self.interim_format == "ipc":
+            base = pl.scan_ipc(self.interim_path, memory_map=True)
+        else:
+            # A directory is a hive-partitioned dataset written by save_interim
+            base = pl.scan_parquet(self.interim_path, hive_partitioning=self.interim_path.is_dir())
+
+        deltas = self._delta_paths()
+        if not deltas:
+            return base
+
+        scans = [base] + [self._scan_delta(path) for path in deltas]
+        delta_ids = [self._scan_delta(path).select(self.id_column).collect() for path in deltas]
+        parts = []
+        for position, scan in enumerate(scans):
+            # scans[position] is replaced by the delta files after it
+            if position < len(deltas):
+                replaced = pl.concat(delta_ids[position:])[self.id_column]
+                scan = scan.filter(~pl.col(self.id_column).is_in(replaced.implode()))
+            parts.append(scan)
+        return pl.concat(parts, how="diagonal_relaxed")
+
+    def _delta_paths(self) -> list[Path]:
+        """Delta files written by upsert_interim, oldest first."""
+        if not self.delta_dir.is_dir():
+            return []
+        suffix = ".arrow" if self.interim_format == "ipc" else ".parquet"
+        return sorted(self.delta_dir.glob(f"delta-*{suffix}"))
+
+    def _scan_delta(self, path: Path) -> pl.LazyFrame:
+        if self.interim_format == "ipc":
+            return pl.scan_ipc(path, memory_map=True)
+        return pl.scan_parquet(path)
+
+    def _read_interim_ipc(self) -> pa.Table:
+        """
+        Memory-map the interim Arrow IPC file.
+
+        Returns:
+            pa.Table: Table whose buffers point into the mapped file
+        """
+        source = pa.memory_map(str(self.interim_path), "r")
+        return pa.ipc.open_file(source).read_all()
+
+    @staticmethod
+    def _apply_query(
+        lf: pl.LazyFrame,
+        columns: list[str] | None,
+        exclude_columns: list[str] | None,
+        filters: list[RowFilter] | None,
+    ) -> pl.LazyFrame:
+        """
+        Push column selection and row filters into a lazy scan.
+
+        Filters on columns that do not exist are skipped, like the outlier
+        removal they replace. Filters are applied before the projection, so they
+        may reference columns that are not returned.
+
+        Args:
+            lf: Lazy scan
+            columns: Columns to keep (default: all)
+            exclude_columns: Columns to drop
+            filters: Row filters, combined with AND
+
+        Returns:
+            pl.LazyFrame: Query with projection and predicate applied
+        """
+        schema = lf.collect_schema().names()
+
+        for row_filter in filters or []:
+            if row_filter.column not in schema:
+                logger.debug(f"Skipping filter on missing column {row_filter.column}")
+                continue
+            compare = _OPERATORS[row_filter.operator]
+            lf = lf.filter(compare(pl.col(row_filter.column), row_filter.value))
+
+        if columns is not None:
+            lf = lf.select(columns)
+        if exclude_columns:
+            lf = lf.select(pl.exclude(list(exclude_columns)))
+
+        return lf
+
+    def aggregate(
+        self,
+        aggregations: list[Aggregation],
+        group_by: list[str] | None = None,
+        filters: list[RowFilter] | None = None,
+        dataset: str = "raw",
+    ) -> pd.DataFrame:
+        """
+        Compute aggregates without materializing the dataset.
+
+        The filters and aggregations run inside the lazy scan, so only the
+        aggregated rows are collected.
+
+        Args:
+            aggregations: Aggregates to compute
+            group_by: Columns to group by (default: aggregate all rows)
+            filters: Row filters, combined with AND
+            dataset: "raw" or "interim"
+
+        Returns:
+            pd.DataFrame: One row per group, sorted by the group columns
+        """
+        if dataset == "raw":
+            lf = self._scan_raw()
+        elif dataset == "interim":
+            self.wait_for_save()
+            lf = self._scan_interim()
+        else:
+            raise ValueError(f"Unknown dataset: '{dataset}'. Supported datasets: raw, interim")
+
+        lf = self._apply_query(lf, None, None, filters)
+        # Aggregation functions are named like the Polars expression methods
+        exprs = [
+            getattr(pl.col(aggregation.column), aggregation.function)().alias(aggregation.name)
+            for aggregation in aggregations
+        ]
+
+        if group_by:
+            lf = lf.group_by(group_by).agg(exprs).sort(group_by)
+        else:
+            lf = lf.select(exprs)
+
+        return lf.collect().to_pandas()
+
     def save_interim(self, df: pd.DataFrame, metadata: dict) -> None:
         """
         Save interim preprocessed dataset with metadata.
 
+        Writes Parquet, or uncompressed Arrow IPC when the interim format is "ipc".
+        With partition_by configured, the Parquet output is a hive-partitioned
+        directory (e.g. interim.parquet/YrSold=2008/0.parquet), grouped by partition.
+
+        Data and metadata are written to temporary files and renamed into place,
+        so readers never see a partially written file. Write duration, bytes
+        written and compression ratio are stored under metadata["write_stats"].
+
+        With background_save enabled the write runs on a background thread and
+        this method returns immediately; df must not be modified until the save
+        is done. Loads wait for a pending save, and wait_for_save() re-raises
+        its error, if any.
+
+        Args:
+            df: Preprocessed dataframe to save
+            metadata: Dictionary containing preprocessing metadata
+        """
+        if not self.background_save:
+            self._save_interim(df, metadata)
+            return
+
+        # Surface the error of a previous save before queueing the next one
+        self.wait_for_save()
+        if self._save_executor is None:
+            self._save_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="save_interim"
+            )
+        self._pending_save = self._save_executor.submit(self._save_interim, df, metadata)
+        self._pending_save.add_done_callback(self._log_save_error)
+        logger.debug(f"Saving interim data to {self.interim_path} in the background")
+
+    def wait_for_save(self) -> None:
+        """
+        Block until a background save_interim has finished.
+
+        Raises:
+            Exception: The error raised by the background save, if it failed
+        """
+        pending, self._pending_save = self._pending_save, None
+        if pending is not None:
+            pending.result()
+
+    @staticmethod
+    def _log_save_error(future: Future) -> None:
+        """Log a background save failure even if nobody waits for it."""
+        if future.exception() is not None:
+            logger.error(f"Background save of interim data failed: {future.exception()}")
+
+    def _save_interim(self, df: pd.DataFrame, metadata: dict) -> None:
+        """
+        Write the interim data and its metadata, see save_interim.
+
         Args:
             df: Preprocessed dataframe to save
             metadata: Dictionary containing preprocessing metadata
@@ -114,19 +680,404 @@ class FileSystemDataRepository:
         # Ensure directory exists
         self.interim_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Save dataframe as Parquet
         logger.debug(f"Saving preprocessed data to {self.interim_path}")
-        df.to_parquet(self.interim_path, index=False)
+        start = time.perf_counter()
 
-        # Save metadata as JSON
-        logger.debug(f"Saving preprocessing metadata to {self.metadata_path}")
-        with open(self.metadata_path, "w") as f:
-            json.dump(metadata, f, indent=2)
+        tmp_path = _temp_path(self.interim_path)
+        try:
+            if self.interim_format == "ipc":
+                # Uncompressed so that readers can memory-map the buffers directly
+                feather.write_feather(df, tmp_path, compression="uncompressed")
+            elif self.partition_by:
+                self._write_partitioned(df, tmp_path)
+            else:
+                df.to_parquet(
+                    tmp_path,
+                    index=False,
+                    compression=self.compression,
+                    compression_level=self.compression_level,
+                    row_group_size=self.row_group_size,
+                    write_statistics=self.statistics,
+                )
+            bytes_written = _disk_usage(tmp_path)
+            self._replace_interim(tmp_path)
+            # The new data already holds every upserted row
+            _remove(self.delta_dir)
+        except BaseException:
+            _remove(tmp_path)
+            raise
+
+        duration = time.perf_counter() - start
+        bytes_in_memory = int(df.memory_usage(index=False, deep=True).sum())
+        write_stats = {
+            "format": self.interim_format,
+            "compression": "uncompressed" if self.interim_format == "ipc" else self.compression,
+            "compression_level": None if self.interim_format == "ipc" else self.compression_level,
+            "duration_seconds": round(duration, 6),
+            "bytes_in_memory": bytes_in_memory,
+            "bytes_written": bytes_written,
+            "compression_ratio": round(bytes_in_memory / bytes_written, 4)
+            if bytes_written
+            else None,
+        }
+        metadata = {**metadata, "write_stats": write_stats}
+
+        self._write_id_index(df)
+
+        self._write_metadata({**metadata, **self._dtype_metadata(df)})
 
         logger.info(
-            f"Saved interim data: {df.shape[0]} rows, {df.shape[1]} columns to {self.interim_path}"
+            f"Saved interim data: {df.shape[0]} rows, {df.shape[1]} columns to {self.interim_path} "
+            f"({bytes_written:,} bytes, ratio {write_stats['compression_ratio']}, {duration:.3f}s)"
+        )
+
+    def append_raw(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Append rows with an unseen id to the raw CSV.
+
+        Rows whose id is already in the raw data are skipped, and of duplicate
+        ids within df the last row wins. Columns are aligned to the raw schema
+        and cast to its types, so the CSV keeps parsing the same way; columns
+        missing from df are written as NA.
+
+        Args:
+            df: New raw rows, e.g. a month of sales
+
+        Returns:
+            pd.DataFrame: The rows that were appended
+
+        Raises:
+            ValueError: If a value would change when cast to the raw type of its
+                column, e.g. 1.5 in an integer column; nothing is appended then
+        """
+        new_rows = df.drop_duplicates(subset=self.id_column, keep="last")
+
+        if not self.raw_path.exists():
+            self.raw_path.parent.mkdir(parents=True, exist_ok=True)
+            pl.from_pandas(new_rows).write_csv(self.raw_path, null_value="NA")
+            logger.info(f"Created {self.raw_path} with {len(new_rows)} rows")
+            return new_rows.reset_index(drop=True)
+
+        raw = self._scan_raw()
+        schema = raw.collect_schema()
+        existing_ids = raw.select(self.id_column).collect()[self.id_column]
+        new_rows = new_rows[~new_rows[self.id_column].isin(existing_ids.to_list())]
+
+        if new_rows.empty:
+            logger.info(f"No new rows to append to {self.raw_path}")
+            return new_rows.reset_index(drop=True)
+
+        extra = [column for column in new_rows.columns if column not in schema]
+        if extra:
+            logger.warning(f"Ignoring columns not in the raw data: {extra}")
+
+        batch = _cast_to_schema(pl.from_pandas(new_rows), schema)
+
+        previous_cache = self.raw_cache_path() if self.raw_cache else None
+        with open(self.raw_path, "rb+") as f:
+            # Terminate a last line written without a newline
+            f.seek(0, os.SEEK_END)
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+            batch.write_csv(f, include_header=False, null_value="NA")
+
+        logger.info(f"Appended {len(new_rows)} new rows to {self.raw_path}")
+        self._extend_raw_cache(previous_cache, batch)
+        self._refresh_raw_schema()
+        return new_rows.reset_index(drop=True)
+
+    def _extend_raw_cache(self, previous_cache: Path | None, batch: pl.DataFrame) -> None:
+        """
+        Write the raw cache of the appended CSV from the previous cache.
+
+        The appended rows were cast to the raw schema, so the previous cache
+        followed by them equals the parsed CSV without parsing it again.
+
+        Args:
+            previous_cache: Cache file of the CSV before the append, if any
+            batch: Appended rows in the raw schema
+        """
+        if previous_cache is None or not previous_cache.exists():
+            return
+        cache_path = self.raw_cache_path()
+        scan = pl.concat([pl.scan_ipc(previous_cache), batch.lazy()])
+        try:
+            self._write_raw_cache(cache_path, scan)
+        except OSError as e:
+            # The next load parses the CSV instead
+            logger.warning(f"Could not extend raw cache {cache_path}: {e}")
+
+    def upsert_interim(self, df: pd.DataFrame, metadata: dict | None = None) -> dict[str, int]:
+        """
+        Insert or replace interim rows by id.
+
+        The id hash index next to the metadata file tells which ids already
+        exist without reading the interim data. The rows are written as a new
+        delta file next to the interim data, so an upsert costs the size of
+        df, not of the whole dataset; loads replace older rows with the same
+        id, see _scan_interim. Once there are max_interim_deltas delta files,
+        everything is merged and written like save_interim. The previous
+        metadata is kept, updated with metadata and the row counts under
+        "ingestion".
+
+        Args:
+            df: Transformed rows, must contain the id column
+            metadata: Metadata entries to add or update
+
+        Returns:
+            dict: Number of rows "inserted" and "updated"
+        """
+        self.wait_for_save()
+        if self.id_column not in df.columns:
+            raise ValueError(f"Cannot upsert rows without id column '{self.id_column}'")
+
+        df = df.drop_duplicates(subset=self.id_column, keep="last")
+        index = self._load_id_index()
+        hashes = _hash_ids(df[self.id_column])
+        exists = np.isin(hashes, index)
+        counts = {"inserted": int((~exists).sum()), "updated": int(exists.sum())}
+
+        if not self.interim_path.exists():
+            self._save_interim(df, {**(metadata or {}), "ingestion": counts})
+            return counts
+
+        previous = self._read_metadata() if self.metadata_path.exists() else {}
+        metadata = {**previous, **(metadata or {}), "ingestion": counts}
+
+        deltas = self._delta_paths()
+        self.delta_dir.mkdir(parents=True, exist_ok=True)
+        suffix = ".arrow" if self.interim_format == "ipc" else ".parquet"
+        delta_path = self.delta_dir / f"delta-{len(deltas) + 1:06d}{suffix}"
+        tmp_path = _temp_path(delta_path)
+        try:
+            if self.interim_format == "ipc":
+                feather.write_feather(
+                    df.reset_index(drop=True), tmp_path, compression="uncompressed"
+                )
+            else:
+                df.to_parquet(tmp_path, index=False, compression=self.compression)
+            os.replace(tmp_path, delta_path)
+        except BaseException:
+            _remove(tmp_path)
+            raise
+
+        if len(deltas) + 1 >= self.max_interim_deltas:
+            logger.info(f"Merging {len(deltas) + 1} delta files into {self.interim_path}")
+            self._save_interim(self._scan_interim().collect().to_pandas(), metadata)
+        else:
+            self._store_id_index(np.union1d(index, hashes))
+            self._write_metadata(metadata)
+
+        logger.info(
+            f"Upserted interim data: {counts['inserted']} inserted, {counts['updated']} updated"
+        )
+        return counts
+
+    def _load_id_index(self) -> np.ndarray:
+        """
+        Sorted hashes of the interim ids, rebuilt from the data if the index is missing.
+
+        Returns:
+            np.ndarray: Sorted uint64 id hashes, empty without interim data
+        """
+        if self.id_index_path.exists():
+            return np.load(self.id_index_path)
+        if not self.interim_path.exists():
+            return np.empty(0, dtype=np.uint64)
+
+        logger.debug(f"Rebuilding id index from {self.interim_path}")
+        ids = self._scan_interim().select(self.id_column).collect()[self.id_column]
+        return np.unique(_hash_ids(ids.to_pandas()))
+
+    def _write_id_index(self, df: pd.DataFrame) -> None:
+        """
+        Atomically write the sorted id hashes of the saved interim data.
+
+        Args:
+            df: Saved interim data
+        """
+        if self.id_column not in df.columns:
+            self.id_index_path.unlink(missing_ok=True)
+            return
+
+        self._store_id_index(np.unique(_hash_ids(df[self.id_column])))
+
+    def _store_id_index(self, hashes: np.ndarray) -> None:
+        """
+        Atomically write sorted id hashes.
+
+        Args:
+            hashes: Sorted unique uint64 id hashes
+        """
+        tmp_path = _temp_path(self.id_index_path)
+        with open(tmp_path, "wb") as f:
+            np.save(f, hashes)
+        os.replace(tmp_path, self.id_index_path)
+
+    def _write_partitioned(self, df: pd.DataFrame, path: Path) -> None:
+        """
+        Write the interim data as a hive-partitioned Parquet dataset.
+
+        Partition columns are also kept inside the files, so their dtypes and
+        the column order survive a round trip.
+
+        Args:
+            df: Preprocessed dataframe to save
+            path: Dataset directory to create
+        """
+        pl.from_pandas(df).write_parquet(
+            path,
+            partition_by=self.partition_by,
+            compression=self.compression,
+            compression_level=self.compression_level,
+            row_group_size=self.row_group_size,
+            statistics=self.statistics,
         )
 
+    def _replace_interim(self, tmp_path: Path) -> None:
+        """
+        Move a fully written file or dataset directory to the interim path.
+
+        Replacing a file is a single atomic rename. A directory on either side
+        cannot be renamed over, so the old data is first renamed aside and
+        deleted after the new data is in place.
+
+        Args:
+            tmp_path: Temporary file or directory holding the new interim data
+        """
+        old_path = None
+        if self.interim_path.is_dir() or (tmp_path.is_dir() and self.interim_path.exists()):
+            old_path = self.interim_path.with_name(f"{self.interim_path.name}.{os.getpid()}.old")
+            os.replace(self.interim_path, old_path)
+
+        os.replace(tmp_path, self.interim_path)
+
+        if old_path is not None:
+            _remove(old_path)
+
+    def _dtype_metadata(self, df: pd.DataFrame) -> dict:
+        """
+        Dtype schemas to persist with saved interim data.
+
+        The raw schema is kept as persisted, or as inferred by an earlier load.
+        With compact_dtypes, the interim schema and categories are inferred
+        from the saved frame, so the next load does not have to scan it.
+
+        Args:
+            df: Saved interim data
+
+        Returns:
+            dict: The "dtype_schema" and "dtype_categories" metadata entries
+        """
+        previous = self._read_metadata() if self.metadata_path.exists() else {}
+        schemas = dict(previous.get("dtype_schema", {}))
+        categories = dict(previous.get("dtype_categories", {}))
+        schemas.pop("interim", None)
+        categories.pop("interim", None)
+        if "raw" in self._dtype_schemas:
+            schemas["raw"], categories["raw"] = self._dtype_schemas["raw"]
+
+        self._dtype_schemas.pop("interim", None)
+        if self.compact_dtypes:
+            schema = infer_compact_schema(df, self.max_category_ratio)
+            self._dtype_schemas["interim"] = (schema, infer_categories(df, schema))
+            schemas["interim"], categories["interim"] = self._dtype_schemas["interim"]
+
+        if not schemas:
+            return {}
+        return {"dtype_schema": schemas, "dtype_categories": categories}
+
+    def _refresh_raw_schema(self) -> None:
+        """
+        Infer the raw dtype schema again after appending rows, which may bring new levels.
+
+        A persisted raw schema is rewritten; otherwise the next load infers it.
+        """
+        self._dtype_schemas.pop("raw", None)
+        if not self.compact_dtypes or not self.metadata_path.exists():
+            return
+        metadata = self._read_metadata()
+        if "raw" not in metadata.get("dtype_schema", {}):
+            return
+
+        schema, categories = infer_compact_schema_lazy(self._scan_raw(), self.max_category_ratio)
+        self._dtype_schemas["raw"] = (schema, categories)
+        metadata["dtype_schema"]["raw"] = schema
+        metadata.setdefault("dtype_categories", {})["raw"] = categories
+        self._write_metadata(metadata)
+
+    def _write_metadata(self, metadata: dict) -> None:
+        """
+        Atomically save metadata as JSON.
+
+        Args:
+            metadata: Dictionary containing preprocessing metadata
+        """
+        logger.debug(f"Saving preprocessing metadata to {self.metadata_path}")
+        self.metadata_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = _temp_path(self.metadata_path)
+        with open(tmp_path, "w") as f:
+            json.dump(metadata, f, indent=2)
+        os.replace(tmp_path, self.metadata_path)
+
+    def _compact(self, df: pd.DataFrame, dataset: str) -> pd.DataFrame:
+        """
+        Narrow dtypes of a loaded frame if compact_dtypes is enabled.
+
+        Every load and every batch of a dataset gets the same fixed schema,
+        see _dtype_schema, so categorical columns share one dtype and batches
+        concatenate without falling back to object. The bytes saved per column
+        are logged and kept in last_compaction_report.
+
+        Args:
+            df: Loaded frame
+            dataset: Schema key, "raw" or "interim"
+
+        Returns:
+            pd.DataFrame: Frame with compact dtypes
+        """
+        if not self.compact_dtypes:
+            return df
+
+        schema, categories = self._dtype_schema(dataset)
+        df, report = apply_compact_schema(df, schema, categories)
+        self.last_compaction_report = report
+
+        for column, saved in report.items():
+            logger.debug(f"  Compacted {column} to {schema[column]}: {saved:,} bytes saved")
+        logger.info(f"Dtype compaction saved {sum(report.values()):,} bytes on {dataset} data")
+
+        return df
+
+    def _dtype_schema(self, dataset: str) -> tuple[dict[str, str], dict[str, list]]:
+        """
+        Fixed compaction schema and categories of a dataset.
+
+        The schema persisted under metadata["dtype_schema"][dataset] (with its
+        categories under metadata["dtype_categories"][dataset]) is used as is.
+        Without one, it is inferred from the whole dataset in a streaming
+        pass and kept in memory; it is only written to the metadata when data
+        is saved, never as a side effect of a read.
+
+        Args:
+            dataset: Schema key, "raw" or "interim"
+
+        Returns:
+            Tuple of (mapping of column name to target dtype, categories)
+        """
+        if dataset not in self._dtype_schemas:
+            metadata = self._read_metadata() if self.metadata_path.exists() else {}
+            schema = metadata.get("dtype_schema", {}).get(dataset)
+            if schema is not None:
+                categories = metadata.get("dtype_categories", {}).get(dataset, {})
+            else:
+                lf = self._scan_raw() if dataset == "raw" else self._scan_interim()
+                schema, categories = infer_compact_schema_lazy(lf, self.max_category_ratio)
+            self._dtype_schemas[dataset] = (schema, categories)
+        return self._dtype_schemas[dataset]
+
     def load_metadata(self) -> dict:
         """
         Load preprocessing metadata from JSON file.
@@ -134,6 +1085,11 @@ class FileSystemDataRepository:
         Returns:
             dict: Metadata about the preprocessing pipeline
         """
+        self.wait_for_save()
+        return self._read_metadata()
+
+    def _read_metadata(self) -> dict:
+        """Read the metadata JSON without waiting for a pending save."""
         logger.debug(f"Loading metadata from {self.metadata_path}")
 
         with open(self.metadata_path, "r") as f:
@@ -141,3 +1097,63 @@ class FileSystemDataRepository:
 
         logger.debug(f"Loaded metadata with keys: {list(metadata.keys())}")
         return metadata
+
+
+def _cast_to_schema(batch: pl.DataFrame, schema: pl.Schema) -> pl.DataFrame:
+    """
+    Cast rows to the raw schema, failing instead of changing any value.
+
+    Args:
+        batch: New rows
+        schema: Schema of the raw data
+
+    Returns:
+        pl.DataFrame: batch with exactly the columns of schema, missing ones null
+
+    Raises:
+        ValueError: If a value does not fit the raw column type, e.g. 1.5 in an integer column
+    """
+    columns = []
+    for column, dtype in schema.items():
+        if column not in batch.columns:
+            columns.append(pl.Series(column, [None] * len(batch), dtype=dtype))
+            continue
+        values = batch[column]
+        try:
+            cast = values.cast(dtype, strict=True)
+            # strict only rejects values that fail to convert, not truncated ones
+            lossy = (cast.cast(values.dtype, strict=True) != values).fill_null(False).any()
+        except pl.exceptions.PolarsError as e:
+            raise ValueError(
+                f"Column '{column}' of type {values.dtype} does not fit the raw type {dtype}"
+            ) from e
+        if lossy:
+            raise ValueError(
+                f"Column '{column}' has values that would change when cast to the raw type {dtype}"
+            )
+        columns.append(cast)
+    return pl.DataFrame(columns)
+
+
+def _temp_path(path: Path) -> Path:
+    """Sibling path to write to before renaming over path."""
+    return path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def _disk_usage(path: Path) -> int:
+    """Size in bytes of a file, or of all files below a directory."""
+    if path.is_dir():
+        return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+    return path.stat().st_size
+
+
+def _hash_ids(ids: pd.Series) -> np.ndarray:
+    """64-bit hashes of id values, stable across processes."""
+    return pd.util.hash_array(ids.to_numpy())
+
+
+def _remove(path: Path) -> None:
+    if path.is_dir():
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        path.unlink(missing_ok=True)
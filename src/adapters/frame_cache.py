@@ -0,0 +1,128 @@
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+import threading
+
+from loguru import logger
+import pandas as pd
+import polars as pl
+
+DEFAULT_MAX_BYTES = 1 << 30
+
+Frame = pd.DataFrame | pl.DataFrame
+
+
+class FrameCache:
+    """
+    Thread-safe LRU cache of loaded frames with a memory budget.
+
+    Entries are evicted least recently used first until the total size of the
+    cached frames fits into max_bytes. A frame larger than the whole budget is
+    returned but not cached.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[Frame, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of the cached frames."""
+        return sum(size for _, size in self._entries.values())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_load(self, key: Hashable, load: Callable[[], Frame]) -> Frame:
+        """
+        Return the cached frame for key, loading and caching it on a miss.
+
+        pandas frames are returned as deep copies, so callers may modify
+        them in place (e.g. the inplace preprocessing mode) without touching
+        the cached frame. Copying is still far cheaper than parsing again.
+
+        Args:
+            key: Hashable cache key, must identify the data and all load options
+            load: Called without arguments on a miss
+
+        Returns:
+            The cached or freshly loaded frame
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _share(entry[0])
+            self.misses += 1
+
+        # Loaded outside the lock, so other keys can be served meanwhile
+        frame = load()
+        size = _frame_size(frame)
+
+        with self._lock:
+            if size <= self.max_bytes:
+                self._entries[key] = (frame, size)
+                self._entries.move_to_end(key)
+                self._evict()
+            else:
+                logger.debug(f"Not caching frame of {size:,} bytes, budget is {self.max_bytes:,}")
+
+        return _share(frame)
+
+    def resize(self, max_bytes: int) -> None:
+        """
+        Change the memory budget, evicting entries if needed.
+
+        Args:
+            max_bytes: New budget in bytes
+        """
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self) -> None:
+        """Remove all entries and reset the hit and miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _evict(self) -> None:
+        total = self.size_bytes
+        while total > self.max_bytes and self._entries:
+            key, (_, size) = self._entries.popitem(last=False)
+            total -= size
+            logger.debug(f"Evicted {key} ({size:,} bytes) from frame cache")
+
+
+# Shared by all repositories of the process
+_shared_cache = FrameCache()
+
+
+def shared_frame_cache(max_bytes: int | None = None) -> FrameCache:
+    """
+    The process-wide frame cache.
+
+    Args:
+        max_bytes: Memory budget to apply (default: keep the current budget)
+
+    Returns:
+        FrameCache shared by all repositories of the process
+    """
+    if max_bytes is not None and max_bytes != _shared_cache.max_bytes:
+        _shared_cache.resize(max_bytes)
+    return _shared_cache
+
+
+def _frame_size(frame: Frame) -> int:
+    if isinstance(frame, pl.DataFrame):
+        return int(frame.estimated_size())
+    return int(frame.memory_usage(index=True, deep=True).sum())
+
+
+def _share(frame: Frame) -> Frame:
+    # Polars frames are immutable, pandas frames can be mutated in place by the caller
+    return frame.copy(deep=True) if isinstance(frame, pd.DataFrame) else frame
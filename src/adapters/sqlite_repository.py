@@ -0,0 +1,701 @@
+from collections.abc import Iterator
+import json
+import os
+from pathlib import Path
+import sqlite3
+import threading
+import time
+
+from loguru import logger
+from omegaconf import DictConfig
+import pandas as pd
+import polars as pl
+import pyarrow as pa
+
+from src.adapters.filesystem_repository import DEFAULT_BATCH_ROWS, RAW_CSV_OPTIONS
+from src.config.paths import PROJECT_ROOT
+from src.domain.models.data_models import Aggregation, RowFilter
+
+_SQL_OPERATORS = {"<": "<", "<=": "<=", ">": ">", ">=": ">=", "==": "=", "!=": "!="}
+
+_SQL_AGGREGATES = {"count": "COUNT", "sum": "SUM", "mean": "AVG", "min": "MIN", "max": "MAX"}
+
+# Key/value table holding the metadata JSON
+_METADATA_TABLE = "repository_metadata"
+
+_UPSERT_METADATA = "INSERT OR REPLACE INTO {table} (name, value) VALUES (?, ?)"
+
+# Bound parameters per IN query, SQLite's historical default limit
+_MAX_VARIABLES = 999
+
+# One connection per (process, database), shared by all repositories of the process
+_CONNECTIONS: dict[tuple[int, Path], sqlite3.Connection] = {}
+_CONNECTIONS_LOCK = threading.Lock()
+
+
+class SQLiteDataRepository:
+    """
+    SQLite adapter implementing DataRepository port.
+
+    Raw and interim data are tables of a single local database file. Column
+    selection, row filters and aggregations are translated to SQL, so only
+    the requested rows and columns leave the database. Results are fetched
+    in batches and converted column by column to Arrow record batches typed
+    from the declared column types. sqlite3 returns Python row tuples, so the
+    conversion is not zero-copy; Arrow keeps the schema the same in every
+    batch.
+    """
+
+    def __init__(self, config: DictConfig):
+        """
+        Initialize SQLite repository with configuration.
+
+        Args:
+            config: Hydra DictConfig with the database settings under config.data.sqlite
+        """
+        self.config = config
+
+        data_config = config.data if hasattr(config, "data") else {}
+        sqlite_config = getattr(data_config, "sqlite", None) or {}
+
+        self.database_path = self._resolve_path(
+            sqlite_config.get("database_path", "data/house_prices.sqlite")
+        )
+        self.raw_table = sqlite_config.get("raw_table", "raw")
+        self.interim_table = sqlite_config.get("interim_table", "interim")
+
+        # Row identity for append_raw and upsert_interim
+        self.id_column = getattr(data_config, "id_column", "Id")
+
+        # CSV imported into the raw table on first use if the table does not exist yet
+        self.raw_path = self._resolve_path(getattr(data_config, "raw_path", "data/raw/raw.csv"))
+
+        logger.debug("SQLiteDataRepository initialized:")
+        logger.debug(f"  Database path: {self.database_path}")
+        logger.debug(f"  Raw table: {self.raw_table}")
+        logger.debug(f"  Interim table: {self.interim_table}")
+
+    def _resolve_path(self, path_str: str) -> Path:
+        """
+        Resolve path string to absolute Path, handling relative paths.
+
+        Args:
+            path_str: Path as string, may be relative or absolute
+
+        Returns:
+            Absolute Path object
+        """
+        path = Path(path_str)
+        if not path.is_absolute():
+            path = PROJECT_ROOT / path
+        return path
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Pooled connection to the database for the current process."""
+        return _connect(self.database_path)
+
+    def load_raw(
+        self,
+        columns: list[str] | None = None,
+        exclude_columns: list[str] | None = None,
+        filters: list[RowFilter] | None = None,
+    ) -> pd.DataFrame:
+        """
+        Load raw dataset from the raw table.
+
+        Args:
+            columns: Columns to load (default: all)
+            exclude_columns: Columns to skip
+            filters: Row filters, combined with AND
+
+        Returns:
+            pd.DataFrame: Raw house pricing data
+        """
+        df = self._read_table(self._raw_table(), columns, exclude_columns, filters).to_pandas()
+        logger.debug(f"Loaded raw data: {df.shape[0]} rows, {df.shape[1]} columns")
+        return df
+
+    def load_raw_polars(
+        self,
+        columns: list[str] | None = None,
+        exclude_columns: list[str] | None = None,
+        filters: list[RowFilter] | None = None,
+    ) -> pl.DataFrame:
+        """
+        Load raw dataset from the raw table as a Polars DataFrame.
+
+        Args:
+            columns: Columns to load (default: all)
+            exclude_columns: Columns to skip
+            filters: Row filters, combined with AND
+
+        Returns:
+            pl.DataFrame: Raw house pricing data
+        """
+        table = self._read_table(self._raw_table(), columns, exclude_columns, filters)
+        return pl.from_arrow(table)
+
+    def load_interim(
+        self,
+        columns: list[str] | None = None,
+        exclude_columns: list[str] | None = None,
+        filters: list[RowFilter] | None = None,
+    ) -> pd.DataFrame:
+        """
+        Load interim preprocessed dataset from the interim table.
+
+        Args:
+            columns: Columns to load (default: all)
+            exclude_columns: Columns to skip
+            filters: Row filters, combined with AND
+
+        Returns:
+            pd.DataFrame: Preprocessed data after initial transformations
+        """
+        table = self._read_table(self.interim_table, columns, exclude_columns, filters)
+        df = table.to_pandas()
+        logger.debug(f"Loaded interim data: {df.shape[0]} rows, {df.shape[1]} columns")
+        return df
+
+    def load_interim_polars(
+        self,
+        columns: list[str] | None = None,
+        exclude_columns: list[str] | None = None,
+        filters: list[RowFilter] | None = None,
+    ) -> pl.DataFrame:
+        """
+        Load interim preprocessed dataset as a Polars DataFrame.
+
+        Args:
+            columns: Columns to load (default: all)
+            exclude_columns: Columns to skip
+            filters: Row filters, combined with AND
+
+        Returns:
+            pl.DataFrame: Preprocessed data after initial transformations
+        """
+        table = self._read_table(self.interim_table, columns, exclude_columns, filters)
+        return pl.from_arrow(table)
+
+    def iter_raw_batches(
+        self,
+        batch_rows: int = DEFAULT_BATCH_ROWS,
+        columns: list[str] | None = None,
+        exclude_columns: list[str] | None = None,
+        filters: list[RowFilter] | None = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream the raw table in batches of at most batch_rows rows.
+
+        Args:
+            batch_rows: Maximum number of rows per batch
+            columns: Columns to load (default: all)
+            exclude_columns: Columns to skip
+            filters: Row filters, combined with AND
+
+        Yields:
+            pd.DataFrame: Consecutive batches of raw data
+        """
+        sql, params = self._select_sql(self._raw_table(), columns, exclude_columns, filters)
+        for batch in self._iter_record_batches(self._raw_table(), sql, params, batch_rows):
+            yield batch.to_pandas()
+
+    def iter_interim_batches(
+        self,
+        batch_rows: int = DEFAULT_BATCH_ROWS,
+        columns: list[str] | None = None,
+        exclude_columns: list[str] | None = None,
+        filters: list[RowFilter] | None = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream the interim table in batches of at most batch_rows rows.
+
+        Args:
+            batch_rows: Maximum number of rows per batch
+            columns: Columns to load (default: all)
+            exclude_columns: Columns to skip
+            filters: Row filters, combined with AND
+
+        Yields:
+            pd.DataFrame: Consecutive batches of interim data
+        """
+        sql, params = self._select_sql(self.interim_table, columns, exclude_columns, filters)
+        for batch in self._iter_record_batches(self.interim_table, sql, params, batch_rows):
+            yield batch.to_pandas()
+
+    def aggregate(
+        self,
+        aggregations: list[Aggregation],
+        group_by: list[str] | None = None,
+        filters: list[RowFilter] | None = None,
+        dataset: str = "raw",
+    ) -> pd.DataFrame:
+        """
+        Compute aggregates with a GROUP BY query inside the database.
+
+        Args:
+            aggregations: Aggregates to compute
+            group_by: Columns to group by (default: aggregate all rows)
+            filters: Row filters, combined with AND
+            dataset: "raw" or "interim"
+
+        Returns:
+            pd.DataFrame: One row per group, sorted by the group columns
+        """
+        if dataset == "raw":
+            table = self._raw_table()
+        elif dataset == "interim":
+            table = self.interim_table
+        else:
+            raise ValueError(f"Unknown dataset: '{dataset}'. Supported datasets: raw, interim")
+
+        group_by = list(group_by or [])
+        selects = [_quote(column) for column in group_by] + [
+            _SQL_AGGREGATES[a.function]
+            + _sql("({column}) AS {name}", column=a.column, name=a.name)
+            for a in aggregations
+        ]
+        where, params = self._where_sql(table, filters)
+        sql = _sql(
+            "SELECT {selects} FROM {table}{where}",
+            {"selects": ", ".join(selects), "where": where},
+            table=table,
+        )
+        if group_by:
+            sql += _sql(" GROUP BY {columns} ORDER BY {columns}", columns=group_by)
+
+        return self._collect(table, sql, params).to_pandas()
+
+    def save_interim(self, df: pd.DataFrame, metadata: dict) -> None:
+        """
+        Save interim preprocessed dataset with metadata.
+
+        The data is written to a staging table that replaces the interim table
+        in the same transaction as the metadata update, so readers see either
+        the old or the new data, never a mix.
+
+        Args:
+            df: Preprocessed dataframe to save
+            metadata: Dictionary containing preprocessing metadata
+        """
+        logger.debug(f"Saving preprocessed data to {self.database_path}:{self.interim_table}")
+        start = time.perf_counter()
+
+        self._replace_table(self.interim_table, df, metadata)
+
+        duration = time.perf_counter() - start
+        logger.info(
+            f"Saved interim data: {df.shape[0]} rows, {df.shape[1]} columns to "
+            f"{self.database_path}:{self.interim_table} ({duration:.3f}s)"
+        )
+
+    def append_raw(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Insert rows with an unseen id into the raw table.
+
+        Rows whose id is already in the raw table are skipped, and of duplicate
+        ids within df the last row wins.
+
+        Args:
+            df: New raw rows, e.g. a month of sales
+
+        Returns:
+            pd.DataFrame: The rows that were inserted
+        """
+        new_rows = df.drop_duplicates(subset=self.id_column, keep="last")
+        table = self._raw_table()
+        self._ensure_id_index(table)
+
+        existing = self._existing_ids(table, new_rows[self.id_column].to_list())
+        new_rows = new_rows[~new_rows[self.id_column].isin(existing)]
+
+        with self.connection as connection:
+            connection.execute("BEGIN")
+            self._insert_rows(table, new_rows)
+
+        logger.info(f"Inserted {len(new_rows)} new rows into {self.database_path}:{table}")
+        return new_rows.reset_index(drop=True)
+
+    def upsert_interim(self, df: pd.DataFrame, metadata: dict | None = None) -> dict[str, int]:
+        """
+        Insert or replace interim rows by id, in a single transaction.
+
+        The previous metadata is kept, updated with metadata and the row counts
+        under "ingestion".
+
+        Args:
+            df: Transformed rows, must contain the id column
+            metadata: Metadata entries to add or update
+
+        Returns:
+            dict: Number of rows "inserted" and "updated"
+        """
+        if self.id_column not in df.columns:
+            raise ValueError(f"Cannot upsert rows without id column '{self.id_column}'")
+
+        df = df.drop_duplicates(subset=self.id_column, keep="last")
+        if not self._table_types(self.interim_table):
+            counts = {"inserted": len(df), "updated": 0}
+            self._replace_table(self.interim_table, df, {**(metadata or {}), "ingestion": counts})
+            return counts
+
+        self._ensure_id_index(self.interim_table)
+        ids = df[self.id_column].to_list()
+        updated = len(self._existing_ids(self.interim_table, ids))
+        counts = {"inserted": len(df) - updated, "updated": updated}
+
+        try:
+            previous = self.load_metadata()
+        except KeyError:
+            previous = {}
+
+        delete = _sql(
+            "DELETE FROM {table} WHERE {id} = ?", table=self.interim_table, id=self.id_column
+        )
+        with self.connection as connection:
+            connection.execute("BEGIN")
+            connection.executemany(delete, [(_to_sql_value(value),) for value in ids])
+            self._insert_rows(self.interim_table, df)
+            connection.execute(
+                _sql(_UPSERT_METADATA, table=_METADATA_TABLE),
+                (
+                    self.interim_table,
+                    json.dumps({**previous, **(metadata or {}), "ingestion": counts}),
+                ),
+            )
+
+        logger.info(
+            f"Upserted interim data: {counts['inserted']} inserted, {counts['updated']} updated"
+        )
+        return counts
+
+    def wait_for_save(self) -> None:
+        """
+        Saves are synchronous transactions, there is nothing to wait for.
+        """
+
+    def load_metadata(self) -> dict:
+        """
+        Load preprocessing metadata from the metadata table.
+
+        Returns:
+            dict: Metadata about the preprocessing pipeline
+
+        Raises:
+            KeyError: If no interim data has been saved yet
+        """
+        self._ensure_metadata_table()
+        row = self.connection.execute(
+            _sql("SELECT value FROM {table} WHERE name = ?", table=_METADATA_TABLE),
+            (self.interim_table,),
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"No metadata for table '{self.interim_table}' in {self.database_path}")
+
+        metadata = json.loads(row[0])
+        logger.debug(f"Loaded metadata with keys: {list(metadata.keys())}")
+        return metadata
+
+    def _raw_table(self) -> str:
+        """
+        Name of the raw table, importing the raw CSV if the table does not exist.
+
+        Returns:
+            Raw table name
+        """
+        if self._table_types(self.raw_table):
+            return self.raw_table
+
+        if not self.raw_path.exists():
+            raise FileNotFoundError(
+                f"No table '{self.raw_table}' in {self.database_path} and no raw CSV at "
+                f"{self.raw_path} to import"
+            )
+
+        logger.info(f"Importing {self.raw_path} into {self.database_path}:{self.raw_table}")
+        df = pl.read_csv(self.raw_path, **RAW_CSV_OPTIONS).to_pandas()
+        self._replace_table(self.raw_table, df)
+        return self.raw_table
+
+    def _replace_table(self, table: str, df: pd.DataFrame, metadata: dict | None = None) -> None:
+        """
+        Atomically replace a table, and optionally its metadata, with df.
+
+        Args:
+            table: Table to replace
+            df: New contents
+            metadata: Metadata to store for the table
+        """
+        staging = f"{table}__staging_{os.getpid()}"
+        connection = self.connection
+
+        df.to_sql(staging, connection, if_exists="replace", index=False, chunksize=10_000)
+        try:
+            with connection:
+                connection.execute("BEGIN")
+                connection.execute(_sql("DROP TABLE IF EXISTS {table}", table=table))
+                connection.execute(
+                    _sql("ALTER TABLE {staging} RENAME TO {table}", staging=staging, table=table)
+                )
+                if metadata is not None:
+                    self._ensure_metadata_table()
+                    connection.execute(
+                        _sql(_UPSERT_METADATA, table=_METADATA_TABLE),
+                        (table, json.dumps(metadata)),
+                    )
+        except sqlite3.Error:
+            connection.execute(_sql("DROP TABLE IF EXISTS {table}", table=staging))
+            raise
+
+    def _ensure_id_index(self, table: str) -> None:
+        self.connection.execute(
+            _sql(
+                "CREATE INDEX IF NOT EXISTS {index} ON {table} ({id})",
+                index=f"{table}__{self.id_column}",
+                table=table,
+                id=self.id_column,
+            )
+        )
+
+    def _existing_ids(self, table: str, ids: list) -> list:
+        """
+        Distinct ids of a list that already exist in a table.
+
+        One IN query per _MAX_VARIABLES ids, answered from the id index.
+        """
+        existing = []
+        for start in range(0, len(ids), _MAX_VARIABLES):
+            chunk = [_to_sql_value(value) for value in ids[start : start + _MAX_VARIABLES]]
+            sql = _sql(
+                "SELECT DISTINCT {id} FROM {table} WHERE {id} IN ({placeholders})",
+                {"placeholders": ", ".join("?" for _ in chunk)},
+                id=self.id_column,
+                table=table,
+            )
+            existing += [row[0] for row in self.connection.execute(sql, chunk)]
+        return existing
+
+    def _insert_rows(self, table: str, df: pd.DataFrame) -> None:
+        """
+        Insert rows inside the caller's transaction; missing values become NULL.
+        """
+        if df.empty:
+            return
+        sql = _sql(
+            "INSERT INTO {table} ({columns}) VALUES ({placeholders})",
+            {"placeholders": ", ".join("?" for _ in df.columns)},
+            table=table,
+            columns=list(df.columns),
+        )
+        rows = (tuple(_to_sql_value(value) for value in row) for row in df.itertuples(index=False))
+        self.connection.executemany(sql, rows)
+
+    def _ensure_metadata_table(self) -> None:
+        self.connection.execute(
+            _sql(
+                "CREATE TABLE IF NOT EXISTS {table} (name TEXT PRIMARY KEY, value TEXT)",
+                table=_METADATA_TABLE,
+            )
+        )
+
+    def _table_types(self, table: str) -> dict[str, str]:
+        """
+        Declared column types of a table, in column order.
+
+        Returns:
+            Mapping of column name to declared SQL type, empty if the table does not exist
+        """
+        rows = self.connection.execute(_sql("PRAGMA table_info({table})", table=table)).fetchall()
+        return {row[1]: row[2] for row in rows}
+
+    def _select_sql(
+        self,
+        table: str,
+        columns: list[str] | None,
+        exclude_columns: list[str] | None,
+        filters: list[RowFilter] | None,
+    ) -> tuple[str, list]:
+        """
+        Translate a projection and row filters into a SELECT statement.
+
+        Rows come back in insertion order.
+
+        Returns:
+            Tuple of (SQL, parameters)
+        """
+        names = list(columns) if columns is not None else list(self._table_types(table))
+        if exclude_columns:
+            names = [name for name in names if name not in exclude_columns]
+
+        where, params = self._where_sql(table, filters)
+        sql = _sql(
+            "SELECT {columns} FROM {table}{where} ORDER BY rowid",
+            {"where": where},
+            columns=names,
+            table=table,
+        )
+        return sql, params
+
+    def _where_sql(self, table: str, filters: list[RowFilter] | None) -> tuple[str, list]:
+        """
+        Translate row filters into a WHERE clause.
+
+        Filters on columns that do not exist are skipped, like in the
+        filesystem adapter. NULL never satisfies a comparison in SQL, which
+        matches the RowFilter semantics.
+
+        Returns:
+            Tuple of (WHERE clause or empty string, parameters)
+        """
+        types = self._table_types(table)
+        conditions, params = [], []
+        for row_filter in filters or []:
+            if row_filter.column not in types:
+                logger.debug(f"Skipping filter on missing column {row_filter.column}")
+                continue
+            operator = _SQL_OPERATORS[row_filter.operator]
+            conditions.append(_sql("{column} " + operator + " ?", column=row_filter.column))
+            params.append(row_filter.value)
+
+        if not conditions:
+            return "", params
+        return " WHERE " + " AND ".join(conditions), params
+
+    def _read_table(
+        self,
+        table: str,
+        columns: list[str] | None,
+        exclude_columns: list[str] | None,
+        filters: list[RowFilter] | None,
+    ) -> pa.Table:
+        logger.debug(f"Loading {self.database_path}:{table}")
+        sql, params = self._select_sql(table, columns, exclude_columns, filters)
+        return self._collect(table, sql, params)
+
+    def _collect(self, table: str, sql: str, params: list) -> pa.Table:
+        """
+        Run a query and assemble all result batches into one Arrow table.
+        """
+        batches = list(self._iter_record_batches(table, sql, params, DEFAULT_BATCH_ROWS))
+        if len(batches) == 1:
+            return pa.Table.from_batches(batches)
+        if batches:
+            tables = [pa.Table.from_batches([batch]) for batch in batches]
+            return pa.concat_tables(tables, promote_options="permissive")
+
+        cursor = self.connection.execute(sql, params)
+        types = self._table_types(table)
+        return pa.table(
+            {
+                name: pa.array([], type=_arrow_type(types.get(name, "")) or pa.null())
+                for name, *_ in cursor.description
+            }
+        )
+
+    def _iter_record_batches(
+        self, table: str, sql: str, params: list, batch_rows: int
+    ) -> Iterator[pa.RecordBatch]:
+        """
+        Run a query and fetch the result as Arrow record batches.
+
+        Column types follow the declared types of the source table, so every
+        batch has the same schema; computed columns are inferred by Arrow.
+        Each batch is built from the Python rows sqlite3 fetched.
+
+        Yields:
+            pa.RecordBatch: At most batch_rows rows each
+        """
+        logger.debug(f"SQL: {sql} {params}")
+        types = self._table_types(table)
+        cursor = self.connection.execute(sql, params)
+        names = [description[0] for description in cursor.description]
+        arrow_types = [_arrow_type(types.get(name, "")) for name in names]
+
+        while rows := cursor.fetchmany(batch_rows):
+            arrays = [
+                _to_arrow(values, arrow_type)
+                for values, arrow_type in zip(zip(*rows), arrow_types)
+            ]
+            yield pa.RecordBatch.from_arrays(arrays, names=names)
+
+
+def _connect(database_path: Path) -> sqlite3.Connection:
+    """
+    Pooled connection to a database file, one per process.
+
+    The process id is part of the key, so a forked worker opens its own
+    connection instead of sharing the parent's.
+    """
+    key = (os.getpid(), database_path)
+    with _CONNECTIONS_LOCK:
+        connection = _CONNECTIONS.get(key)
+        if connection is None:
+            logger.debug(f"Opening SQLite connection to {database_path}")
+            database_path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(database_path, check_same_thread=False)
+            # Readers do not block the writer and vice versa
+            connection.execute("PRAGMA journal_mode=WAL")
+            _CONNECTIONS[key] = connection
+        return connection
+
+
+def _quote(identifier: str) -> str:
+    """Quote a table or column name as an SQL identifier."""
+    if not isinstance(identifier, str) or not identifier or "\x00" in identifier:
+        raise ValueError(f"Invalid SQL identifier: {identifier!r}")
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _sql(template: str, fragments: dict[str, str] | None = None, **identifiers) -> str:
+    """
+    Fill the {name} slots of a SQL template.
+
+    Table and column names, given as keywords (a string or a list of them),
+    are quoted by _quote. Fragments are SQL this module built from quoted
+    identifiers, fixed keywords and ? placeholders. Values are never
+    interpolated, they are always bound as parameters.
+
+    Args:
+        template: SQL with {name} slots
+        fragments: Prebuilt SQL per slot
+        **identifiers: Identifier, or list of identifiers, per slot
+
+    Returns:
+        The SQL statement
+    """
+    slots = dict(fragments or {})
+    for name, value in identifiers.items():
+        slots[name] = _quote(value) if isinstance(value, str) else ", ".join(map(_quote, value))
+    # Only quoted identifiers and fragments built from them are interpolated
+    return template.format(**slots)  # nosec B608
+
+
+def _to_sql_value(value):
+    """Python value sqlite3 can bind: numpy scalars unwrapped, NaN and NA as NULL."""
+    if pd.isna(value):
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+
+def _arrow_type(declared: str) -> pa.DataType | None:
+    """
+    Arrow type for a declared SQL column type, following SQLite's affinity rules.
+    """
+    declared = declared.upper()
+    if "INT" in declared:
+        return pa.int64()
+    if any(name in declared for name in ("CHAR", "CLOB", "TEXT")):
+        return pa.string()
+    if any(name in declared for name in ("REAL", "FLOA", "DOUB")):
+        return pa.float64()
+    if "TIMESTAMP" in declared or "DATE" in declared:
+        return pa.timestamp("us")
+    return None
+
+
+def _to_arrow(values: tuple, arrow_type: pa.DataType | None) -> pa.Array:
+    if arrow_type is not None and pa.types.is_timestamp(arrow_type):
+        # SQLite stores timestamps as ISO 8601 text
+        return pa.array(values, type=pa.string()).cast(arrow_type)
+    return pa.array(values, type=arrow_type)
@@ -13,6 +13,7 @@ RAW_DATA_DIR = DATA_DIR / "raw"
 INTERIM_DATA_DIR = DATA_DIR / "interim"
 PROCESSED_DATA_DIR = DATA_DIR / "processed"
 EXTERNAL_DATA_DIR = DATA_DIR / "external"
+PIPELINE_CACHE_DIR = INTERIM_DATA_DIR / "pipeline_cache"
 
 MODELS_DIR = PROJECT_ROOT / "models"
 
@@ -0,0 +1,39 @@
+from dataclasses import dataclass
+from typing import Literal
+
+Operator = Literal["<", "<=", ">", ">=", "==", "!="]
+
+
+@dataclass(frozen=True)
+class RowFilter:
+    """
+    Row predicate on a single column, e.g. RowFilter("GrLivArea", "<=", 4000).
+
+    A list of filters is combined with AND. Rows where the column is null
+    never satisfy a filter.
+    """
+
+    column: str
+    operator: Operator
+    value: float | int | str
+
+
+AggregateFunction = Literal["count", "sum", "mean", "min", "max"]
+
+
+@dataclass(frozen=True)
+class Aggregation:
+    """
+    Aggregate of a single column, e.g. Aggregation("SalePrice", "mean").
+
+    The result column is named alias, or "{column}_{function}" by default.
+    count counts non-null values.
+    """
+
+    column: str
+    function: AggregateFunction
+    alias: str | None = None
+
+    @property
+    def name(self) -> str:
+        return self.alias or f"{self.column}_{self.function}"
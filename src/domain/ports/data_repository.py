@@ -1,6 +1,10 @@
+from collections.abc import Iterator
 from typing import Protocol
 
 import pandas as pd
+import polars as pl
+
+from src.domain.models.data_models import Aggregation, RowFilter
 
 
 class DataRepository(Protocol):
@@ -8,10 +12,64 @@ class DataRepository(Protocol):
     Port interface for data access operations
     """
 
-    def load_raw(self) -> pd.DataFrame: ...
+    def load_raw(
+        self,
+        columns: list[str] | None = None,
+        exclude_columns: list[str] | None = None,
+        filters: list[RowFilter] | None = None,
+    ) -> pd.DataFrame: ...
+
+    def load_raw_polars(
+        self,
+        columns: list[str] | None = None,
+        exclude_columns: list[str] | None = None,
+        filters: list[RowFilter] | None = None,
+    ) -> pl.DataFrame: ...
+
+    def load_interim(
+        self,
+        columns: list[str] | None = None,
+        exclude_columns: list[str] | None = None,
+        filters: list[RowFilter] | None = None,
+    ) -> pd.DataFrame: ...
+
+    def load_interim_polars(
+        self,
+        columns: list[str] | None = None,
+        exclude_columns: list[str] | None = None,
+        filters: list[RowFilter] | None = None,
+    ) -> pl.DataFrame: ...
+
+    def iter_raw_batches(
+        self,
+        batch_rows: int = ...,
+        columns: list[str] | None = None,
+        exclude_columns: list[str] | None = None,
+        filters: list[RowFilter] | None = None,
+    ) -> Iterator[pd.DataFrame]: ...
 
-    def load_interim(self) -> pd.DataFrame: ...
+    def iter_interim_batches(
+        self,
+        batch_rows: int = ...,
+        columns: list[str] | None = None,
+        exclude_columns: list[str] | None = None,
+        filters: list[RowFilter] | None = None,
+    ) -> Iterator[pd.DataFrame]: ...
+
+    def aggregate(
+        self,
+        aggregations: list[Aggregation],
+        group_by: list[str] | None = None,
+        filters: list[RowFilter] | None = None,
+        dataset: str = "raw",
+    ) -> pd.DataFrame: ...
 
     def save_interim(self, df: pd.DataFrame, metadata: dict) -> None: ...
 
+    def wait_for_save(self) -> None: ...
+
+    def append_raw(self, df: pd.DataFrame) -> pd.DataFrame: ...
+
+    def upsert_interim(self, df: pd.DataFrame, metadata: dict | None = None) -> dict[str, int]: ...
+
     def load_metadata(self) -> dict: ...
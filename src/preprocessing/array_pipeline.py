@@ -0,0 +1,231 @@
+"""
+NumPy execution mode for a fitted pandas preprocessing pipeline.
+
+ArrayPipeline compiles the fitted steps into operations on integer column
+slots of one preallocated array. transform converts the input once, then
+every step works in place on that array, without DataFrame copies or dtype
+scans. Only numeric columns are carried, which is what the model consumes
+after the pandas pipeline anyway.
+"""
+
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+import polars as pl
+from sklearn.pipeline import Pipeline
+
+from src.preprocessing.feature_engineering import FeatureEngineeringTransformer
+from src.preprocessing.feature_selection import FeatureSelectionTransformer
+from src.preprocessing.sklearn_pipeline_builder import (
+    CategoricalMapTransformer,
+    DropColumnsTransformer,
+    ImputationTransformer,
+    ImputeScaleTransformer,
+    ScalingTransformer,
+    category_codes,
+)
+
+# An operation reads the raw input frame if it needs to and updates the array in place
+Operation = Callable[[np.ndarray, pd.DataFrame], None]
+
+
+def _is_numeric(dtype) -> bool:
+    """Numeric as in select_dtypes(include=["number"]), so booleans are not."""
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+class ArrayPipeline:
+    """
+    Runs a fitted pandas preprocessing pipeline on a contiguous ndarray.
+
+    The column layout is derived once from the fitted steps and the dtypes of
+    the frame the pipeline was fitted on. Each numeric column gets a slot in
+    the array; dropped and deselected columns simply lose their slot, mapped
+    and engineered columns get a slot of their own. Non-numeric columns keep
+    their position in the layout without a slot, so the output column order
+    is the one of the pandas pipeline.
+
+    Output matches the numeric columns of the pandas pipeline output with
+    missing values set to 0, the model input of SimpleExperiment.
+    """
+
+    def __init__(self, pipeline: Pipeline, X: pd.DataFrame, dtype=np.float64):
+        """
+        Compile a fitted pipeline.
+
+        Args:
+            pipeline: sklearn Pipeline fitted by build_pipeline (pandas backend)
+            X: Frame the pipeline was fitted on, or any frame with the same dtypes
+            dtype: Array dtype, np.float64 or np.float32
+
+        Raises:
+            ValueError: If a step cannot run on numeric arrays
+        """
+        self.dtype = np.dtype(dtype)
+        self._inputs: list[tuple[str, int]] = []
+        self._operations: list[Operation] = []
+        self._width = 0
+
+        layout: dict[str, int | None] = {}
+        for column, column_dtype in X.dtypes.items():
+            layout[column] = None
+            if _is_numeric(column_dtype):
+                layout[column] = self._allocate()
+                self._inputs.append((column, layout[column]))
+
+        imputed = False
+        for name, step in pipeline.steps:
+            if isinstance(step, DropColumnsTransformer):
+                for column in [*step.columns, *step.pruned_columns_]:
+                    layout.pop(column, None)
+                self._inputs = [(col, slot) for col, slot in self._inputs if col in layout]
+            elif isinstance(step, CategoricalMapTransformer):
+                if imputed:
+                    raise ValueError("Array mode needs categorical_transforms before imputation")
+                self._compile_mapping(step, layout)
+            elif isinstance(step, ImputationTransformer):
+                imputed = True
+                self._compile_imputation(step, layout)
+            elif isinstance(step, ImputeScaleTransformer):
+                imputed = True
+                self._compile_imputation_scaling(step, layout)
+            elif isinstance(step, FeatureEngineeringTransformer):
+                self._compile_features(step, layout)
+            elif isinstance(step, FeatureSelectionTransformer):
+                layout = {col: layout[col] for col in step.selected_features_ if col in layout}
+            elif isinstance(step, ScalingTransformer):
+                self._compile_scaling(step, layout)
+            else:
+                raise ValueError(f"Step {name} is not supported in array mode")
+
+        output = {col: slot for col, slot in layout.items() if slot is not None}
+        self.feature_names_out_ = list(output)
+        self._output_slots = np.fromiter(output.values(), dtype=np.intp, count=len(output))
+
+    def transform(self, X: pd.DataFrame, as_frame: bool = False) -> np.ndarray | pd.DataFrame:
+        """
+        Transform raw rows into the model input.
+
+        Args:
+            X: Raw input with the columns the pipeline was fitted on
+            as_frame: Reattach column names and the index of X
+
+        Returns:
+            Array of shape (rows, len(feature_names_out_)), or a DataFrame if as_frame
+        """
+        # Column-major, so every per-column write below is contiguous
+        A = np.empty((len(X), self._width), dtype=self.dtype, order="F")
+        for column, slot in self._inputs:
+            A[:, slot] = X[column].to_numpy(dtype=self.dtype, na_value=np.nan)
+
+        for operation in self._operations:
+            operation(A, X)
+
+        out = A[:, self._output_slots]
+        out[np.isnan(out)] = 0
+        if as_frame:
+            return pd.DataFrame(out, index=X.index, columns=self.feature_names_out_, copy=False)
+        return out
+
+    def _allocate(self) -> int:
+        self._width += 1
+        return self._width - 1
+
+    def _slots(self, columns, layout: dict[str, int | None]) -> np.ndarray:
+        return np.array([layout[col] for col in columns], dtype=np.intp)
+
+    def _compile_mapping(self, step: CategoricalMapTransformer, layout: dict[str, int | None]):
+        # The fitted lookup tables are gathered straight into the array, one group at a time
+        groups = []
+        for group_columns, categories, table in step.groups_:
+            present = [i for i, col in enumerate(group_columns) if col in layout]
+            if not present:
+                continue
+            columns = [group_columns[i] for i in present]
+            for column in columns:
+                if layout[column] is None:
+                    layout[column] = self._allocate()
+            try:
+                values = table[present].astype(self.dtype)
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Array mode needs numeric mappings for {columns}") from e
+            groups.append((columns, self._slots(columns, layout), categories, values))
+
+        def operation(A, X):
+            for columns, slots, categories, table in groups:
+                codes = category_codes(categories, X[columns].to_numpy(dtype=object))
+                A[:, slots] = table[np.arange(len(columns))[None, :], codes]
+
+        if groups:
+            self._operations.append(operation)
+
+    def _compile_imputation(self, step: ImputationTransformer, layout: dict[str, int | None]):
+        if step.num_imputer_ is None:
+            return
+        slots = self._slots(step.numerical_cols_, layout)
+        statistics = step.num_imputer_.statistics_.astype(self.dtype)
+
+        def operation(A, X):
+            for slot, value in zip(slots, statistics):
+                column = A[:, slot]
+                column[np.isnan(column)] = value
+
+        self._operations.append(operation)
+
+    def _compile_imputation_scaling(
+        self, step: ImputeScaleTransformer, layout: dict[str, int | None]
+    ) -> None:
+        if not step.numerical_cols_:
+            return
+        slots = self._slots(step.numerical_cols_, layout)
+        fill = step.fill_.astype(self.dtype)
+        mean = step.mean_.astype(self.dtype)
+        scale = step.scale_.astype(self.dtype)
+
+        def operation(A, X):
+            for slot, f, m, s in zip(slots, fill, mean, scale):
+                column = A[:, slot]
+                column[np.isnan(column)] = f
+                column -= m
+                column /= s
+
+        self._operations.append(operation)
+
+    def _compile_features(
+        self, step: FeatureEngineeringTransformer, layout: dict[str, int | None]
+    ) -> None:
+        if not step.expressions_:
+            return
+        missing = [col for col in step.source_columns_ if layout.get(col) is None]
+        if missing:
+            raise ValueError(f"Array mode needs numeric feature sources, got {missing}")
+
+        sources = list(step.source_columns_)
+        source_slots = self._slots(sources, layout)
+        for name in step.expressions_:
+            if layout.get(name) is None:
+                layout[name] = self._allocate()
+        target_slots = self._slots(step.expressions_, layout)
+        expressions = list(step.expressions_.values())
+
+        def operation(A, X):
+            frame = pl.from_numpy(A[:, source_slots], schema=sources)
+            A[:, target_slots] = frame.lazy().select(expressions).collect().to_numpy()
+
+        self._operations.append(operation)
+
+    def _compile_scaling(self, step: ScalingTransformer, layout: dict[str, int | None]):
+        if step.scaler_ is None:
+            return
+        slots = self._slots(step.numerical_cols_, layout)
+        mean = step.scaler_.mean_.astype(self.dtype)
+        scale = step.scaler_.scale_.astype(self.dtype)
+
+        def operation(A, X):
+            for slot, m, s in zip(slots, mean, scale):
+                column = A[:, slot]
+                column -= m
+                column /= s
+
+        self._operations.append(operation)
@@ -0,0 +1,182 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.base import BaseEstimator, TransformerMixin
+
+from src.preprocessing.streaming_stats import ValueCounts
+
+
+class CategoricalEncodingTransformer(BaseEstimator, TransformerMixin):
+    """
+    Transformer encoding categorical columns for the model.
+
+    fit learns a vocabulary per categorical column: its max_categories most
+    frequent levels. transform one-hot encodes them into a scipy CSR matrix
+    next to the numeric columns, so the design matrix stays sparse up to
+    Ridge or Lasso. Ordinal columns become integer codes instead. Levels
+    outside the vocabulary, rare or unseen at fit, are hashed into
+    hash_buckets extra levels per column, which bounds the width for
+    high-cardinality columns. Missing values encode as no level (all zeros)
+    or code -1.
+
+    Config structure:
+        {
+            "method": "onehot",  # or "ordinal": integer codes for every column
+            "max_categories": 50,  # vocabulary size per column, most frequent first
+            "hash_buckets": 8,  # levels outside the vocabulary, 0 to encode them as missing
+            "ordinal_columns": ["ExterQual"],  # optional: integer codes even with onehot
+            "exclude_columns": ["Id"],  # optional: categorical columns to leave out
+            "sparse_output": True  # onehot: CSR matrix, else a dense dataframe
+        }
+    """
+
+    def __init__(self, config: dict):
+        """
+        Initialize transformer with configuration.
+
+        Args:
+            config: Dictionary containing categorical encoding specifications
+        """
+        self.config = config
+        self.method = config.get("method", "onehot")
+        self.max_categories = config.get("max_categories", 50)
+        self.hash_buckets = config.get("hash_buckets", 8)
+        self.ordinal_columns = config.get("ordinal_columns", [])
+        self.exclude_columns = config.get("exclude_columns", [])
+        self.sparse_output = config.get("sparse_output", True)
+
+    def fit(self, X, y=None):
+        """
+        Learn the vocabulary of every categorical column.
+
+        Args:
+            X: Input dataframe
+            y: Target (unused)
+
+        Returns:
+            self
+        """
+        self._start(X)
+        self._counts.update(X)
+        self._set_vocabularies()
+        return self
+
+    def partial_fit(self, X, y=None):
+        """
+        Update the vocabularies with a batch, exactly. Columns are taken from the first batch.
+
+        Args:
+            X: Input dataframe batch
+            y: Target (unused)
+
+        Returns:
+            self
+        """
+        if not hasattr(self, "_counts"):
+            self._start(X)
+        self._counts.update(X)
+        self._set_vocabularies()
+        return self
+
+    def transform(self, X):
+        """
+        Encode X.
+
+        Args:
+            X: Input dataframe
+
+        Returns:
+            CSR matrix if one-hot columns are encoded with sparse_output, else
+            a dataframe; columns in the order of feature_names_out_
+        """
+        codes = {col: self._codes(col, X[col]) for col in self.categorical_cols_}
+        onehot = self._onehot(codes, len(X))
+
+        if onehot is not None and self.sparse_output:
+            dense = X[self.numerical_cols_].to_numpy(dtype=np.float64, na_value=np.nan)
+            if self.ordinal_cols_:
+                ordinal = np.column_stack([codes[col] for col in self.ordinal_cols_])
+                dense = np.hstack([dense, ordinal])
+            return sparse.hstack([sparse.csr_matrix(dense), onehot], format="csr")
+
+        blocks = [X[self.numerical_cols_]]
+        if self.ordinal_cols_:
+            blocks.append(
+                pd.DataFrame(
+                    {col: codes[col] for col in self.ordinal_cols_}, index=X.index, copy=False
+                )
+            )
+        if onehot is not None:
+            blocks.append(
+                pd.DataFrame(
+                    onehot.toarray(),
+                    index=X.index,
+                    columns=self.feature_names_out_[-onehot.shape[1] :],
+                    copy=False,
+                )
+            )
+        return pd.concat(blocks, axis=1)
+
+    def get_feature_names_out(self, input_features=None) -> np.ndarray:
+        return np.array(self.feature_names_out_, dtype=object)
+
+    def _start(self, X) -> None:
+        self.n_features_in_ = X.shape[1]
+        self.numerical_cols_ = X.select_dtypes(include=["number"]).columns.tolist()
+        self.categorical_cols_ = [
+            col
+            for col in X.select_dtypes(include=["object", "category"]).columns
+            if col not in self.exclude_columns
+        ]
+        self._counts = ValueCounts(self.categorical_cols_)
+
+    def _set_vocabularies(self) -> None:
+        self.vocabularies_ = {}
+        for col, counts in self._counts.counts.items():
+            # Most frequent first, ties by level, so the vocabulary does not depend on row order
+            levels = sorted(counts.items(), key=lambda item: (-item[1], str(item[0])))
+            vocabulary = [level for level, _ in levels[: self.max_categories]]
+            self.vocabularies_[col] = pd.Index(vocabulary)
+
+        ordinal = self.categorical_cols_ if self.method == "ordinal" else self.ordinal_columns
+        self.ordinal_cols_ = [col for col in self.categorical_cols_ if col in ordinal]
+        self.onehot_cols_ = [col for col in self.categorical_cols_ if col not in ordinal]
+
+        self.feature_names_out_ = self.numerical_cols_ + self.ordinal_cols_
+        for col in self.onehot_cols_:
+            self.feature_names_out_ += [f"{col}={level}" for level in self.vocabularies_[col]]
+            self.feature_names_out_ += [f"{col}=#{bucket}" for bucket in range(self.hash_buckets)]
+
+    def _codes(self, col: str, values: pd.Series) -> np.ndarray:
+        """Vocabulary index per row, hash buckets after the vocabulary, -1 for missing."""
+        vocabulary = self.vocabularies_[col]
+        codes = vocabulary.get_indexer(values)
+        missing = values.isna().to_numpy()
+        outside = (codes == -1) & ~missing
+        if outside.any():
+            if self.hash_buckets:
+                # hash_array uses a fixed key, so buckets are the same in every process
+                levels = values[outside].astype(str).to_numpy(dtype=object)
+                buckets = pd.util.hash_array(levels) % np.uint64(self.hash_buckets)
+                codes[outside] = len(vocabulary) + buckets.astype(np.int64)
+            else:
+                codes[outside] = -1
+        codes[missing] = -1
+        return codes.astype(np.int64)
+
+    def _onehot(self, codes: dict[str, np.ndarray], n_rows: int) -> sparse.csr_matrix | None:
+        if not self.onehot_cols_:
+            return None
+
+        rows, columns = [], []
+        offset = 0
+        for col in self.onehot_cols_:
+            present = codes[col] >= 0
+            rows.append(np.flatnonzero(present))
+            columns.append(offset + codes[col][present])
+            offset += len(self.vocabularies_[col]) + self.hash_buckets
+
+        rows, columns = np.concatenate(rows), np.concatenate(columns)
+        return sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, columns)), shape=(n_rows, offset), dtype=np.float64
+        )
@@ -1,7 +1,102 @@
-import numpy as np
+import operator
+
 import pandas as pd
+import polars as pl
 from sklearn.base import BaseEstimator, TransformerMixin
 
+_COMPARISONS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+def compile_features(config: dict, columns: list[str]) -> dict[str, pl.Expr]:
+    """
+    Compile a feature_engineering config into one Polars expression per feature.
+
+    Features are resolved in the order polynomial, indicator, log, interaction
+    and may use columns engineered before them. Such references are inlined,
+    so every expression reads input columns only and the whole plan runs as a
+    single select, where Polars shares common subexpressions (e.g. the
+    GrLivArea cast read by both GrLivArea_squared and Qual_x_Area). A feature
+    whose source columns are missing is skipped; a name configured twice keeps
+    its first position and its last definition.
+
+    Args:
+        config: Dictionary containing feature engineering specifications
+        columns: Input column names
+
+    Returns:
+        Mapping of output name -> expression, in output order: Int64 for binary
+        indicators, like the 0/1 integers of the pandas baseline, Float64 otherwise
+    """
+    features: dict[str, pl.Expr] = {}
+
+    def resolve(column: str) -> pl.Expr | None:
+        if column in features:
+            return features[column]
+        if column in columns:
+            return pl.col(column).cast(pl.Float64)
+        return None
+
+    for spec in config.get("polynomial_features", []):
+        base = resolve(spec["column"])
+        if base is None:
+            continue
+        for degree in spec["degrees"]:
+            suffix = {2: "squared", 3: "cubed"}.get(degree, f"pow{degree}")
+            features[f"{spec['column']}_{suffix}"] = base.pow(degree)
+
+    for spec in config.get("binary_indicators", []):
+        condition = spec["condition"]
+        compare = _COMPARISONS.get(condition["operator"])
+        column = condition["column"]
+        if compare is None or resolve(column) is None:
+            continue
+        # Compare input columns uncast, so string conditions work; missing values are False
+        source = features.get(column, pl.col(column))
+        indicator = compare(source, condition["value"]).fill_null(False)
+        features[spec["name"]] = indicator.cast(pl.Int64)
+
+    for column in config.get("log_transforms", []):
+        base = resolve(column)
+        if base is not None:
+            features[f"{column}_log"] = base.log1p()
+
+    for spec in config.get("interactions", []):
+        factors = [resolve(col) for col in spec["columns"]]
+        if any(factor is None for factor in factors):
+            continue
+        product = factors[0]
+        for factor in factors[1:]:
+            product = product * factor
+        features[spec["name"]] = product
+
+    return {name: expr.alias(name) for name, expr in features.items()}
+
+
+def feature_lineage(config: dict) -> dict[str, set[str]]:
+    """
+    Input columns every engineered feature reads, assuming all referenced columns exist.
+
+    Args:
+        config: Dictionary containing feature engineering specifications
+
+    Returns:
+        Mapping of output name -> set of input column names
+    """
+    referenced = [spec["column"] for spec in config.get("polynomial_features", [])]
+    referenced += [spec["condition"]["column"] for spec in config.get("binary_indicators", [])]
+    referenced += list(config.get("log_transforms", []))
+    referenced += [col for spec in config.get("interactions", []) for col in spec["columns"]]
+
+    expressions = compile_features(config, referenced)
+    return {name: set(expr.meta.root_names()) for name, expr in expressions.items()}
+
 
 class FeatureEngineeringTransformer(BaseEstimator, TransformerMixin):
     """
@@ -25,7 +120,7 @@ class FeatureEngineeringTransformer(BaseEstimator, TransformerMixin):
 
     def fit(self, X: pd.DataFrame, y=None):
         """
-        Fit the transformer (no-op for feature engineering).
+        Compile the config into an expression plan for the columns of X.
 
         Args:
             X: Input dataframe
@@ -35,132 +130,71 @@ class FeatureEngineeringTransformer(BaseEstimator, TransformerMixin):
             self
         """
         self.n_features_in_ = X.shape[1]
+        self._set_expressions(compile_features(self.config, list(X.columns)))
         return self
 
-    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
-        """
-        Apply feature engineering transformations.
-
-        Returns:
-            Transformed dataframe with engineered features
-        """
-        X = X.copy(deep=True)
-
-        if "polynomial_features" in self.config:
-            X = self._add_polynomial_features(X, self.config["polynomial_features"])
-
-        if "binary_indicators" in self.config:
-            X = self._add_binary_indicators(X, self.config["binary_indicators"])
-
-        if "log_transforms" in self.config:
-            X = self._add_log_transforms(X, self.config["log_transforms"])
-
-        if "interactions" in self.config:
-            X = self._add_interactions(X, self.config["interactions"])
-
-        return X
-
-    def _add_polynomial_features(self, X: pd.DataFrame, configs: list) -> pd.DataFrame:
+    def partial_fit(self, X: pd.DataFrame, y=None):
         """
-        Add polynomial features (x^2, x^3, etc.).
+        Compile the plan from the first batch; later batches change nothing.
 
         Args:
-            configs: List of polynomial feature configs
+            X: Input dataframe batch
+            y: Target (unused)
 
         Returns:
-            Dataframe with polynomial features added
+            self
         """
-        for config in configs:
-            column = config["column"]
-            degrees = config["degrees"]
-
-            if column in X.columns:
-                for degree in degrees:
-                    if degree == 2:
-                        new_col_name = f"{column}_squared"
-                    elif degree == 3:
-                        new_col_name = f"{column}_cubed"
-                    else:
-                        new_col_name = f"{column}_pow{degree}"
-
-                    X[new_col_name] = X[column] ** degree
-
-        return X
+        if not hasattr(self, "expressions_"):
+            self.fit(X)
+        return self
 
-    def _add_binary_indicators(self, X: pd.DataFrame, configs: list) -> pd.DataFrame:
+    def prune(self, columns) -> None:
         """
-        Add binary indicator features based on conditions.
+        Only compute the engineered features in columns, after fitting.
 
         Args:
-            configs: List of binary indicator configs
-
-        Returns:
-            Dataframe with binary indicators added
-        """
-        for config in configs:
-            name = config["name"]
-            condition = config["condition"]
-            column = condition["column"]
-            operator = condition["operator"]
-            value = condition["value"]
-
-            if column in X.columns:
-                if operator == ">":
-                    X[name] = (X[column] > value).astype(int)
-                elif operator == ">=":
-                    X[name] = (X[column] >= value).astype(int)
-                elif operator == "<":
-                    X[name] = (X[column] < value).astype(int)
-                elif operator == "<=":
-                    X[name] = (X[column] <= value).astype(int)
-                elif operator == "==":
-                    X[name] = (X[column] == value).astype(int)
-                elif operator == "!=":
-                    X[name] = (X[column] != value).astype(int)
-
-        return X
-
-    def _add_log_transforms(self, X: pd.DataFrame, columns: list) -> pd.DataFrame:
+            columns: Names of the columns downstream steps use
         """
-        Add log-transformed versions of columns.
+        self._set_expressions(
+            {name: expr for name, expr in self.expressions_.items() if name in columns}
+        )
 
-        Uses log1p (log(1+x)) to handle zeros safely.
+    def _set_expressions(self, expressions: dict[str, pl.Expr]) -> None:
+        self.expressions_ = expressions
+        self.source_columns_ = sorted(
+            {col for expr in expressions.values() for col in expr.meta.root_names()}
+        )
 
-        Args:
-            columns: List of column names to log-transform
-
-        Returns:
-            Dataframe with log-transformed features added
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
         """
-        for column in columns:
-            if column in X.columns:
-                # Use log1p to safely handle zeros
-                X[f"{column}_log"] = np.log1p(X[column])
-
-        return X
+        Apply feature engineering transformations.
 
-    def _add_interactions(self, X: pd.DataFrame, configs: list) -> pd.DataFrame:
-        """
-        Add interaction features (product of two or more columns).
-
-        Args:
-            X: Input dataframe
-            configs: List of interaction configs
+        The compiled plan is evaluated by Polars on the source columns only,
+        multithreaded and without holding the GIL. The resulting block, int64
+        for binary indicators and float64 otherwise, is attached to X with a
+        single concat instead of one insert per feature.
 
         Returns:
-            Dataframe with interaction features added
+            Transformed dataframe with engineered features
         """
-        for config in configs:
-            columns = config["columns"]
-            name = config["name"]
-
-            # Check all columns exist
-            if not all(col in X.columns for col in columns):
-                continue
-
-            # Create interaction as product of columns
-            X[name] = X[columns[0]]
-            for col in columns[1:]:
-                X[name] = X[name] * X[col]
-
-        return X
+        if not self.expressions_:
+            return X.copy()
+
+        engineered = (
+            pl.from_pandas(X[self.source_columns_])
+            .lazy()
+            .select(list(self.expressions_.values()))
+            .collect()
+            .to_pandas()
+        )
+        engineered.index = X.index
+        names = list(self.expressions_)
+
+        # Names that already exist are overwritten in place, the rest are appended
+        existing = [name for name in names if name in X.columns]
+        if existing:
+            X = X.copy()
+            X[existing] = engineered[existing]
+            engineered = engineered.drop(columns=existing)
+
+        return pd.concat([X, engineered], axis=1)
@@ -1,8 +1,205 @@
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import threading
+
 import numpy as np
 import pandas as pd
 from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.feature_selection import mutual_info_regression
 
+from src.preprocessing.streaming_stats import TargetStatistics
+from src.utils.fingerprint import frame_fingerprint
+
+_SCORE_CACHE_SIZE = 32
+
+# (method, features fingerprint, target fingerprint, *options) -> scores, least recently used first
+_score_cache: OrderedDict[tuple, pd.Series] = OrderedDict()
+_score_lock = threading.Lock()
+
+_EXECUTORS = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+
+
+def _cached_scores(key: tuple | None, compute: Callable[[], pd.Series]) -> pd.Series:
+    if key is None:
+        return compute()
+
+    with _score_lock:
+        if key in _score_cache:
+            _score_cache.move_to_end(key)
+            return _score_cache[key].copy()
+
+    scores = compute()
+
+    with _score_lock:
+        _score_cache[key] = scores
+        while len(_score_cache) > _SCORE_CACHE_SIZE:
+            _score_cache.popitem(last=False)
+    return scores.copy()
+
+
+def correlation_scores(X: pd.DataFrame, target: pd.Series, cache: bool = False) -> pd.Series:
+    """
+    Absolute Pearson correlation of every numeric column of X with target.
+
+    Computed as one centered matrix-vector product over a float array, with
+    the pairwise handling of missing values of DataFrame.corrwith. With
+    cache, results are kept per content of X and target, so fitting again
+    with another threshold only re-filters the scores; the lookup hashes X
+    and target, so it only pays off when the same data is scored repeatedly.
+
+    Args:
+        X: Numeric feature dataframe
+        target: Target series
+        cache: Reuse the scores of an earlier call with the same X and target
+
+    Returns:
+        Series of absolute correlations indexed by column, NaN for constant columns
+    """
+    key = None
+    if cache:
+        key = ("correlation", frame_fingerprint(X), frame_fingerprint(target.to_frame()))
+    return _cached_scores(
+        key,
+        lambda: pd.Series(
+            np.abs(_correlations(X.to_numpy(dtype=np.float64, na_value=np.nan), target)),
+            index=X.columns,
+        ),
+    )
+
+
+def _correlations(A: np.ndarray, target: pd.Series) -> np.ndarray:
+    y = target.to_numpy(dtype=np.float64, na_value=np.nan)
+    valid = ~np.isnan(A) & ~np.isnan(y)[:, None]
+    n = valid.sum(axis=0)
+
+    # Columns are centered on their mean over the valid pairs, so sum(x) is 0
+    # and the covariance needs no correction; the target only needs a shift
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x = np.where(valid, A, 0.0)
+        x = np.where(valid, x - x.sum(axis=0) / n, 0.0)
+        y = np.nan_to_num(y - np.nanmean(y)) if (~np.isnan(y)).any() else np.zeros_like(y)
+        weights = valid.astype(np.float64)
+
+        covariance = x.T @ y
+        sum_y = weights.T @ y
+        var_y = weights.T @ (y * y) - sum_y**2 / n
+        var_x = (x * x).sum(axis=0)
+        correlation = covariance / np.sqrt(var_x * var_y)
+
+    return np.where(n > 1, correlation, np.nan)
+
+
+def mutual_info_scores(
+    X: pd.DataFrame,
+    target: pd.Series,
+    n_neighbors: int = 3,
+    sample_size: int | None = None,
+    n_jobs: int = 1,
+    executor: str = "thread",
+    random_state: int = 42,
+    cache: bool = False,
+) -> pd.Series:
+    """
+    Mutual information of every numeric column of X with target.
+
+    The kNN estimator runs on a stratified subsample of sample_size rows, if
+    given, with the columns split across n_jobs workers of a thread or process
+    pool. Splitting the columns only changes the tiny noise
+    mutual_info_regression adds to break ties. With cache, results are kept
+    per content of X and target and the options.
+
+    Args:
+        X: Numeric feature dataframe
+        target: Target series
+        n_neighbors: Neighbors of the kNN estimator
+        sample_size: Rows to estimate on, None for all rows
+        n_jobs: Workers to split the columns across
+        executor: "thread" or "process"
+        random_state: Seed of the subsample and the estimator
+        cache: Reuse the scores of an earlier call with the same data and options
+
+    Returns:
+        Series of mutual information indexed by column
+
+    Raises:
+        ValueError: If executor is unknown
+    """
+    if executor not in _EXECUTORS:
+        raise ValueError(f"Unknown executor '{executor}', expected one of {list(_EXECUTORS)}")
+
+    key = None
+    if cache:
+        key = (
+            "mutual_info",
+            frame_fingerprint(X),
+            frame_fingerprint(target.to_frame()),
+            n_neighbors,
+            sample_size,
+            n_jobs,
+            random_state,
+        )
+    return _cached_scores(
+        key,
+        lambda: pd.Series(
+            _mutual_info(X, target, n_neighbors, sample_size, n_jobs, executor, random_state),
+            index=X.columns,
+        ),
+    )
+
+
+def _mutual_info(X, target, n_neighbors, sample_size, n_jobs, executor, random_state):
+    y = target.to_numpy(dtype=np.float64)
+    rows = stratified_sample(y, sample_size, random_state)
+    A, y = X.to_numpy(dtype=np.float64)[rows], y[rows]
+    options = {"n_neighbors": min(n_neighbors, len(y) - 1), "random_state": random_state}
+
+    chunks = [chunk for chunk in np.array_split(np.arange(A.shape[1]), n_jobs) if len(chunk)]
+    if len(chunks) <= 1:
+        return mutual_info_regression(A, y, **options)
+
+    with _EXECUTORS[executor](max_workers=len(chunks)) as pool:
+        futures = [
+            pool.submit(mutual_info_regression, A[:, chunk], y, **options) for chunk in chunks
+        ]
+        return np.concatenate([future.result() for future in futures])
+
+
+def stratified_sample(
+    target: np.ndarray, sample_size: int | None, random_state: int = 42, n_bins: int = 10
+) -> np.ndarray:
+    """
+    Row positions of a subsample that keeps the distribution of target.
+
+    Rows are binned by target quantile and every bin contributes in
+    proportion to its size.
+
+    Args:
+        target: Target values
+        sample_size: Rows to keep, None or at least len(target) for all rows
+        random_state: Seed of the draw
+        n_bins: Number of target quantile bins
+
+    Returns:
+        Sorted row positions
+    """
+    if sample_size is None or sample_size >= len(target):
+        return np.arange(len(target))
+
+    rng = np.random.default_rng(random_state)
+    # Ranks make the quantile edges unique even for heavily tied targets
+    ranks = pd.Series(target).rank(method="first").to_numpy()
+    bins = pd.qcut(ranks, q=min(n_bins, sample_size), labels=False)
+
+    # Allocate sample_size exactly by rounding the cumulative bin shares
+    sizes = np.bincount(bins)
+    quotas = np.diff(np.round(np.cumsum(sizes) * sample_size / len(target)), prepend=0)
+    sample = [
+        rng.choice(np.flatnonzero(bins == b), size=int(quota), replace=False)
+        for b, quota in enumerate(quotas)
+    ]
+    return np.sort(np.concatenate(sample))
+
 
 class FeatureSelectionTransformer(BaseEstimator, TransformerMixin):
     """
@@ -11,7 +208,13 @@ class FeatureSelectionTransformer(BaseEstimator, TransformerMixin):
     Supports:
     - Correlation-based selection (correlation with target)
     - Variance threshold selection (remove low variance features)
-    - Mutual information selection
+    - Mutual information selection, optionally on a stratified row subsample
+      ("sample_size") with the columns split across "n_jobs" workers of a
+      "thread" or "process" pool ("executor")
+
+    mutual_info scores of identical data are reused across fits with
+    "cache_scores": true, e.g. when sweeping the threshold. It is off by
+    default because the lookup hashes the whole frame on every fit.
 
     Config structure:
         {
@@ -43,6 +246,11 @@ class FeatureSelectionTransformer(BaseEstimator, TransformerMixin):
         """
         Fit the transformer by selecting features.
 
+        For correlation and variance_threshold, the selection is derived from
+        sufficient statistics of the numeric features, computed in one pass
+        and kept in statistics_, so new rows can be added with partial_fit
+        without seeing X again.
+
         Args:
             X: Input dataframe
             y: Target (unused, target is in X)
@@ -50,110 +258,153 @@ class FeatureSelectionTransformer(BaseEstimator, TransformerMixin):
         Returns:
             self
         """
-        self.n_features_in_ = X.shape[1]
+        self._start_statistics(X)
 
         if self.target_column is None or self.target_column not in X.columns:
             # If no target specified or target not found, keep all features
             self.selected_features_ = list(X.columns)
             return self
 
-        feature_cols = [col for col in X.columns if col != self.target_column]
-        target = X[self.target_column]
+        if self.statistics_ is not None:
+            # One pass over the rows, the same selection partial_fit and merge derive
+            self._update_statistics(X)
+            self._select_from_statistics()
+            return self
 
-        if self.method == "correlation":
-            selected = self._select_by_correlation(X[feature_cols], target)
-        elif self.method == "variance_threshold":
-            selected = self._select_by_variance(X[feature_cols])
-        elif self.method == "mutual_info":
-            selected = self._select_by_mutual_info(X[feature_cols], target)
+        feature_cols = [col for col in X.columns if col != self.target_column]
+        if self.method == "mutual_info":
+            selected, self.scores_ = self._select_by_mutual_info(
+                X[feature_cols], X[self.target_column]
+            )
         else:
             # Unknown method, keep all features
             selected = feature_cols
 
-        # Always include target and excluded columns
-        self.selected_features_ = list(set(selected + [self.target_column] + self.exclude_columns))
-
-        # Only keep columns that actually exist in X
-        self.selected_features_ = [col for col in self.selected_features_ if col in X.columns]
-
+        self._set_selected(selected, X.columns)
         return self
 
-    def transform(self, X):
+    def partial_fit(self, X, y=None):
         """
-        Transform by keeping only selected features.
+        Update the selection with a batch.
+
+        Correlations and variances are merged exactly, so after the last batch
+        the selection equals the one fit makes on all rows. Columns are taken
+        from the first batch, or from fit if it was called before. mutual_info
+        needs all rows and is not supported.
 
         Args:
-            X: Input dataframe
+            X: Input dataframe batch
+            y: Target (unused, target is in X)
 
         Returns:
-            Dataframe with only selected features
+            self
         """
-        # Only select features that exist in X
-        available_features = [col for col in self.selected_features_ if col in X.columns]
-        return X[available_features].copy()
+        if self.method == "mutual_info":
+            raise ValueError("partial_fit does not support mutual_info selection")
+        if not hasattr(self, "statistics_"):
+            self._start_statistics(X)
+
+        if self.statistics_ is None:
+            # No target or unknown method, keep all features like fit
+            if self.target_column in self._columns:
+                features = [col for col in self._columns if col != self.target_column]
+                self._set_selected(features, self._columns)
+            else:
+                self.selected_features_ = list(self._columns)
+            return self
 
-    def _select_by_correlation(self, X: pd.DataFrame, target: pd.Series) -> list:
+        self._update_statistics(X)
+        self._select_from_statistics()
+        return self
+
+    def merge(self, other: "FeatureSelectionTransformer"):
         """
-        Select features based on correlation with target.
+        Add the statistics of a selector fit on another shard of the rows.
+
+        Shards can be fit in parallel and merged exactly; the selection is then
+        re-derived from the statistics without touching any rows.
 
         Args:
-            X: Feature dataframe
-            target: Target series
+            other: Selector with the same config, fit on the same columns
 
         Returns:
-            List of selected feature names
+            self
+
+        Raises:
+            ValueError: If either selector has no statistics or the columns differ
         """
-        threshold = self.params.get("threshold", 0.5)
+        if any(getattr(selector, "statistics_", None) is None for selector in (self, other)):
+            raise ValueError(
+                "merge needs both selectors fit with correlation or variance_threshold"
+            )
+        if other._numeric_cols != self._numeric_cols:
+            raise ValueError(
+                f"Cannot merge selectors fit on different columns: "
+                f"{self._numeric_cols} and {other._numeric_cols}"
+            )
+
+        self.statistics_.merge(other.statistics_)
+        self._select_from_statistics()
+        return self
 
-        # Only correlate numeric columns
-        numeric_cols = X.select_dtypes(include=[np.number]).columns.tolist()
+    def _start_statistics(self, X) -> None:
+        self.n_features_in_ = X.shape[1]
+        # Score of every numeric feature under the selection method, for logging
+        self.scores_ = pd.Series(dtype=np.float64)
+        self._columns = list(X.columns)
+        self.statistics_ = None
+        self._numeric_cols = []
+        self._non_numeric_cols = []
 
-        if not numeric_cols:
-            return []
+        if self.target_column is None or self.target_column not in X.columns:
+            return
 
-        # Calculate correlations
-        correlations = X[numeric_cols].corrwith(target).abs()
+        features = X.drop(columns=[self.target_column])
+        self._numeric_cols = features.select_dtypes(include=[np.number]).columns.tolist()
+        self._non_numeric_cols = [col for col in features.columns if col not in self._numeric_cols]
+        if self.method in ("correlation", "variance_threshold"):
+            self.statistics_ = TargetStatistics(len(self._numeric_cols))
 
-        # Select features above threshold
-        selected = correlations[correlations >= threshold].index.tolist()
+    def _update_statistics(self, X) -> None:
+        block = X[self._numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+        target = X[self.target_column].to_numpy(dtype=np.float64, na_value=np.nan)
+        self.statistics_.update(block, target)
 
-        # Add back non-numeric columns (we don't want to drop them automatically)
-        non_numeric_cols = X.select_dtypes(exclude=[np.number]).columns.tolist()
-        selected.extend(non_numeric_cols)
+    def _select_from_statistics(self) -> None:
+        if self.method == "correlation":
+            score = np.abs(self.statistics_.correlation())
+            keep = score >= self.params.get("threshold", 0.5)
+        else:
+            # Sample variance, like DataFrame.var
+            score = self.statistics_.var(ddof=1)
+            keep = score > self.params.get("threshold", 0.0)
+        self.scores_ = pd.Series(score, index=self._numeric_cols)
+
+        selected = [col for col, kept in zip(self._numeric_cols, keep) if kept]
+        self._set_selected(selected + self._non_numeric_cols, self._columns)
+
+    def _set_selected(self, selected: list, columns) -> None:
+        # Always include target and excluded columns
+        self.selected_features_ = list(set(selected + [self.target_column] + self.exclude_columns))
 
-        return selected
+        # Only keep columns that actually exist in X
+        self.selected_features_ = [col for col in self.selected_features_ if col in columns]
 
-    def _select_by_variance(self, X: pd.DataFrame) -> list:
+    def transform(self, X):
         """
-        Select features based on variance threshold.
+        Transform by keeping only selected features.
 
         Args:
-            X: Feature dataframe
+            X: Input dataframe
 
         Returns:
-            List of selected feature names
+            Dataframe with only selected features
         """
-        threshold = self.params.get("threshold", 0.0)
-
-        # Only check variance for numeric columns
-        numeric_cols = X.select_dtypes(include=[np.number]).columns.tolist()
-
-        if not numeric_cols:
-            return []
-
-        # Calculate variances
-        variances = X[numeric_cols].var()
-
-        # Select features above threshold
-        selected = variances[variances > threshold].index.tolist()
-
-        # Add back non-numeric columns
-        non_numeric_cols = X.select_dtypes(exclude=[np.number]).columns.tolist()
-        selected.extend(non_numeric_cols)
-
-        return selected
+        # Only select features that exist in X
+        available_features = [col for col in self.selected_features_ if col in X.columns]
+        return X[available_features].copy()
 
-    def _select_by_mutual_info(self, X: pd.DataFrame, target: pd.Series) -> list:
+    def _select_by_mutual_info(self, X: pd.DataFrame, target: pd.Series) -> tuple[list, pd.Series]:
         """
         Select features based on mutual information with target.
 
@@ -162,7 +413,7 @@ class FeatureSelectionTransformer(BaseEstimator, TransformerMixin):
             target: Target series
 
         Returns:
-            List of selected feature names
+            Tuple of (selected feature names, normalized MI score per numeric feature)
         """
         threshold = self.params.get("threshold", 0.5)
         n_neighbors = self.params.get("n_neighbors", 3)
@@ -171,12 +422,18 @@ class FeatureSelectionTransformer(BaseEstimator, TransformerMixin):
         numeric_cols = X.select_dtypes(include=[np.number]).columns.tolist()
 
         if not numeric_cols or len(X) < n_neighbors:
-            return list(X.columns)
-
-        # Calculate mutual information
-        mi_scores = mutual_info_regression(
-            X[numeric_cols], target, n_neighbors=min(n_neighbors, len(X) - 1), random_state=42
-        )
+            return list(X.columns), pd.Series(dtype=np.float64)
+
+        # Calculate mutual information, optionally cached across thresholds
+        mi_scores = mutual_info_scores(
+            X[numeric_cols],
+            target,
+            n_neighbors=n_neighbors,
+            sample_size=self.params.get("sample_size"),
+            n_jobs=self.params.get("n_jobs", 1),
+            executor=self.params.get("executor", "thread"),
+            cache=self.params.get("cache_scores", False),
+        ).to_numpy()
 
         # Normalize scores to 0-1 range
         if mi_scores.max() > 0:
@@ -189,4 +446,4 @@ class FeatureSelectionTransformer(BaseEstimator, TransformerMixin):
         non_numeric_cols = X.select_dtypes(exclude=[np.number]).columns.tolist()
         selected.extend(non_numeric_cols)
 
-        return selected
+        return selected, pd.Series(mi_scores, index=numeric_cols)
@@ -0,0 +1,243 @@
+"""
+Outlier removal as a single row mask.
+
+Every per-column condition of a remove_outliers config reduces to an interval
+of inliers: fixed thresholds directly, statistical detectors from the fitted
+data. The intervals of all columns are intersected per column and applied to
+one (rows, columns) array in a single vectorized pass, optionally ANDed with
+an IsolationForest over several columns. The result is one set of row
+positions, so X and y are each gathered once instead of being sliced per
+condition.
+"""
+
+from collections.abc import Callable
+
+from loguru import logger
+import numpy as np
+import pandas as pd
+import polars as pl
+import polars.selectors as cs
+from sklearn.ensemble import IsolationForest
+
+
+def _greaterthan_bounds(values: np.ndarray, limit: np.ndarray):
+    return np.full(len(limit), -np.inf), limit
+
+
+def _lessthan_bounds(values: np.ndarray, limit: np.ndarray):
+    return limit, np.full(len(limit), np.inf)
+
+
+def _iqr_bounds(values: np.ndarray, factor: np.ndarray):
+    q1, q3 = np.nanquantile(values, [0.25, 0.75], axis=0)
+    spread = factor * (q3 - q1)
+    return q1 - spread, q3 + spread
+
+
+def _zscore_bounds(values: np.ndarray, threshold: np.ndarray):
+    mean = np.nanmean(values, axis=0)
+    spread = threshold * np.nanstd(values, axis=0)
+    return mean - spread, mean + spread
+
+
+# Condition name -> bounds(values of its columns, one parameter per column) -> (low, high)
+DETECTORS: dict[str, Callable[[np.ndarray, np.ndarray], tuple[np.ndarray, np.ndarray]]] = {
+    "greaterthan": _greaterthan_bounds,
+    "lessthan": _lessthan_bounds,
+    "iqr": _iqr_bounds,
+    "zscore": _zscore_bounds,
+}
+
+# Conditions whose columns keep rows with missing values, like pandas quantiles skip them
+_KEEPS_MISSING = ("iqr", "zscore")
+
+
+class OutlierRemover:
+    """
+    Finds the inlier rows of a frame in one pass.
+
+    Config structure (a remove_outliers section):
+        {
+            "GrLivArea": {"greaterthan": 4000},  # keep GrLivArea <= 4000
+            "LotArea": {"iqr": 1.5},  # keep within 1.5 IQR of the quartiles
+            "SalePrice": {"zscore": 4.0},  # keep within 4 standard deviations
+            "isolation_forest": {  # optional, over several columns at once
+                "columns": ["GrLivArea", "LotArea"],  # default: all numeric columns
+                "contamination": 0.01,
+                "n_estimators": 100,
+                "n_jobs": -1,  # trees are fitted and scored in parallel
+                "random_state": 0
+            }
+        }
+
+    Rows with missing values fail a fixed threshold, like a RowFilter, but
+    pass the statistical detectors. Configured columns missing from the frame
+    are skipped with a warning, so conditions on a target (SalePrice above)
+    need the frame that still holds it, as in SimpleExperiment. Column
+    conditions are names in DETECTORS, so new detectors only need an entry
+    there.
+    """
+
+    def __init__(self, config):
+        """
+        Initialize remover with configuration.
+
+        Args:
+            config: Mapping of column -> {condition: parameter}, plus an
+                optional isolation_forest section
+        """
+        self.config = config
+
+    def fit(self, X):
+        """
+        Learn the inlier interval of every configured column.
+
+        Args:
+            X: pandas or polars dataframe
+
+        Returns:
+            self
+        """
+        configured = [column for column in self.config if column != "isolation_forest"]
+        missing = [column for column in configured if column not in X.columns]
+        if missing:
+            logger.warning(f"Skipping outlier conditions on missing columns: {missing}")
+        conditions = {
+            column: dict(self.config[column]) for column in configured if column in X.columns
+        }
+        for column_conditions in conditions.values():
+            unknown = set(column_conditions) - set(DETECTORS)
+            if unknown:
+                raise ValueError(
+                    f"Unknown outlier condition: {sorted(unknown)}. "
+                    f"Supported conditions: {list(DETECTORS)}"
+                )
+
+        self.columns_ = list(conditions)
+        values = _values(X, self.columns_)
+        self.low_ = np.full(len(self.columns_), -np.inf)
+        self.high_ = np.full(len(self.columns_), np.inf)
+        self.keeps_missing_ = np.ones(len(self.columns_), dtype=bool)
+
+        for name, bounds in DETECTORS.items():
+            # One call per detector for all of its columns
+            positions = [i for i, col in enumerate(self.columns_) if name in conditions[col]]
+            if not positions:
+                continue
+            params = np.array([conditions[self.columns_[i]][name] for i in positions], dtype=float)
+            with np.errstate(all="ignore"):
+                low, high = bounds(values[:, positions], params)
+            # An all-missing column gives no bounds rather than removing every row
+            self.low_[positions] = np.fmax(self.low_[positions], low)
+            self.high_[positions] = np.fmin(self.high_[positions], high)
+            if name not in _KEEPS_MISSING:
+                self.keeps_missing_[positions] = False
+
+        self.forest_ = None
+        forest_cfg = self.config.get("isolation_forest")
+        if forest_cfg:
+            forest_cfg = dict(forest_cfg)
+            columns = forest_cfg.pop("columns", None) or _numeric_columns(X)
+            self.forest_columns_ = [col for col in columns if col in X.columns]
+            forest_cfg.setdefault("random_state", 0)
+            forest_values = _values(X, self.forest_columns_)
+            self.forest_medians_ = np.nan_to_num(np.nanmedian(forest_values, axis=0))
+            self.forest_ = IsolationForest(**forest_cfg).fit(self._fill(forest_values))
+
+        return self
+
+    def inlier_mask(self, X) -> np.ndarray:
+        """
+        Boolean mask of the rows passing every condition.
+
+        Args:
+            X: pandas or polars dataframe with the fitted columns
+
+        Returns:
+            Array of shape (rows,)
+        """
+        values = _values(X, self.columns_)
+        inside = (values >= self.low_) & (values <= self.high_)
+        inside |= np.isnan(values) & self.keeps_missing_
+        mask = inside.all(axis=1)
+
+        if self.forest_ is not None:
+            forest_values = self._fill(_values(X, self.forest_columns_))
+            mask &= self.forest_.predict(forest_values) == 1
+        return mask
+
+    def inlier_rows(self, X) -> np.ndarray:
+        """
+        Positions of the inlier rows, in order.
+
+        Args:
+            X: pandas or polars dataframe with the fitted columns
+
+        Returns:
+            Integer array of row positions
+        """
+        return np.flatnonzero(self.inlier_mask(X))
+
+    def _fill(self, values: np.ndarray) -> np.ndarray:
+        # IsolationForest does not accept missing values
+        return np.where(np.isnan(values), self.forest_medians_, values)
+
+
+def remove_outliers(X, y, config):
+    """
+    Remove outlier rows from X and y together.
+
+    The mask is computed once and both are gathered with the same row
+    positions, so they stay aligned. Conditions on the target are skipped, as
+    X does not hold it; filter the frame with the target instead to apply them.
+
+    Args:
+        X: pandas or polars dataframe of features
+        y: Target as a pandas Series or numpy array
+        config: remove_outliers section, see OutlierRemover
+
+    Returns:
+        Tuple of (X, y) without the outlier rows
+    """
+    rows = OutlierRemover(config).fit(X).inlier_rows(X)
+    return take_rows(X, rows), take_rows(y, rows)
+
+
+def take_rows(data, rows: np.ndarray):
+    """Gather rows by position from a pandas, polars or numpy container."""
+    if isinstance(data, pd.DataFrame | pd.Series):
+        return data.take(rows)
+    return data[rows]
+
+
+def uses_statistics(config) -> bool:
+    """Whether a remove_outliers config needs the data, rather than only fixed thresholds."""
+    return any(
+        column == "isolation_forest" or set(conditions) - {"greaterthan", "lessthan"}
+        for column, conditions in config.items()
+    )
+
+
+def outlier_columns(config) -> set[str] | None:
+    """Columns a remove_outliers config reads, None if it reads all numeric columns."""
+    columns = {column for column in config if column != "isolation_forest"}
+    forest_cfg = config.get("isolation_forest")
+    if forest_cfg:
+        if not forest_cfg.get("columns"):
+            return None
+        columns.update(forest_cfg["columns"])
+    return columns
+
+
+def _values(X, columns: list[str]) -> np.ndarray:
+    if not columns:
+        return np.empty((len(X), 0))
+    if isinstance(X, pl.DataFrame):
+        return X.select(pl.col(columns).cast(pl.Float64)).to_numpy()
+    return X[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _numeric_columns(X) -> list[str]:
+    if isinstance(X, pl.DataFrame):
+        return X.select(cs.numeric()).columns
+    return X.select_dtypes(include=["number"]).columns.tolist()
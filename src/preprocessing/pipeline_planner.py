@@ -0,0 +1,146 @@
+"""
+Column lineage of a fitted pipeline, to prune work no later step uses.
+
+Walking the steps forward gives the columns each step sees. Walking them
+backward from feature_selection gives the columns later steps actually read.
+Every upstream step is then told to skip the columns it computes for nobody:
+drop_columns drops them right away, mapping, imputation and scaling pass them
+through untouched and feature_engineering does not compute them. The output
+of the pipeline does not change.
+"""
+
+from dataclasses import dataclass
+
+import pandas as pd
+from sklearn.pipeline import Pipeline
+
+from src.preprocessing.feature_engineering import FeatureEngineeringTransformer
+from src.preprocessing.feature_selection import FeatureSelectionTransformer
+from src.preprocessing.sklearn_pipeline_builder import (
+    CategoricalMapTransformer,
+    DropColumnsTransformer,
+    ImputationTransformer,
+    ImputeScaleTransformer,
+    ScalingTransformer,
+)
+
+# Steps that only touch their own columns and can skip some of them
+_PRUNABLE = (
+    DropColumnsTransformer,
+    CategoricalMapTransformer,
+    ImputationTransformer,
+    ImputeScaleTransformer,
+    ScalingTransformer,
+    FeatureEngineeringTransformer,
+)
+
+
+@dataclass
+class StepPlan:
+    """Columns a step computes, and those it skips because no later step uses them."""
+
+    name: str
+    computed: list[str]
+    skipped: list[str]
+
+
+@dataclass
+class PipelinePlan:
+    """
+    Pruning applied to a fitted pipeline.
+
+    Costs are estimated as cells, rows times computed columns per step.
+    """
+
+    rows: int
+    steps: list[StepPlan]
+
+    @property
+    def computed_cells(self) -> int:
+        return self.rows * sum(len(step.computed) for step in self.steps)
+
+    @property
+    def saved_cells(self) -> int:
+        return self.rows * sum(len(step.skipped) for step in self.steps)
+
+    def __str__(self) -> str:
+        share = self.saved_cells / self.computed_cells if self.computed_cells else 0.0
+        lines = [
+            f"Pipeline plan for {self.rows:,} rows: skips {self.saved_cells:,} of "
+            f"{self.computed_cells:,} computed cells ({share:.0%})"
+        ]
+        for step in self.steps:
+            kept = len(step.computed) - len(step.skipped)
+            line = f"  {step.name:<24} {kept:>5} of {len(step.computed):>5} columns"
+            if step.skipped:
+                more = f", ... (+{len(step.skipped) - 5})" if len(step.skipped) > 5 else ""
+                line += f", skips {', '.join(step.skipped[:5])}{more}"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+def prune_pipeline(pipeline: Pipeline, X: pd.DataFrame) -> PipelinePlan:
+    """
+    Tell every step of a fitted pipeline to skip columns no later step uses.
+
+    Only steps upstream of a feature_selection are pruned, as far back as
+    every step in between is one of the pandas steps above. Refitting the
+    pipeline undoes the pruning.
+
+    Args:
+        pipeline: Fitted pipeline from build_pipeline
+        X: Frame the pipeline was fitted on, or one with the same columns
+
+    Returns:
+        The plan, printable as a table with the estimated savings
+    """
+    available = []
+    columns = list(X.columns)
+    for _, step in pipeline.steps:
+        available.append(columns)
+        columns = _output_columns(step, columns)
+
+    needed = None  # columns later steps use, None for all
+    plans = []
+    for (name, step), columns in reversed(list(zip(pipeline.steps, available))):
+        if isinstance(step, FeatureSelectionTransformer):
+            selected = set(step.selected_features_)
+            needed = selected if needed is None else needed & selected
+            continue
+        if needed is None or not isinstance(step, _PRUNABLE):
+            needed = None
+            continue
+
+        computed = _computed_columns(step, columns)
+        outputs = set(step.expressions_) if isinstance(step, FeatureEngineeringTransformer) else ()
+        step.prune(needed)
+        plans.append(StepPlan(name, computed, [col for col in computed if col not in needed]))
+
+        if isinstance(step, FeatureEngineeringTransformer):
+            needed = (needed - outputs) | set(step.source_columns_)
+
+    return PipelinePlan(rows=len(X), steps=plans[::-1])
+
+
+def _output_columns(step, columns: list[str]) -> list[str]:
+    if isinstance(step, DropColumnsTransformer):
+        dropped = {*step.columns, *step.pruned_columns_}
+        return [col for col in columns if col not in dropped]
+    if isinstance(step, FeatureEngineeringTransformer):
+        return columns + [name for name in step.expressions_ if name not in columns]
+    if isinstance(step, FeatureSelectionTransformer):
+        return [col for col in step.selected_features_ if col in columns]
+    return columns
+
+
+def _computed_columns(step, columns: list[str]) -> list[str]:
+    if isinstance(step, DropColumnsTransformer):
+        # Columns carried on to the next step
+        return [col for col in columns if col not in step.columns]
+    if isinstance(step, CategoricalMapTransformer):
+        return [col for group, _, _ in step.groups_ for col in group if col in columns]
+    if isinstance(step, ImputationTransformer | ImputeScaleTransformer):
+        return step.numerical_cols_ + step.categorical_cols_
+    if isinstance(step, ScalingTransformer):
+        return step.numerical_cols_ if step.scaler_ is not None else []
+    return list(step.expressions_)
@@ -0,0 +1,314 @@
+"""
+Polars backend for the preprocessing pipeline.
+
+Every transformer accepts a Polars DataFrame or LazyFrame and returns a
+LazyFrame, so a fitted pipeline's transform is a single lazy query plan that
+Polars optimizes and executes multithreaded. fit collects only the statistics
+a step needs (medians, means, correlations, ...).
+
+Fitting is the exception to the single plan: a step whose fit reads the data
+(imputation, scaling, feature selection) needs the output of every step
+before it. Left lazy, Pipeline.fit_transform would execute the upstream
+chain again for every such step and once more for the model matrix, which is
+quadratic in the pipeline depth. Their fit_transform therefore collects its
+input once, fits on it and returns its own output collected, so every step
+runs once per fit at the cost of holding one materialized frame per
+data-dependent step.
+"""
+
+import numpy as np
+import polars as pl
+import polars.selectors as cs
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.feature_selection import mutual_info_regression
+
+from src.preprocessing.feature_engineering import compile_features
+
+
+def _lazy(X) -> pl.LazyFrame:
+    return X.lazy() if isinstance(X, pl.DataFrame) else X
+
+
+def _numeric_columns(lf: pl.LazyFrame, exclude_columns) -> list[str]:
+    return [col for col in lf.select(cs.numeric()).collect_schema() if col not in exclude_columns]
+
+
+def _missing(col: str, dtype: pl.DataType) -> pl.Expr:
+    """Null or NaN, the Polars equivalent of pandas isna()."""
+    if dtype.is_float():
+        return pl.col(col).is_null() | pl.col(col).is_nan()
+    return pl.col(col).is_null()
+
+
+class _CollectOnFit:
+    """fit_transform for steps whose fit reads the data, see the module docstring."""
+
+    def fit_transform(self, X, y=None, **fit_params):
+        df = _lazy(X).collect()
+        self.fit(df, y, **fit_params)
+        return self.transform(df).collect().lazy()
+
+
+class PolarsDropColumnsTransformer(BaseEstimator, TransformerMixin):
+    def __init__(self, columns):
+        self.columns = columns
+
+    def fit(self, X, y=None):
+        self.n_features_in_ = len(_lazy(X).collect_schema())
+        return self
+
+    def transform(self, X):
+        return _lazy(X).drop(list(self.columns), strict=False)
+
+
+class PolarsCategoricalMapTransformer(BaseEstimator, TransformerMixin):
+    def __init__(self, mappings):
+        self.mappings = mappings
+
+    def fit(self, X, y=None):
+        self.n_features_in_ = len(_lazy(X).collect_schema())
+        return self
+
+    def transform(self, X):
+        lf = _lazy(X)
+        schema = lf.collect_schema()
+
+        exprs = []
+        for col, config in self.mappings.items():
+            if col not in schema:
+                continue
+            mapping = dict(config["mapping"])
+            null_value = config.get("null_value", 0)
+            source = pl.col(col).cast(pl.String)
+            exprs.append(
+                pl.when(source.is_null())
+                .then(pl.lit(mapping.get(null_value, null_value)))
+                .otherwise(
+                    source.replace_strict(
+                        list(mapping), list(mapping.values()), default=null_value
+                    )
+                )
+                .alias(col)
+            )
+
+        return lf.with_columns(exprs) if exprs else lf
+
+
+class PolarsImputationTransformer(_CollectOnFit, BaseEstimator, TransformerMixin):
+    def __init__(self, numerical_strategy, categorical_strategy, exclude_columns):
+        self.numerical_strategy = numerical_strategy
+        self.categorical_strategy = categorical_strategy
+        self.exclude_columns = exclude_columns or []
+
+    def fit(self, X, y=None):
+        lf = _lazy(X)
+        schema = lf.collect_schema()
+        self.n_features_in_ = len(schema)
+
+        self.numerical_cols_ = _numeric_columns(lf, self.exclude_columns)
+        self.categorical_cols_ = [
+            col
+            for col, dtype in schema.items()
+            if dtype in (pl.String, pl.Categorical) and col not in self.exclude_columns
+        ]
+
+        stats = [
+            self._statistic(col, schema[col], self.numerical_strategy)
+            for col in self.numerical_cols_
+        ] + [self._statistic(col, schema[col], "mode") for col in self.categorical_cols_]
+
+        self.fill_values_ = lf.select(stats).collect().row(0, named=True) if stats else {}
+        return self
+
+    def transform(self, X):
+        lf = _lazy(X)
+        schema = lf.collect_schema()
+
+        exprs = [
+            pl.when(_missing(col, schema[col]))
+            .then(pl.lit(value))
+            .otherwise(pl.col(col))
+            .cast(pl.Float64 if schema[col].is_numeric() else schema[col])
+            .alias(col)
+            for col, value in self.fill_values_.items()
+            if col in schema and value is not None
+        ]
+        return lf.with_columns(exprs) if exprs else lf
+
+    @staticmethod
+    def _statistic(col: str, dtype: pl.DataType, strategy: str) -> pl.Expr:
+        values = pl.col(col).fill_nan(None) if dtype.is_float() else pl.col(col)
+        match strategy:
+            case "median":
+                return values.median().alias(col)
+            case "mean":
+                return values.mean().alias(col)
+            case "mode" | "most_frequent":
+                # Ties resolve to the smallest value, like sklearn's SimpleImputer
+                return values.drop_nulls().mode().sort().first().alias(col)
+            case _:
+                raise ValueError(f"Unknown imputation strategy: {strategy}")
+
+
+class PolarsScalingTransformer(_CollectOnFit, BaseEstimator, TransformerMixin):
+    def __init__(self, strategy, exclude_columns):
+        self.strategy = strategy
+        self.exclude_columns = exclude_columns or []
+
+    def fit(self, X, y=None):
+        lf = _lazy(X)
+        self.n_features_in_ = len(lf.collect_schema())
+        self.numerical_cols_ = _numeric_columns(lf, self.exclude_columns)
+
+        if not self.numerical_cols_:
+            self.mean_, self.scale_ = {}, {}
+            return self
+
+        stats = lf.select(
+            [pl.col(col).mean().alias(f"{col}__mean") for col in self.numerical_cols_]
+            + [pl.col(col).std(ddof=0).alias(f"{col}__std") for col in self.numerical_cols_]
+        ).collect()
+
+        self.mean_ = {col: stats[f"{col}__mean"][0] for col in self.numerical_cols_}
+        # Constant columns are left unscaled, like StandardScaler
+        self.scale_ = {col: (stats[f"{col}__std"][0] or 1.0) for col in self.numerical_cols_}
+        return self
+
+    def transform(self, X):
+        if not self.numerical_cols_:
+            return _lazy(X)
+
+        return _lazy(X).with_columns(
+            ((pl.col(col).cast(pl.Float64) - self.mean_[col]) / self.scale_[col]).alias(col)
+            for col in self.numerical_cols_
+        )
+
+
+class PolarsFeatureEngineeringTransformer(BaseEstimator, TransformerMixin):
+    """
+    Polars version of FeatureEngineeringTransformer with the same config and column names.
+    """
+
+    def __init__(self, config: dict):
+        self.config = config
+
+    def fit(self, X, y=None):
+        schema = _lazy(X).collect_schema()
+        self.n_features_in_ = len(schema)
+        self.expressions_ = compile_features(self.config, list(schema))
+        return self
+
+    def transform(self, X):
+        lf = _lazy(X)
+        if not self.expressions_:
+            return lf
+        return lf.with_columns(list(self.expressions_.values()))
+
+
+class PolarsFeatureSelectionTransformer(_CollectOnFit, BaseEstimator, TransformerMixin):
+    """
+    Polars version of FeatureSelectionTransformer with the same config.
+    """
+
+    def __init__(self, config: dict):
+        self.config = config
+        self.method = config.get("method", "correlation")
+        self.params = config.get("params", {})
+        self.target_column = config.get("target_column")
+        self.exclude_columns = config.get("exclude_columns", [])
+
+    def fit(self, X, y=None):
+        lf = _lazy(X)
+        schema = lf.collect_schema()
+        self.n_features_in_ = len(schema)
+
+        if self.target_column is None or self.target_column not in schema:
+            self.selected_features_ = list(schema)
+            return self
+
+        feature_cols = [col for col in schema if col != self.target_column]
+        numeric_cols = [col for col in feature_cols if schema[col].is_numeric()]
+        non_numeric_cols = [col for col in feature_cols if not schema[col].is_numeric()]
+
+        if self.method == "correlation":
+            selected = self._select_by_correlation(lf, numeric_cols) + non_numeric_cols
+        elif self.method == "variance_threshold":
+            selected = self._select_by_variance(lf, numeric_cols) + non_numeric_cols
+        elif self.method == "mutual_info":
+            selected = self._select_by_mutual_info(lf, numeric_cols, feature_cols)
+        else:
+            selected = feature_cols
+
+        keep = set(selected) | {self.target_column} | set(self.exclude_columns)
+        self.selected_features_ = [col for col in schema if col in keep]
+        return self
+
+    def transform(self, X):
+        lf = _lazy(X)
+        schema = lf.collect_schema()
+        return lf.select([col for col in self.selected_features_ if col in schema])
+
+    def _select_by_correlation(self, lf: pl.LazyFrame, numeric_cols: list[str]) -> list[str]:
+        if not numeric_cols:
+            return []
+        threshold = self.params.get("threshold", 0.5)
+        correlations = lf.select(
+            pl.corr(pl.col(col), pl.col(self.target_column)).abs().alias(col)
+            for col in numeric_cols
+        ).collect()
+        return [
+            col
+            for col in numeric_cols
+            if correlations[col][0] is not None and correlations[col][0] >= threshold
+        ]
+
+    def _select_by_variance(self, lf: pl.LazyFrame, numeric_cols: list[str]) -> list[str]:
+        if not numeric_cols:
+            return []
+        threshold = self.params.get("threshold", 0.0)
+        variances = lf.select(pl.col(numeric_cols).var()).collect()
+        return [
+            col
+            for col in numeric_cols
+            if variances[col][0] is not None and variances[col][0] > threshold
+        ]
+
+    def _select_by_mutual_info(
+        self, lf: pl.LazyFrame, numeric_cols: list[str], feature_cols: list[str]
+    ) -> list[str]:
+        threshold = self.params.get("threshold", 0.5)
+        n_neighbors = self.params.get("n_neighbors", 3)
+        data = lf.select(numeric_cols + [self.target_column]).collect()
+
+        if not numeric_cols or len(data) < n_neighbors:
+            return feature_cols
+
+        mi_scores = mutual_info_regression(
+            data.select(numeric_cols).to_numpy(),
+            data[self.target_column].to_numpy(),
+            n_neighbors=min(n_neighbors, len(data) - 1),
+            random_state=42,
+        )
+        if mi_scores.max() > 0:
+            mi_scores = mi_scores / mi_scores.max()
+
+        selected = [col for col, score in zip(numeric_cols, mi_scores) if score >= threshold]
+        return selected + [col for col in feature_cols if col not in numeric_cols]
+
+
+def to_model_matrix(X) -> tuple[np.ndarray, list[str]]:
+    """
+    Collect a transformed LazyFrame into the numeric model input.
+
+    This is the single conversion to numpy: non-numeric columns are dropped
+    and remaining missing values are set to 0, like the pandas path.
+
+    Args:
+        X: Output of a fitted Polars pipeline
+
+    Returns:
+        Tuple of (float64 matrix, column names)
+    """
+    df = _lazy(X).select(cs.numeric()).collect()
+    df = df.with_columns(cs.float().fill_nan(0)).fill_null(0)
+    return df.to_numpy().astype(np.float64, copy=False), df.columns
@@ -1,11 +1,35 @@
+from collections.abc import Callable, Iterable, Iterator
+import copy
+
+from loguru import logger
+import numpy as np
 from omegaconf import DictConfig
+import pandas as pd
 from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.impute import SimpleImputer
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
+from sklearn.preprocessing._data import _handle_zeros_in_scale, _is_constant_feature
 
-from src.preprocessing.feature_engineering import FeatureEngineeringTransformer
+from src.domain.models.data_models import RowFilter
+from src.preprocessing.categorical_encoding import CategoricalEncodingTransformer
+from src.preprocessing.feature_engineering import FeatureEngineeringTransformer, feature_lineage
 from src.preprocessing.feature_selection import FeatureSelectionTransformer
+from src.preprocessing.outliers import OutlierRemover, outlier_columns
+from src.preprocessing.polars_pipeline import (
+    PolarsCategoricalMapTransformer,
+    PolarsDropColumnsTransformer,
+    PolarsFeatureEngineeringTransformer,
+    PolarsFeatureSelectionTransformer,
+    PolarsImputationTransformer,
+    PolarsScalingTransformer,
+)
+from src.preprocessing.streaming_stats import (
+    QuantileSummary,
+    RunningMoments,
+    ValueCounts,
+    merge_moments,
+)
 
 
 class DropColumnsTransformer(BaseEstimator, TransformerMixin):
@@ -14,82 +38,297 @@ class DropColumnsTransformer(BaseEstimator, TransformerMixin):
 
     def fit(self, X, y=None):
         self.n_features_in_ = X.shape[1]
+        self.feature_names_in_ = list(X.columns)
+        self.pruned_columns_ = []
         return self
 
+    def partial_fit(self, X, y=None):
+        return self.fit(X)
+
+    def prune(self, columns) -> None:
+        """Also drop the input columns that are not in columns, after fitting."""
+        self.pruned_columns_ = [
+            col for col in self.feature_names_in_ if col not in columns and col not in self.columns
+        ]
+
     def transform(self, X):
-        return X.drop(columns=self.columns, errors="ignore")
+        return X.drop(columns=[*self.columns, *self.pruned_columns_], errors="ignore")
 
 
 class RemoveOutliersTransformer(BaseEstimator, TransformerMixin):
+    """
+    Removes outlier rows with a single mask from an OutlierRemover.
+
+    fit learns the bounds of the statistical detectors, transform gathers the
+    inlier rows once. As X alone is filtered, the experiment removes outliers
+    from X and y together with remove_outliers instead of using this step.
+    """
+
     def __init__(self, config):
         self.config = config
 
     def fit(self, X, y=None):
         self.n_features_in_ = X.shape[1]
+        self.remover_ = OutlierRemover(self.config).fit(X)
         return self
 
     def transform(self, X):
-        X = X.copy()
-        for column, conditions in self.config.items():
-            if column not in X.columns:
-                continue
+        return X.take(self.remover_.inlier_rows(X))
 
-            # Apply greaterthan condition
-            if "greaterthan" in conditions:
-                X = X[X[column] <= conditions["greaterthan"]]
 
-            # Apply lessthan condition
-            if "lessthan" in conditions:
-                X = X[X[column] >= conditions["lessthan"]]
+def outlier_filters(config) -> list[RowFilter]:
+    """Translate a remove_outliers config into row filters that keep inliers.
 
-        return X
+    Only fixed thresholds translate; statistical detectors need the data,
+    see uses_statistics.
+
+    Args:
+        config: Mapping of column -> {greaterthan: value, lessthan: value}
+
+    Returns:
+        List of RowFilter, combined with AND
+    """
+    filters = []
+    for column, conditions in config.items():
+        if column == "isolation_forest":
+            continue
+        if "greaterthan" in conditions:
+            filters.append(RowFilter(column, "<=", conditions["greaterthan"]))
+        if "lessthan" in conditions:
+            filters.append(RowFilter(column, ">=", conditions["lessthan"]))
+    return filters
 
 
 class CategoricalMapTransformer(BaseEstimator, TransformerMixin):
-    def __init__(self, mappings):
+    """
+    Maps categories to numbers with one lookup table per column.
+
+    fit compiles every mapping into a table indexed by category code, with
+    two last entries for unseen and missing values. Like the baseline
+    fillna(null_value).map(mapping).fillna(null_value), unseen values become
+    null_value while missing values are looked up as null_value. Columns with the same set of
+    categories (e.g. the Ex/Gd/TA/Fa/Po quality columns) form one group, so
+    transform encodes a whole group with a single hashing pass and a single
+    gather, table[codes], instead of a Series.map per column.
+    """
+
+    def __init__(self, mappings, copy=True):
         self.mappings = mappings
+        self.copy = copy
 
     def fit(self, X, y=None):
         self.n_features_in_ = X.shape[1]
+
+        groups = {}
+        for col, config in self.mappings.items():
+            mapping = dict(config["mapping"])
+            null_value = config.get("null_value", 0)
+            # Whatever Series.map leaves missing is filled with null_value
+            mapped = [null_value if pd.isna(value) else value for value in mapping.values()]
+            # Missing values become null_value first, which may itself be a mapped category
+            missing = mapping.get(null_value, null_value)
+            missing = null_value if pd.isna(missing) else missing
+            columns, tables = groups.setdefault(tuple(mapping), ([], []))
+            columns.append(col)
+            tables.append([*mapped, null_value, missing])
+
+        # (columns, categories, table of shape (columns, categories + 2))
+        self.groups_ = [
+            (columns, pd.Index(categories), _lookup_table(tables))
+            for categories, (columns, tables) in groups.items()
+        ]
+        return self
+
+    def partial_fit(self, X, y=None):
+        # The tables only depend on the mappings
+        if not hasattr(self, "groups_"):
+            self.fit(X)
         return self
 
+    def prune(self, columns) -> None:
+        """Only map the columns in columns, after fitting; the others pass through."""
+        groups = []
+        for group_columns, categories, table in self.groups_:
+            keep = [i for i, col in enumerate(group_columns) if col in columns]
+            if keep:
+                groups.append(([group_columns[i] for i in keep], categories, table[keep]))
+        self.groups_ = groups
+
     def transform(self, X):
-        X = X.copy()
-        for col, config in self.mappings.items():
-            if col in X.columns:
-                X[col] = X[col].fillna(config.get("null_value", 0))
-                X[col] = X[col].map(config["mapping"]).fillna(config.get("null_value", 0))
+        if self.copy:
+            X = X.copy()
+        for columns, categories, table in self.groups_:
+            present = [i for i, col in enumerate(columns) if col in X.columns]
+            if not present:
+                continue
+            names = [columns[i] for i in present]
+
+            codes = category_codes(categories, X[names].to_numpy(dtype=object))
+            X[names] = table[np.array(present)[None, :], codes]
         return X
 
 
+def _lookup_table(tables: list[list]) -> np.ndarray:
+    """Numeric array of the tables, or an object array if some entry is not a number."""
+    table = np.array(tables)
+    if table.dtype.kind in "OSU":
+        # Keep e.g. a string null_value as is instead of turning the numbers into strings
+        table = np.array(tables, dtype=object)
+    return table
+
+
+def category_codes(categories: pd.Index, values: np.ndarray) -> np.ndarray:
+    """
+    Lookup table columns of values, for the tables of CategoricalMapTransformer.
+
+    Args:
+        categories: Categories of a fitted group
+        values: Object array of shape (rows, columns)
+
+    Returns:
+        Integer array of values.shape; unseen values get -2 and missing values
+        -1, the two last table entries
+    """
+    codes = categories.get_indexer(values.ravel()).reshape(values.shape)
+    codes[codes == -1] = -2
+    codes[pd.isna(values)] = -1
+    return codes
+
+
+def _select_columns(X: pd.DataFrame, include: list[str]) -> pd.Index:
+    """Columns of X with the given dtypes, like select_dtypes but without copying the data."""
+    return X.iloc[:0].select_dtypes(include=include).columns
+
+
+def _imputation_columns(X, exclude_columns) -> tuple[list[str], list[str]]:
+    """Numerical and categorical columns to impute."""
+    numerical = [col for col in _select_columns(X, ["number"]) if col not in exclude_columns]
+    categorical = [
+        col for col in _select_columns(X, ["object", "category"]) if col not in exclude_columns
+    ]
+    return numerical, categorical
+
+
+def _sklearn_strategy(strategy: str) -> str:
+    # Map 'mode' to sklearn's 'most_frequent'
+    return "most_frequent" if strategy == "mode" else strategy
+
+
+def _check_partial_fit_categorical(strategy: str) -> None:
+    if _sklearn_strategy(strategy) != "most_frequent":
+        raise ValueError(f"partial_fit does not support categorical_strategy {strategy}")
+
+
+def _running_statistic(strategy: str, columns: list[str]):
+    """Mergeable statistic behind an imputation strategy, for partial_fit."""
+    if strategy == "median":
+        return QuantileSummary(len(columns))
+    if strategy == "mean":
+        return RunningMoments(len(columns))
+    if strategy == "most_frequent":
+        return ValueCounts(columns)
+    raise ValueError(f"partial_fit does not support numerical_strategy {strategy}")
+
+
+def _update_statistic(statistic, X: pd.DataFrame) -> None:
+    if isinstance(statistic, ValueCounts):
+        statistic.update(X)
+    else:
+        statistic.update(X.to_numpy(dtype=np.float64, na_value=np.nan))
+
+
+def _statistic_values(statistic):
+    if isinstance(statistic, QuantileSummary):
+        return statistic.quantile(0.5)
+    if isinstance(statistic, RunningMoments):
+        return statistic.mean
+    return statistic.most_frequent()
+
+
+def _rank_error(statistic) -> float:
+    """Largest relative rank error of approximate medians, 0 for exact statistics."""
+    if isinstance(statistic, QuantileSummary) and statistic.count.any():
+        return float(np.nanmax(statistic.relative_rank_error))
+    return 0.0
+
+
+def _prune_fitted(estimator, fitted_columns: list[str], columns):
+    """
+    Restrict a fitted column-wise sklearn estimator to the fitted columns in columns.
+
+    Works for SimpleImputer and StandardScaler, whose per-column attributes
+    (statistics_, mean_, scale_, feature_names_in_, ...) are arrays over the
+    fitted columns. The estimator is copied, not modified.
+
+    Returns:
+        Tuple of (pruned estimator or None if no column is left, kept columns)
+    """
+    keep = [i for i, col in enumerate(fitted_columns) if col in columns]
+    kept = [fitted_columns[i] for i in keep]
+    if estimator is None or not keep:
+        return None, kept
+
+    n_features = estimator.n_features_in_
+    estimator = copy.copy(estimator)
+    for name, value in list(vars(estimator).items()):
+        per_column = isinstance(value, np.ndarray) and value.shape[:1] == (n_features,)
+        if name.endswith("_") and per_column:
+            setattr(estimator, name, value[keep])
+    estimator.n_features_in_ = len(keep)
+    return estimator, kept
+
+
+def _imputer_from_statistics(strategy: str, columns: list[str], values) -> SimpleImputer | None:
+    """
+    A fitted SimpleImputer whose statistics_ are the given values.
+
+    Fitting on a single row holding the values yields exactly those statistics
+    for the mean, median and most_frequent strategies.
+    """
+    if not columns:
+        return None
+    return SimpleImputer(strategy=strategy).fit(pd.DataFrame([list(values)], columns=columns))
+
+
+def _update_columns_inplace(X: pd.DataFrame, columns: list[str], update) -> None:
+    """
+    Call update(values, i) on the float64 values of each column i, in place.
+
+    Float64 columns are updated in the block of X itself, so no new block is
+    allocated. Other columns are converted to float64 and assigned back.
+    """
+    for i, col in enumerate(columns):
+        values = X[col].to_numpy()
+        if values.dtype == np.float64 and values.flags.writeable:
+            update(values, i)
+        else:
+            values = X[col].to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+            update(values, i)
+            X[col] = values
+
+
 class ImputationTransformer(BaseEstimator, TransformerMixin):
-    def __init__(self, numerical_strategy, categorical_strategy, exclude_columns):
+    def __init__(self, numerical_strategy, categorical_strategy, exclude_columns, copy=True):
         self.numerical_strategy = numerical_strategy
         self.categorical_strategy = categorical_strategy
         self.exclude_columns = exclude_columns or []
+        self.copy = copy
 
     def fit(self, X, y=None):
         self.n_features_in_ = X.shape[1]
 
         # Identify column types
-        self.numerical_cols_ = [
-            col
-            for col in X.select_dtypes(include=["number"]).columns
-            if col not in self.exclude_columns
-        ]
-        self.categorical_cols_ = [
-            col
-            for col in X.select_dtypes(include=["object"]).columns
-            if col not in self.exclude_columns
-        ]
-
-        # Map 'mode' to sklearn's 'most_frequent'
-        cat_strategy = (
-            "most_frequent" if self.categorical_strategy == "mode" else self.categorical_strategy
-        )
+        self.numerical_cols_, self.categorical_cols_ = _imputation_columns(X, self.exclude_columns)
+        cat_strategy = _sklearn_strategy(self.categorical_strategy)
 
         # Fit imputers
-        if self.numerical_cols_:
+        if self.numerical_cols_ and self.numerical_strategy in ("mean", "median"):
+            # Column by column, without the float copy of all numeric columns SimpleImputer makes
+            values = [getattr(X[col], self.numerical_strategy)() for col in self.numerical_cols_]
+            self.num_imputer_ = _imputer_from_statistics(
+                self.numerical_strategy, self.numerical_cols_, values
+            )
+        elif self.numerical_cols_:
             self.num_imputer_ = SimpleImputer(strategy=self.numerical_strategy)
             self.num_imputer_.fit(X[self.numerical_cols_])
         else:
@@ -103,11 +342,59 @@ class ImputationTransformer(BaseEstimator, TransformerMixin):
 
         return self
 
+    def partial_fit(self, X, y=None):
+        """
+        Update the imputation values with a batch.
+
+        Means and most frequent values are exact. Medians are approximate,
+        median_rank_error_ bounds their error as a fraction of the rank.
+        Columns are taken from the first batch.
+        """
+        if not hasattr(self, "_numerical_stats"):
+            _check_partial_fit_categorical(self.categorical_strategy)
+            self.n_features_in_ = X.shape[1]
+            self.numerical_cols_, self.categorical_cols_ = _imputation_columns(
+                X, self.exclude_columns
+            )
+            self._numerical_stats = _running_statistic(
+                self.numerical_strategy, self.numerical_cols_
+            )
+            self._categorical_counts = ValueCounts(self.categorical_cols_)
+
+        _update_statistic(self._numerical_stats, X[self.numerical_cols_])
+        self._categorical_counts.update(X)
+
+        self.num_imputer_ = _imputer_from_statistics(
+            self.numerical_strategy,
+            self.numerical_cols_,
+            _statistic_values(self._numerical_stats),
+        )
+        self.cat_imputer_ = _imputer_from_statistics(
+            "most_frequent", self.categorical_cols_, self._categorical_counts.most_frequent()
+        )
+        self.median_rank_error_ = _rank_error(self._numerical_stats)
+        return self
+
+    def prune(self, columns) -> None:
+        """Only impute the columns in columns, after fitting; the others pass through."""
+        self.num_imputer_, self.numerical_cols_ = _prune_fitted(
+            self.num_imputer_, self.numerical_cols_, columns
+        )
+        self.cat_imputer_, self.categorical_cols_ = _prune_fitted(
+            self.cat_imputer_, self.categorical_cols_, columns
+        )
+
     def transform(self, X):
-        X = X.copy()
+        if self.copy:
+            X = X.copy()
 
         if self.num_imputer_ is not None:
-            X[self.numerical_cols_] = self.num_imputer_.transform(X[self.numerical_cols_])
+            fill = self.num_imputer_.statistics_
+
+            def impute(values, i):
+                np.copyto(values, fill[i], where=np.isnan(values))
+
+            _update_columns_inplace(X, self.numerical_cols_, impute)
 
         if self.cat_imputer_ is not None:
             X[self.categorical_cols_] = self.cat_imputer_.transform(X[self.categorical_cols_])
@@ -115,42 +402,339 @@ class ImputationTransformer(BaseEstimator, TransformerMixin):
         return X
 
 
+# Rows per chunk ScalingTransformer.fit passes to StandardScaler.partial_fit
+SCALER_FIT_ROWS = 2048
+
+
 class ScalingTransformer(BaseEstimator, TransformerMixin):
-    def __init__(self, strategy, exclude_columns):
+    def __init__(self, strategy, exclude_columns, copy=True):
         self.strategy = strategy
         self.exclude_columns = exclude_columns or []
+        self.copy = copy
 
     def fit(self, X, y=None):
         self.n_features_in_ = X.shape[1]
 
         # Only scale numerical columns
         self.numerical_cols_ = [
-            col
-            for col in X.select_dtypes(include=["number"]).columns
-            if col not in self.exclude_columns
+            col for col in _select_columns(X, ["number"]) if col not in self.exclude_columns
         ]
 
         if self.numerical_cols_:
+            # In chunks of rows, so only a chunk of the numeric columns is copied to float at once
             self.scaler_ = StandardScaler()
-            self.scaler_.fit(X[self.numerical_cols_])
+            for start in range(0, max(len(X), 1), SCALER_FIT_ROWS):
+                self.scaler_.partial_fit(
+                    X.iloc[start : start + SCALER_FIT_ROWS][self.numerical_cols_]
+                )
         else:
             self.scaler_ = None
 
         return self
 
+    def partial_fit(self, X, y=None):
+        """Update the means and variances with a batch, exactly (StandardScaler.partial_fit)."""
+        if not hasattr(self, "scaler_"):
+            self.n_features_in_ = X.shape[1]
+            self.numerical_cols_ = [
+                col for col in _select_columns(X, ["number"]) if col not in self.exclude_columns
+            ]
+            self.scaler_ = StandardScaler() if self.numerical_cols_ else None
+
+        if self.scaler_ is not None:
+            self.scaler_.partial_fit(X[self.numerical_cols_])
+        return self
+
+    def prune(self, columns) -> None:
+        """Only scale the columns in columns, after fitting; the others pass through."""
+        self.scaler_, self.numerical_cols_ = _prune_fitted(
+            self.scaler_, self.numerical_cols_, columns
+        )
+
     def transform(self, X):
         if self.scaler_ is None:
             return X
 
-        X = X.copy()
-        X[self.numerical_cols_] = self.scaler_.transform(X[self.numerical_cols_])
+        if self.copy:
+            X = X.copy()
+        mean, scale = self.scaler_.mean_, self.scaler_.scale_
+
+        def standardize(values, i):
+            values -= mean[i]
+            values /= scale[i]
+
+        _update_columns_inplace(X, self.numerical_cols_, standardize)
         return X
 
 
+# Numerical imputation strategies ImputeScaleTransformer computes itself
+FUSED_STRATEGIES = {"median": np.nanmedian, "mean": np.nanmean}
+
+
+class ImputeScaleTransformer(BaseEstimator, TransformerMixin):
+    """
+    ImputationTransformer followed by ScalingTransformer, fused into one step.
+
+    fit reads the numeric columns into one block and derives the fill values,
+    means and standard deviations from it. transform imputes and standardizes
+    that block in place and writes it back once, instead of two copies, two
+    dtype scans and two sklearn objects. Columns excluded from imputation or
+    from scaling are left alone by that part only, like in the separate steps.
+    """
+
+    def __init__(
+        self,
+        numerical_strategy,
+        categorical_strategy,
+        imputation_exclude_columns,
+        scaling_exclude_columns,
+        copy=True,
+    ):
+        self.numerical_strategy = numerical_strategy
+        self.categorical_strategy = categorical_strategy
+        self.imputation_exclude_columns = imputation_exclude_columns or []
+        self.scaling_exclude_columns = scaling_exclude_columns or []
+        self.copy = copy
+
+    def fit(self, X, y=None):
+        self._check_strategies()
+        self.n_features_in_ = X.shape[1]
+        imputed, scaled = self._set_columns(X)
+
+        block = X[self.numerical_cols_].to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+        with np.errstate(invalid="ignore"):
+            fill = FUSED_STRATEGIES[self.numerical_strategy](block, axis=0)
+        # NaN fill values leave columns that are not imputed untouched
+        self.fill_ = np.where(imputed, fill, np.nan)
+        np.copyto(block, self.fill_, where=np.isnan(block))
+        count = np.count_nonzero(~np.isnan(block), axis=0)
+        self._set_scaling(np.nanmean(block, axis=0), np.nanvar(block, axis=0), count, scaled)
+
+        if self.categorical_cols_:
+            cat_strategy = _sklearn_strategy(self.categorical_strategy)
+            self.cat_imputer_ = SimpleImputer(strategy=cat_strategy)
+            self.cat_imputer_.fit(X[self.categorical_cols_])
+        else:
+            self.cat_imputer_ = None
+
+        return self
+
+    def partial_fit(self, X, y=None):
+        """
+        Update the statistics with a batch.
+
+        The scaling statistics are exact for the current fill values: the
+        moments of the observed values are merged with the missing values
+        counted at the fill value. Medians are approximate, median_rank_error_
+        bounds their error as a fraction of the rank.
+        """
+        if not hasattr(self, "_observed"):
+            self._check_strategies()
+            _check_partial_fit_categorical(self.categorical_strategy)
+            self.n_features_in_ = X.shape[1]
+            self._imputed, self._scaled = self._set_columns(X)
+            self._fill_stats = _running_statistic(self.numerical_strategy, self.numerical_cols_)
+            self._observed = RunningMoments(len(self.numerical_cols_))
+            self._missing = np.zeros(len(self.numerical_cols_), dtype=np.int64)
+            self._categorical_counts = ValueCounts(self.categorical_cols_)
+
+        block = X[self.numerical_cols_].to_numpy(dtype=np.float64, na_value=np.nan)
+        self._fill_stats.update(block)
+        self._observed.update(block)
+        self._missing += np.isnan(block).sum(axis=0)
+        self._categorical_counts.update(X)
+
+        self.fill_ = np.where(self._imputed, _statistic_values(self._fill_stats), np.nan)
+        filled = np.where(np.isnan(self.fill_), 0, self._missing)
+        count, mean, m2 = merge_moments(
+            self._observed.count,
+            self._observed.mean,
+            self._observed.m2,
+            filled,
+            self.fill_,
+            np.zeros_like(self.fill_),
+        )
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self._set_scaling(mean, m2 / count, count, self._scaled)
+
+        self.cat_imputer_ = _imputer_from_statistics(
+            "most_frequent", self.categorical_cols_, self._categorical_counts.most_frequent()
+        )
+        self.median_rank_error_ = _rank_error(self._fill_stats)
+        return self
+
+    def _check_strategies(self) -> None:
+        if self.numerical_strategy not in FUSED_STRATEGIES:
+            raise ValueError(
+                f"Unsupported numerical_strategy for fused imputation: {self.numerical_strategy}"
+            )
+
+    def _set_columns(self, X) -> tuple[np.ndarray, np.ndarray]:
+        """Set the handled columns and return the imputed and scaled masks over them."""
+        numeric = _select_columns(X, ["number"])
+        imputed = np.array([col not in self.imputation_exclude_columns for col in numeric])
+        scaled = np.array([col not in self.scaling_exclude_columns for col in numeric])
+        keep = imputed | scaled
+        self.numerical_cols_ = list(numeric[keep])
+        self.categorical_cols_ = [
+            col
+            for col in _select_columns(X, ["object", "category"])
+            if col not in self.imputation_exclude_columns
+        ]
+        return imputed[keep], scaled[keep]
+
+    def _set_scaling(self, mean, var, count, scaled) -> None:
+        # Near-constant columns are only centered, with the same tolerance as StandardScaler
+        constant = _is_constant_feature(var, mean, count)
+        scale = _handle_zeros_in_scale(np.sqrt(var), copy=False, constant_mask=constant)
+        self.mean_ = np.where(scaled, mean, 0.0)
+        self.scale_ = np.where(scaled, scale, 1.0)
+
+    def prune(self, columns) -> None:
+        """Only impute and scale the columns in columns, after fitting; the others pass through."""
+        keep = [i for i, col in enumerate(self.numerical_cols_) if col in columns]
+        self.numerical_cols_ = [self.numerical_cols_[i] for i in keep]
+        self.fill_, self.mean_, self.scale_ = self.fill_[keep], self.mean_[keep], self.scale_[keep]
+        self.cat_imputer_, self.categorical_cols_ = _prune_fitted(
+            self.cat_imputer_, self.categorical_cols_, columns
+        )
+
+    def transform(self, X):
+        if self.copy:
+            X = X.copy()
+
+        if self.numerical_cols_:
+            # The single output buffer, imputed and standardized in place
+            block = X[self.numerical_cols_].to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+            np.copyto(block, self.fill_, where=np.isnan(block))
+            block -= self.mean_
+            block /= self.scale_
+            X[self.numerical_cols_] = block
+
+        if self.cat_imputer_ is not None:
+            X[self.categorical_cols_] = self.cat_imputer_.transform(X[self.categorical_cols_])
+
+        return X
+
+
+# Transformer classes per preprocessing.backend, all with the same constructor arguments
+# (the pandas ones that mutate their input additionally accept copy)
+BACKENDS = {
+    "pandas": {
+        "drop_columns": DropColumnsTransformer,
+        "categorical_transforms": CategoricalMapTransformer,
+        "imputation": ImputationTransformer,
+        "scaling": ScalingTransformer,
+        "feature_engineering": FeatureEngineeringTransformer,
+        "feature_selection": FeatureSelectionTransformer,
+    },
+    "polars": {
+        "drop_columns": PolarsDropColumnsTransformer,
+        "categorical_transforms": PolarsCategoricalMapTransformer,
+        "imputation": PolarsImputationTransformer,
+        "scaling": PolarsScalingTransformer,
+        "feature_engineering": PolarsFeatureEngineeringTransformer,
+        "feature_selection": PolarsFeatureSelectionTransformer,
+    },
+}
+
+
+def plan_step_order(prep_cfg: DictConfig) -> list[str]:
+    """
+    Step names of preprocessing.pipeline, with drop_columns moved as early as it commutes.
+
+    Dropping columns before a step gives the same result if the step works
+    column by column and no column it keeps depends on a dropped one. Then
+    the step no longer touches the dropped columns, and imputation and
+    scaling may become adjacent and fuse.
+
+    Args:
+        prep_cfg: preprocessing config
+
+    Returns:
+        Step names in execution order
+    """
+    names = [step_config["step"] for step_config in prep_cfg.pipeline]
+    if "drop_columns" not in names:
+        return names
+
+    dropped = set(prep_cfg.get("drop_columns") or [])
+    position = names.index("drop_columns")
+    while position > 0 and _commutes_with_drop(names[position - 1], prep_cfg, dropped):
+        names[position - 1], names[position] = names[position], names[position - 1]
+        position -= 1
+    return names
+
+
+def columns_dropped_on_load(prep_cfg: DictConfig) -> list[str]:
+    """
+    drop_columns entries that can be excluded when loading the data.
+
+    A column may only be left out of the load if every step before
+    drop_columns commutes with dropping it, i.e. no earlier step reads it to
+    produce something that is kept, like a feature engineered from it.
+
+    Args:
+        prep_cfg: preprocessing config
+
+    Returns:
+        Columns to exclude from the load, in drop_columns order
+    """
+    names = [step_config["step"] for step_config in prep_cfg.get("pipeline", [])]
+    if "drop_columns" not in names:
+        return []
+
+    earlier = names[: names.index("drop_columns")]
+    return [
+        column
+        for column in prep_cfg.get("drop_columns") or []
+        if all(_commutes_with_drop(step, prep_cfg, {column}) for step in earlier)
+    ]
+
+
+def _commutes_with_drop(step_name: str, prep_cfg: DictConfig, dropped: set) -> bool:
+    if step_name in ("categorical_transforms", "imputation", "scaling"):
+        return True
+    if step_name == "remove_outliers":
+        columns = outlier_columns(prep_cfg.get("remove_outliers") or {})
+        return columns is not None and not dropped & columns
+    if step_name == "feature_engineering":
+        lineage = feature_lineage(dict(prep_cfg.get("feature_engineering") or {}))
+        touched = set(lineage).union(*lineage.values())
+        return not dropped & touched
+    if step_name == "feature_selection":
+        # Correlations and variances are per column, mutual information is normalized by its max
+        selection = prep_cfg.get("feature_selection") or {}
+        return (
+            selection.get("method", "correlation") in ("correlation", "variance_threshold")
+            and selection.get("target_column") not in dropped
+        )
+    return False
+
+
 # Highlight to show
 def build_pipeline(config: DictConfig) -> Pipeline:
     """Build sklearn pipeline from config.
 
+    preprocessing.backend selects the transformer implementation: "pandas"
+    (default) or "polars", where transform returns a single lazy query plan.
+
+    preprocessing.inplace (pandas only) lets steps mutate frames the pipeline
+    owns: once a step has returned a fresh frame, later steps skip their
+    defensive copy. The caller's frame is never modified.
+
+    With the pandas backend and preprocessing.fuse_steps set, imputation
+    immediately followed by scaling is replaced by one ImputeScaleTransformer
+    step named imputation_scaling, if the numerical strategy is median or
+    mean. Fusion is off by default, so the imputation and scaling steps keep
+    their names for named_steps lookups and step cache keys.
+
+    preprocessing.plan reorders the steps with plan_step_order first; after
+    fitting, prune_pipeline then removes work no later step uses.
+
+    The categorical_encoding step (pandas only) returns a sparse matrix for
+    one-hot encoding, so it must then be the last step.
+
     Args:
         config: DictConfig with preprocessing configuration
 
@@ -160,12 +744,30 @@ def build_pipeline(config: DictConfig) -> Pipeline:
     steps = []
     prep_cfg = config.preprocessing
 
-    for step_config in prep_cfg.pipeline:
-        step_name = step_config["step"]
+    backend = prep_cfg.get("backend", "pandas")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}. Supported backends: {list(BACKENDS)}")
+    transformers = BACKENDS[backend]
+
+    inplace = backend == "pandas" and prep_cfg.get("inplace", False)
+    owned = False  # whether the input of the next step is a frame the pipeline created
+
+    def ownership() -> dict:
+        return {"copy": not owned} if inplace else {}
+
+    step_names = [step_config["step"] for step_config in prep_cfg.pipeline]
+    if prep_cfg.get("plan", False):
+        planned = plan_step_order(prep_cfg)
+        if planned != step_names:
+            logger.info(f"Planned step order: {' -> '.join(planned)}")
+        step_names = planned
+    fuse = backend == "pandas" and prep_cfg.get("fuse_steps", False)
 
+    for position, step_name in enumerate(step_names):
         if step_name == "drop_columns":
-            transformer = DropColumnsTransformer(columns=prep_cfg.drop_columns)
+            transformer = transformers["drop_columns"](columns=prep_cfg.drop_columns)
             steps.append(("drop_columns", transformer))
+            owned = True
 
         elif step_name == "remove_outliers":
             # Outlier removal should be done BEFORE train_test_split
@@ -175,35 +777,80 @@ def build_pipeline(config: DictConfig) -> Pipeline:
 
         elif step_name == "categorical_transforms":
             if prep_cfg.categorical_transforms:
-                transformer = CategoricalMapTransformer(mappings=prep_cfg.categorical_transforms)
+                transformer = transformers["categorical_transforms"](
+                    mappings=prep_cfg.categorical_transforms, **ownership()
+                )
                 steps.append(("categorical_transforms", transformer))
+                owned = True
+
+        elif (
+            step_name == "imputation"
+            and fuse
+            and step_names[position + 1 : position + 2] == ["scaling"]
+            and prep_cfg.imputation.numerical_strategy in FUSED_STRATEGIES
+        ):
+            transformer = ImputeScaleTransformer(
+                numerical_strategy=prep_cfg.imputation.numerical_strategy,
+                categorical_strategy=prep_cfg.imputation.categorical_strategy,
+                imputation_exclude_columns=prep_cfg.imputation.get("exclude_columns", []),
+                scaling_exclude_columns=prep_cfg.scaling.get("exclude_columns", []),
+                **ownership(),
+            )
+            steps.append(("imputation_scaling", transformer))
+            owned = True
 
         elif step_name == "imputation":
-            transformer = ImputationTransformer(
+            transformer = transformers["imputation"](
                 numerical_strategy=prep_cfg.imputation.numerical_strategy,
                 categorical_strategy=prep_cfg.imputation.categorical_strategy,
                 exclude_columns=prep_cfg.imputation.get("exclude_columns", []),
+                **ownership(),
             )
             steps.append(("imputation", transformer))
+            owned = True
+
+        elif step_name == "scaling" and steps and steps[-1][0] == "imputation_scaling":
+            pass  # already part of the fused step
 
         elif step_name == "scaling":
-            transformer = ScalingTransformer(
+            transformer = transformers["scaling"](
                 strategy=prep_cfg.scaling.strategy,
                 exclude_columns=prep_cfg.scaling.get("exclude_columns", []),
+                **ownership(),
             )
+            # Without numeric columns scaling returns its input, so ownership does not change
             steps.append(("scaling", transformer))
 
         elif step_name == "feature_engineering":
             if hasattr(prep_cfg, "feature_engineering") and prep_cfg.feature_engineering:
-                transformer = FeatureEngineeringTransformer(
+                transformer = transformers["feature_engineering"](
                     config=dict(prep_cfg.feature_engineering)
                 )
                 steps.append(("feature_engineering", transformer))
+                owned = True
 
         elif step_name == "feature_selection":
             if hasattr(prep_cfg, "feature_selection") and prep_cfg.feature_selection:
-                transformer = FeatureSelectionTransformer(config=dict(prep_cfg.feature_selection))
+                transformer = transformers["feature_selection"](
+                    config=dict(prep_cfg.feature_selection)
+                )
                 steps.append(("feature_selection", transformer))
+                owned = True
+
+        elif step_name == "categorical_encoding":
+            encoding = dict(prep_cfg.get("categorical_encoding") or {})
+            if backend != "pandas":
+                raise ValueError("categorical_encoding is only supported by the pandas backend")
+            transformer = CategoricalEncodingTransformer(config=encoding)
+            # A sparse matrix cannot be passed on to the dataframe steps
+            if (
+                transformer.method == "onehot"
+                and transformer.sparse_output
+                and position != len(step_names) - 1
+            ):
+                raise ValueError("categorical_encoding with sparse_output must be the last step")
+            steps.append(("categorical_encoding", transformer))
+            owned = True
         else:
             raise ValueError(f"Unknown step: {step_name}")  # Fail noisily
 
@@ -213,6 +860,79 @@ def build_pipeline(config: DictConfig) -> Pipeline:
     return Pipeline(steps)
 
 
+def transform_batches(pipeline: Pipeline, batches: Iterable[pd.DataFrame]) -> Iterator:
+    """Apply a fitted pipeline batch by batch.
+
+    All steps are row-wise once fitted, so transforming batches gives the same
+    rows as transforming the concatenated frame, with bounded memory.
+
+    Args:
+        pipeline: Fitted sklearn Pipeline
+        batches: Iterable of input batches, e.g. DataRepository.iter_raw_batches()
+
+    Yields:
+        Transformed batches
+    """
+    for batch in batches:
+        yield pipeline.transform(batch)
+
+
+# Steps whose fit does not depend on the data beyond the columns of the first batch
+_FIRST_BATCH_STEPS = (
+    DropColumnsTransformer,
+    CategoricalMapTransformer,
+    FeatureEngineeringTransformer,
+)
+
+
+def partial_fit_pipeline(
+    pipeline: Pipeline, batches: Callable[[], Iterable[pd.DataFrame]]
+) -> Pipeline:
+    """Fit a pipeline out-of-core, walking the batches once per data-dependent step.
+
+    Each step is fitted with partial_fit on every batch transformed by the
+    already fitted steps before it, so it sees the same data as in
+    fit_transform: means, variances and correlations match fit exactly,
+    medians up to the step's median_rank_error_. Steps whose fit does not
+    depend on the data only read the first batch, so they are fitted in the
+    same pass as the next step that does.
+
+    Every pass transforms the batches again through the steps fitted in
+    earlier passes, so the cost is one read of the data per data-dependent
+    step (e.g. imputation, scaling, feature_selection), not per step.
+    Transformed batches are not kept between passes, so memory stays bounded
+    by one batch.
+
+    Args:
+        pipeline: Unfitted pipeline from build_pipeline (pandas backend)
+        batches: Returns a fresh iterable of batches for every pass, e.g.
+            lambda: repository.iter_raw_batches(batch_rows=100_000)
+
+    Returns:
+        The fitted pipeline
+    """
+    steps = [step for _, step in pipeline.steps]
+    fitted = 0
+    while fitted < len(steps):
+        # This pass fits the first-batch steps up to the next data-dependent step
+        last = fitted
+        while last < len(steps) - 1 and isinstance(steps[last], _FIRST_BATCH_STEPS):
+            last += 1
+
+        for position, batch in enumerate(batches()):
+            for previous in steps[:fitted]:
+                batch = previous.transform(batch)
+            for step in steps[fitted:last]:
+                if position == 0:
+                    step.partial_fit(batch)
+                batch = step.transform(batch)
+            steps[last].partial_fit(batch)
+            if isinstance(steps[last], _FIRST_BATCH_STEPS):
+                break
+        fitted = last + 1
+    return pipeline
+
+
 class SklearnPipelineBuilder:
     """Builder for sklearn pipelines from config."""
 
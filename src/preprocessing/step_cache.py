@@ -0,0 +1,268 @@
+"""
+Persistent cache of fitted pipeline steps and their outputs.
+
+Every step is keyed by a chain hash: the fingerprint of the pipeline input,
+then for each step its name, class, parameters and the source of its module.
+A step's key thus changes whenever its config slice, anything upstream or its
+code changes. The longest cached prefix of a pipeline is loaded from disk and
+only the remaining steps are fitted.
+"""
+
+from collections.abc import Iterator
+import hashlib
+import inspect
+import json
+import os
+from pathlib import Path
+
+# Entries are only read from the local cache directory this process writes to
+import pickle  # nosec B403
+import threading
+
+from loguru import logger
+from omegaconf import DictConfig, ListConfig, OmegaConf
+import pandas as pd
+from sklearn.pipeline import Pipeline
+
+from src.config.paths import PIPELINE_CACHE_DIR
+from src.utils.fingerprint import file_digest, frame_fingerprint
+
+DEFAULT_MAX_BYTES = 4 << 30
+
+_SUFFIX = ".pkl"
+
+
+class StepCache:
+    """
+    On-disk LRU cache of (fitted step, transformed output) entries.
+
+    Each entry is one file holding two pickles, so a fitted step can be
+    loaded without reading its output. Reads touch the file, and entries are
+    evicted by oldest modification time until the directory fits into
+    max_bytes. An entry larger than the whole budget is not cached.
+
+    Entries are unpickled, so the directory must be local and only writable
+    by trusted users, like any other pickle file.
+    """
+
+    def __init__(self, directory: Path = PIPELINE_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of the cached entries."""
+        return sum(path.stat().st_size for path in self._entries())
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._entries())
+
+    def __contains__(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def metrics(self) -> dict:
+        """Hit and miss counts of this process and the current cache size."""
+        return {
+            "step_cache_hits": self.hits,
+            "step_cache_misses": self.misses,
+            "step_cache_bytes": self.size_bytes,
+        }
+
+    def load(self, key: str, output: bool = True):
+        """
+        Load a cached entry and mark it as recently used.
+
+        Args:
+            key: Step key
+            output: Also load the transformed output (default: True)
+
+        Returns:
+            Tuple of (fitted step, output or None)
+        """
+        path = self._path(key)
+        with open(path, "rb") as f:
+            # Trusted input: entries are written by save into the local cache directory
+            step = pickle.load(f)  # nosec B301
+            result = pickle.load(f) if output else None  # nosec B301
+        os.utime(path)
+        with self._lock:
+            self.hits += 1
+        return step, result
+
+    def save(self, key: str, step, output) -> None:
+        """
+        Store a fitted step and its output, evicting old entries if needed.
+
+        Args:
+            key: Step key
+            step: Fitted transformer
+            output: Output of the step's fit_transform
+        """
+        with self._lock:
+            self.misses += 1
+
+        path = self._path(key)
+        partial = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(partial, "wb") as f:
+            pickle.dump(step, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(output, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        size = partial.stat().st_size
+        if size > self.max_bytes:
+            partial.unlink()
+            logger.debug(f"Not caching step of {size:,} bytes, budget is {self.max_bytes:,}")
+            return
+        os.replace(partial, path)
+
+        with self._lock:
+            self._evict()
+
+    def clear(self) -> None:
+        """Remove all entries and reset the hit and miss counters."""
+        with self._lock:
+            for path in self._entries():
+                path.unlink(missing_ok=True)
+            self.hits = 0
+            self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{_SUFFIX}"
+
+    def _entries(self) -> Iterator[Path]:
+        return self.directory.glob(f"*{_SUFFIX}")
+
+    def _evict(self) -> None:
+        entries = sorted(
+            ((path, path.stat()) for path in self._entries()), key=lambda e: e[1].st_mtime_ns
+        )
+        total = sum(stat.st_size for _, stat in entries)
+        for path, stat in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+            logger.debug(f"Evicted {path.stem} ({stat.st_size:,} bytes) from step cache")
+
+
+def step_cache_from_config(prep_cfg: DictConfig) -> StepCache | None:
+    """
+    The step cache configured in preprocessing.step_cache, if enabled.
+
+    Only the pandas backend is cached, polars steps return lazy plans.
+
+    Args:
+        prep_cfg: preprocessing config
+
+    Returns:
+        StepCache, or None if disabled
+    """
+    cache_cfg = prep_cfg.get("step_cache") or {}
+    if not cache_cfg.get("enabled", False) or prep_cfg.get("backend", "pandas") != "pandas":
+        return None
+    return StepCache(
+        Path(cache_cfg.get("directory") or PIPELINE_CACHE_DIR),
+        int(cache_cfg.get("max_bytes", DEFAULT_MAX_BYTES)),
+    )
+
+
+def step_keys(pipeline: Pipeline, X: pd.DataFrame) -> list[str]:
+    """
+    Cache key of every step of pipeline when fit on X.
+
+    Args:
+        pipeline: Pipeline from build_pipeline
+        X: Input dataframe
+
+    Returns:
+        One key per step
+    """
+    keys = []
+    key = frame_fingerprint(X)
+    for name, step in pipeline.steps:
+        key = _chain(key, name, step)
+        keys.append(key)
+    return keys
+
+
+def pipeline_key(pipeline: Pipeline) -> str:
+    """
+    Key of a pipeline's steps, parameters and code, independent of the data.
+
+    Two pipelines built from the same config by the same code get the same
+    key, fitted or not, so a persisted fitted pipeline can be matched to
+    the one a config builds now.
+
+    Args:
+        pipeline: Pipeline from build_pipeline
+
+    Returns:
+        Hex key
+    """
+    key = "pipeline"
+    for name, step in pipeline.steps:
+        key = _chain(key, name, step)
+    return key
+
+
+def _chain(key: str, name: str, step) -> str:
+    # copy only decides whether the step mutates its input, not its result
+    params = {k: v for k, v in step.get_params(deep=False).items() if k != "copy"}
+    payload = json.dumps(
+        [key, name, type(step).__qualname__, _source_digest(step), params],
+        sort_keys=True,
+        default=_to_json,
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def fit_transform_cached(pipeline: Pipeline, X: pd.DataFrame, cache: StepCache) -> pd.DataFrame:
+    """
+    pipeline.fit_transform(X), loading the longest cached prefix of steps.
+
+    Fitted steps of the prefix replace the pipeline's unfitted ones, and only
+    the output of its last step is read. The remaining steps are fitted as
+    usual and cached.
+
+    Args:
+        pipeline: Unfitted pipeline from build_pipeline (pandas backend)
+        X: Input dataframe, not modified
+        cache: Step cache
+
+    Returns:
+        Transformed dataframe
+    """
+    keys = step_keys(pipeline, X)
+
+    cached = 0
+    while cached < len(keys) and keys[cached] in cache:
+        cached += 1
+
+    for position in range(cached):
+        name = pipeline.steps[position][0]
+        step, output = cache.load(keys[position], output=position == cached - 1)
+        pipeline.steps[position] = (name, step)
+        if output is not None:
+            X = output
+        logger.debug(f"Loaded fitted step {name} from step cache")
+
+    for position in range(cached, len(keys)):
+        name, step = pipeline.steps[position]
+        X = step.fit_transform(X)
+        cache.save(keys[position], step, X)
+
+    return X
+
+
+def _source_digest(step) -> str | None:
+    source = inspect.getsourcefile(type(step))
+    return file_digest(Path(source)) if source else None
+
+
+def _to_json(value):
+    if isinstance(value, DictConfig | ListConfig):
+        return OmegaConf.to_container(value, resolve=True)
+    return str(value)
@@ -0,0 +1,275 @@
+"""
+Mergeable column statistics for fitting preprocessing steps batch by batch.
+
+Moments and correlations are merged exactly with the pairwise update of
+Chan et al., so they match a single pass over all rows up to floating point.
+Medians come from a weighted quantile summary with a tracked rank error bound.
+Missing values (NaN) are skipped everywhere, like pandas and SimpleImputer.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def merge_moments(count_a, mean_a, m2_a, count_b, mean_b, m2_b):
+    """
+    Merge count, mean and sum of squared deviations of two disjoint samples.
+
+    All arguments are arrays over columns; columns with a count of 0 on
+    either side take the other side.
+
+    Returns:
+        Tuple of (count, mean, m2)
+    """
+    count = count_a + count_b
+    safe = np.where(count > 0, count, 1)
+    delta = np.where(count_b > 0, mean_b, 0.0) - np.where(count_a > 0, mean_a, 0.0)
+    mean = np.where(count_a > 0, mean_a, 0.0) + delta * count_b / safe
+    m2 = np.nan_to_num(m2_a) + np.nan_to_num(m2_b) + delta**2 * count_a * count_b / safe
+    return count, np.where(count > 0, mean, np.nan), m2
+
+
+def _batch_moments(block: np.ndarray):
+    valid = ~np.isnan(block)
+    count = valid.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(valid, block, 0.0).sum(axis=0) / count
+    m2 = (np.where(valid, block - mean, 0.0) ** 2).sum(axis=0)
+    return count, mean, m2
+
+
+class RunningMoments:
+    """Exact running count, mean and variance per column."""
+
+    def __init__(self, n_columns: int):
+        self.count = np.zeros(n_columns, dtype=np.int64)
+        self.mean = np.full(n_columns, np.nan)
+        self.m2 = np.zeros(n_columns)
+
+    def update(self, block: np.ndarray) -> None:
+        """
+        Add a batch.
+
+        Args:
+            block: Float array of shape (rows, columns), NaN for missing values
+        """
+        self.merge(*_batch_moments(block))
+
+    def merge(self, count, mean, m2) -> None:
+        """Add the moments of another sample."""
+        self.count, self.mean, self.m2 = merge_moments(
+            self.count, self.mean, self.m2, count, mean, m2
+        )
+
+    def var(self, ddof: int = 0) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > ddof, self.m2 / (self.count - ddof), np.nan)
+
+
+class RunningCorrelation:
+    """
+    Exact running Pearson correlation of each column with a target.
+
+    Like DataFrame.corrwith, every column uses the rows where both it and the
+    target are present.
+    """
+
+    def __init__(self, n_columns: int):
+        self.count = np.zeros(n_columns, dtype=np.int64)
+        self.mean_x = np.zeros(n_columns)
+        self.mean_y = np.zeros(n_columns)
+        self.sxx = np.zeros(n_columns)
+        self.syy = np.zeros(n_columns)
+        self.sxy = np.zeros(n_columns)
+
+    def update(self, block: np.ndarray, target: np.ndarray) -> None:
+        """
+        Add a batch.
+
+        Args:
+            block: Float array of shape (rows, columns), NaN for missing values
+            target: Float array of shape (rows,)
+        """
+        y = np.broadcast_to(target[:, None], block.shape)
+        valid = ~np.isnan(block) & ~np.isnan(y)
+        count = valid.sum(axis=0)
+        safe = np.where(count > 0, count, 1)
+        mean_x = np.where(valid, block, 0.0).sum(axis=0) / safe
+        mean_y = np.where(valid, y, 0.0).sum(axis=0) / safe
+        dx = np.where(valid, block - mean_x, 0.0)
+        dy = np.where(valid, y - mean_y, 0.0)
+        self._merge(
+            count,
+            mean_x,
+            mean_y,
+            (dx**2).sum(axis=0),
+            (dy**2).sum(axis=0),
+            (dx * dy).sum(axis=0),
+        )
+
+    def merge(self, other: "RunningCorrelation") -> None:
+        """Add the co-moments of another sample, e.g. a shard fit in parallel."""
+        self._merge(other.count, other.mean_x, other.mean_y, other.sxx, other.syy, other.sxy)
+
+    def _merge(self, count, mean_x, mean_y, sxx, syy, sxy) -> None:
+        total = self.count + count
+        weight = self.count * count / np.where(total > 0, total, 1)
+        delta_x = mean_x - self.mean_x
+        delta_y = mean_y - self.mean_y
+        share = count / np.where(total > 0, total, 1)
+
+        self.sxx = self.sxx + sxx + delta_x**2 * weight
+        self.syy = self.syy + syy + delta_y**2 * weight
+        self.sxy = self.sxy + sxy + delta_x * delta_y * weight
+        self.mean_x = self.mean_x + delta_x * share
+        self.mean_y = self.mean_y + delta_y * share
+        self.count = total
+
+    def correlation(self) -> np.ndarray:
+        """Correlation per column, NaN for constant columns or fewer than 2 pairs."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = self.sxy / np.sqrt(self.sxx * self.syy)
+        return np.where(self.count > 1, corr, np.nan)
+
+
+class TargetStatistics:
+    """
+    Sufficient statistics of columns for target-based feature selection.
+
+    Keeps moments of every column over its present values, for variances, and
+    co-moments with the target over rows where both are present, for
+    correlations. Batches and shards merge exactly, and both are derived from
+    the statistics alone in O(columns).
+    """
+
+    def __init__(self, n_columns: int):
+        self.moments = RunningMoments(n_columns)
+        self.comoments = RunningCorrelation(n_columns)
+
+    def update(self, block: np.ndarray, target: np.ndarray) -> None:
+        """
+        Add a batch.
+
+        Args:
+            block: Float array of shape (rows, columns), NaN for missing values
+            target: Float array of shape (rows,)
+        """
+        self.moments.update(block)
+        self.comoments.update(block, target)
+
+    def merge(self, other: "TargetStatistics") -> None:
+        """Add the statistics of another sample, e.g. a shard fit in parallel."""
+        self.moments.merge(other.moments.count, other.moments.mean, other.moments.m2)
+        self.comoments.merge(other.comoments)
+
+    def var(self, ddof: int = 0) -> np.ndarray:
+        return self.moments.var(ddof)
+
+    def correlation(self) -> np.ndarray:
+        return self.comoments.correlation()
+
+
+class QuantileSummary:
+    """
+    Approximate running quantiles per column.
+
+    Batches of up to size rows are kept exactly. Larger batches, and the whole
+    summary once it exceeds 8 * size rows, are reduced to size evenly spaced
+    weighted quantiles. Every reduction of n values shifts ranks by at most
+    n / size, which is accumulated in rank_error, so a quantile is off by at
+    most rank_error ranks (relative_rank_error as a fraction of the count).
+    """
+
+    def __init__(self, n_columns: int, size: int = 1000):
+        self.size = size
+        self.rank_error = np.zeros(n_columns)
+        self._values = np.empty((0, n_columns))
+        self._weights = np.empty((0, n_columns))
+
+    @property
+    def count(self) -> np.ndarray:
+        return self._weights.sum(axis=0)
+
+    @property
+    def relative_rank_error(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.rank_error / self.count
+
+    def update(self, block: np.ndarray) -> None:
+        """
+        Add a batch.
+
+        Args:
+            block: Float array of shape (rows, columns), NaN for missing values
+        """
+        weights = (~np.isnan(block)).astype(np.float64)
+        if len(block) > self.size:
+            block, weights = self._reduce(block, weights)
+        self._values = np.concatenate([self._values, block])
+        self._weights = np.concatenate([self._weights, weights])
+        if len(self._values) > 8 * self.size:
+            self._values, self._weights = self._reduce(self._values, self._weights)
+
+    def quantile(self, q: float) -> np.ndarray:
+        """
+        Weighted quantile per column, NaN for columns without values.
+
+        For q = 0.5 on exactly kept values this is the usual median, averaging
+        the two middle values of an even count.
+        """
+        values, cumulative = self._sorted()
+        total = cumulative[-1] if len(cumulative) else np.zeros(values.shape[1])
+        result = np.full(values.shape[1], np.nan)
+        for j in np.flatnonzero(total > 0):
+            lower = np.searchsorted(cumulative[:, j], q * total[j], side="left")
+            upper = np.searchsorted(cumulative[:, j], q * total[j], side="right")
+            upper = min(upper, np.searchsorted(cumulative[:, j], total[j], side="left"))
+            result[j] = (values[lower, j] + values[upper, j]) / 2
+        return result
+
+    def _sorted(self):
+        # NaN sorts last and carries weight 0
+        order = np.argsort(self._values, axis=0, kind="stable")
+        values = np.take_along_axis(self._values, order, axis=0)
+        weights = np.take_along_axis(self._weights, order, axis=0)
+        return values, np.cumsum(weights, axis=0)
+
+    def _reduce(self, values: np.ndarray, weights: np.ndarray):
+        order = np.argsort(values, axis=0, kind="stable")
+        values = np.take_along_axis(values, order, axis=0)
+        cumulative = np.cumsum(np.take_along_axis(weights, order, axis=0), axis=0)
+        total = cumulative[-1]
+
+        points = (np.arange(self.size) + 0.5) / self.size
+        reduced = np.full((self.size, values.shape[1]), np.nan)
+        reduced_weights = np.zeros((self.size, values.shape[1]))
+        for j in np.flatnonzero(total > 0):
+            index = np.searchsorted(cumulative[:, j], points * total[j], side="left")
+            reduced[:, j] = values[index, j]
+            reduced_weights[:, j] = total[j] / self.size
+        self.rank_error += total / self.size
+        return reduced, reduced_weights
+
+
+class ValueCounts:
+    """Exact running value counts per column, for most-frequent imputation."""
+
+    def __init__(self, columns: list[str]):
+        self.counts = {col: pd.Series(dtype=np.int64) for col in columns}
+
+    def update(self, X: pd.DataFrame) -> None:
+        for col, counts in self.counts.items():
+            batch = X[col].value_counts(dropna=True)
+            batch = batch[batch > 0]  # categorical dtypes also list unseen categories
+            self.counts[col] = counts.add(batch, fill_value=0)
+
+    def most_frequent(self) -> list:
+        """Most frequent value per column, the smallest one on ties like SimpleImputer."""
+        result = []
+        for counts in self.counts.values():
+            if counts.empty:
+                result.append(np.nan)
+                continue
+            candidates = counts.index[counts == counts.max()]
+            result.append(sorted(candidates)[0])
+        return result
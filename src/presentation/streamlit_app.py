@@ -37,12 +37,11 @@ def load_data(use_raw: bool = False):
     repository = get_data_repository()
 
     if use_raw:
-        df_pandas = repository.load_raw()
-    else:
-        df_pandas = repository.load_interim()
+        # Convert to Polars for compatibility with existing dashboard code
+        return pl.from_pandas(repository.load_raw())
 
-    # Convert to Polars for compatibility with existing dashboard code
-    return pl.from_pandas(df_pandas)
+    # Memory-mapped when the interim store uses the Arrow IPC format
+    return repository.load_interim_polars()
 
 
 def main():
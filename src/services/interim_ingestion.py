@@ -0,0 +1,126 @@
+from loguru import logger
+import pandas as pd
+from sklearn.exceptions import NotFittedError
+from sklearn.pipeline import Pipeline
+from sklearn.utils.validation import check_is_fitted
+
+from src.domain.ports.data_repository import DataRepository
+from src.preprocessing.step_cache import StepCache, pipeline_key
+
+
+class InterimIngestion:
+    """
+    Keeps the interim store up to date with new raw sales.
+
+    rebuild() fits the preprocessing pipeline on all raw data and writes the
+    interim store from scratch. ingest() then only appends unseen sales to the
+    raw data and transforms just those rows with the already-fitted pipeline,
+    so imputation values, category mappings and scaling statistics stay the
+    ones learned at the last rebuild.
+
+    rebuild() stores the fitted pipeline in the step cache and records its
+    key in the interim metadata, so ingest() in a later process loads it
+    instead of refitting. ingest() fails if the interim data has no stored
+    pipeline, or was built by another config or version of the code.
+    """
+
+    def __init__(
+        self, repository: DataRepository, pipeline: Pipeline, cache: StepCache | None = None
+    ) -> None:
+        """
+        Initialize ingestion.
+
+        Args:
+            repository: Raw and interim data
+            pipeline: Pipeline from build_pipeline, fitted by rebuild() or loaded by ingest()
+            cache: Step cache holding the fitted pipeline (default: the project step cache)
+        """
+        self._repository = repository
+        self._pipeline = pipeline
+        self._cache = cache if cache is not None else StepCache()
+
+    @property
+    def pipeline(self) -> Pipeline:
+        return self._pipeline
+
+    def rebuild(self, **load_options) -> dict:
+        """
+        Fit the pipeline on all raw data and replace the interim store.
+
+        Args:
+            **load_options: Passed to DataRepository.load_raw (columns, filters, ...)
+
+        Returns:
+            dict: Metadata written with the interim data
+        """
+        df = self._repository.load_raw(**load_options)
+        transformed = self._pipeline.fit_transform(df)
+
+        key = pipeline_key(self._pipeline)
+        self._cache.save(key, self._pipeline, None)
+        metadata = {
+            "rows": len(transformed),
+            "columns": list(transformed.columns),
+            "pipeline_key": key,
+        }
+        self._repository.save_interim(transformed, metadata)
+
+        logger.info(f"Rebuilt interim data from {len(df)} raw rows")
+        return metadata
+
+    def ingest(self, new_rows: pd.DataFrame) -> dict[str, int]:
+        """
+        Add new raw rows and upsert their transformed version into the interim store.
+
+        Rows whose id is already in the raw data are skipped.
+
+        Args:
+            new_rows: New raw sales
+
+        Returns:
+            dict: Number of rows "appended" to the raw data, "inserted" and
+            "updated" in the interim store
+
+        Raises:
+            ValueError: If the interim data has no stored fitted pipeline, or one
+                of another config or code version; rebuild() first
+        """
+        self._load_pipeline()
+
+        appended = self._repository.append_raw(new_rows)
+        if appended.empty:
+            return {"appended": 0, "inserted": 0, "updated": 0}
+
+        transformed = self._pipeline.transform(appended)
+        counts = self._repository.upsert_interim(transformed)
+
+        logger.info(f"Ingested {len(appended)} new raw rows")
+        return {"appended": len(appended), **counts}
+
+    def _load_pipeline(self) -> None:
+        """Use the fitted pipeline the interim data was built with."""
+        key = pipeline_key(self._pipeline)
+        try:
+            stored = self._repository.load_metadata().get("pipeline_key")
+        except (FileNotFoundError, KeyError):
+            stored = None
+        if stored is None:
+            raise ValueError("The interim data has no fitted pipeline, run rebuild() first")
+        if stored != key:
+            raise ValueError(
+                "The interim data was built with another pipeline config or code version, "
+                "run rebuild() first"
+            )
+
+        try:
+            check_is_fitted(self._pipeline)
+            return
+        except NotFittedError:
+            pass
+        if key not in self._cache:
+            raise ValueError(
+                f"Fitted pipeline {key} is missing from the step cache at "
+                f"{self._cache.directory}, run rebuild() first"
+            )
+        self._pipeline, _ = self._cache.load(key, output=False)
+        logger.info(f"Loaded fitted pipeline {key} from step cache")
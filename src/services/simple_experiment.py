@@ -1,6 +1,9 @@
 from loguru import logger
 import mlflow
+import numpy as np
 from omegaconf import DictConfig
+import pandas as pd
+from scipy import sparse
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 from sklearn.model_selection import train_test_split
 
@@ -8,7 +11,16 @@ from src.adapters.factory import create_data_repository
 from src.config.hydra_loader import load_config
 from src.config.paths import CONFIG_DIR, MLFLOW_TRACKING_URI
 from src.domain.models.experiment_models import ExperimentSetup
-from src.preprocessing.sklearn_pipeline_builder import build_pipeline
+from src.preprocessing.array_pipeline import ArrayPipeline
+from src.preprocessing.outliers import OutlierRemover, take_rows, uses_statistics
+from src.preprocessing.pipeline_planner import prune_pipeline
+from src.preprocessing.polars_pipeline import to_model_matrix
+from src.preprocessing.sklearn_pipeline_builder import (
+    build_pipeline,
+    columns_dropped_on_load,
+    outlier_filters,
+)
+from src.preprocessing.step_cache import fit_transform_cached, step_cache_from_config
 from src.utils.build_model import _build_model
 
 
@@ -38,31 +50,64 @@ class SimpleExperiment:
         mlflow.set_tracking_uri(f"file:{MLFLOW_TRACKING_URI}")
         mlflow.set_experiment(self.config.name)
 
-    def _run_experiment(self) -> dict:
-        df = self._data_repository.load_raw()
-
-        # Apply outlier removal BEFORE train_test_split
-        # This ensures X and y stay aligned
-        if (
-            hasattr(self.config.preprocessing, "remove_outliers")
-            and self.config.preprocessing.remove_outliers
-        ):
-            for column, conditions in self.config.preprocessing.remove_outliers.items():
-                if column not in df.columns:
-                    continue
-
-                # Apply greaterthan condition
-                if "greaterthan" in conditions:
-                    df = df[df[column] <= conditions["greaterthan"]]
-
-                # Apply lessthan condition
-                if "lessthan" in conditions:
-                    df = df[df[column] >= conditions["lessthan"]]
+    def _load_options(self) -> dict:
+        """
+        Derive column exclusion and row filters to push down into the repository.
+
+        Dropped columns and outlier rows are then never materialized.
+        Outlier removal happens here, BEFORE train_test_split, so X and y stay aligned.
+        Statistical outlier detectors need the data, so they run after loading instead.
+        """
+        prep_cfg = self.config.preprocessing
+        options = {}
+
+        # Only columns no step before drop_columns reads are left out of the load
+        target = self.config.training.target_column
+        excluded = [col for col in columns_dropped_on_load(prep_cfg) if col != target]
+        if excluded:
+            options["exclude_columns"] = excluded
+
+        if prep_cfg.get("remove_outliers") and not uses_statistics(prep_cfg.remove_outliers):
+            options["filters"] = outlier_filters(prep_cfg.remove_outliers)
+
+        return options
+
+    def _load_data(self) -> tuple:
+        """
+        Load the raw data without outliers, split into features and target.
+
+        Statistical outlier detectors run before the target is split off, so
+        conditions on the target apply as well.
+
+        Returns:
+            Tuple of (X, y)
+        """
+        target = self.config.training.target_column
+        backend = self.config.preprocessing.get("backend", "pandas")
+
+        if backend == "polars":
+            df = self._data_repository.load_raw_polars(**self._load_options())
+        else:
+            df = self._data_repository.load_raw(**self._load_options())
+
+        outliers = self.config.preprocessing.get("remove_outliers")
+        if outliers and uses_statistics(outliers):
+            # One mask over all conditions, computed while the frame still holds the
+            # target so conditions on it apply; X and y are then split from the same rows
+            df = take_rows(df, OutlierRemover(outliers).fit(df).inlier_rows(df))
+
+        if backend == "polars":
+            X, y = df.drop(target), df[target].to_numpy()
+        else:
+            X, y = df.drop(columns=[target]), df[target]
+        return X, y
 
-            logger.debug(f"After outlier removal: {len(df)} rows remaining")
+    def _run_experiment(self) -> dict:
+        backend = self.config.preprocessing.get("backend", "pandas")
+        array_mode = backend == "pandas" and self.config.preprocessing.get("array_mode", False)
 
-        X = df.drop(columns=[self.config.training.target_column])
-        y = df[self.config.training.target_column]
+        X, y = self._load_data()
+        logger.debug(f"Loaded {len(X)} rows after outlier removal")
 
         X_train, X_test, y_train, y_test = train_test_split(
             X,
@@ -72,15 +117,45 @@ class SimpleExperiment:
         )
 
         pipeline = build_pipeline(self.config)
-
-        # Fit pipeline and transform data
-        X_train_transformed = pipeline.fit_transform(X_train)
-        X_test_transformed = pipeline.transform(X_test)
-
-        # Select only numeric columns for simple experiment
-        numeric_cols = X_train_transformed.select_dtypes(include=["number"]).columns
-        X_train_transformed = X_train_transformed[numeric_cols].fillna(0)
-        X_test_transformed = X_test_transformed[numeric_cols].fillna(0)
+        step_cache = step_cache_from_config(self.config.preprocessing)
+
+        # Fit pipeline and transform data, loading unchanged steps from the step cache
+        if step_cache is not None:
+            X_train_transformed = fit_transform_cached(pipeline, X_train, step_cache)
+        elif array_mode:
+            pipeline.fit(X_train)
+        else:
+            X_train_transformed = pipeline.fit_transform(X_train)
+
+        plan = None
+        if backend == "pandas" and self.config.preprocessing.get("plan", False):
+            # Skip work feature_selection throws away when transforming the test split
+            plan = prune_pipeline(pipeline, X_train)
+            logger.info(f"\n{plan}")
+
+        if array_mode:
+            # Fitted on frames once, then transform both splits on plain arrays
+            arrays = ArrayPipeline(pipeline, X_train)
+            X_train_transformed = arrays.transform(X_train, as_frame=True)
+            X_test_transformed = arrays.transform(X_test, as_frame=True)
+        else:
+            X_test_transformed = pipeline.transform(X_test)
+
+        if backend == "polars":
+            # Lazy plans are executed here, with a single conversion to numpy
+            train_matrix, feature_names = to_model_matrix(X_train_transformed)
+            test_matrix, _ = to_model_matrix(X_test_transformed.select(feature_names))
+            X_train_transformed = pd.DataFrame(train_matrix, columns=feature_names, copy=False)
+            X_test_transformed = pd.DataFrame(test_matrix, columns=feature_names, copy=False)
+        elif sparse.issparse(X_train_transformed):
+            # Encoded categoricals stay sparse all the way to the model
+            X_train_transformed = _fill_missing(X_train_transformed)
+            X_test_transformed = _fill_missing(X_test_transformed)
+        elif not array_mode:
+            # Select only numeric columns for simple experiment
+            numeric_cols = X_train_transformed.select_dtypes(include=["number"]).columns
+            X_train_transformed = X_train_transformed[numeric_cols].fillna(0)
+            X_test_transformed = X_test_transformed[numeric_cols].fillna(0)
 
         # Train model with params from config
         model = _build_model(self.config)
@@ -110,10 +185,31 @@ class SimpleExperiment:
             mlflow.sklearn.log_model(
                 model,
                 artifact_path="model",
-                input_example=X_train_transformed.iloc[:5],
+                input_example=X_train_transformed[:5],
             )  # registered_model_name="HousePricing",
+
+            selection = getattr(pipeline, "named_steps", {}).get("feature_selection")
+            scores = getattr(selection, "scores_", None)
+            if scores is not None and not scores.empty:
+                mlflow.log_dict(
+                    scores.dropna().astype(float).to_dict(), "feature_selection_scores.json"
+                )
+
+            if plan is not None:
+                mlflow.log_text(str(plan), "pipeline_plan.txt")
+
+            if step_cache is not None:
+                for metric_name, metric_value in step_cache.metrics().items():
+                    mlflow.log_metric(metric_name, metric_value)
+
             for metric_name, metric_value in metrics.items():
                 mlflow.log_metric(metric_name, metric_value)
                 print(f"{metric_name}: {metric_value:.4f}")
 
             return metrics
+
+
+def _fill_missing(matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+    """Set missing values of a sparse matrix to 0, like fillna(0) for frames."""
+    matrix.data[np.isnan(matrix.data)] = 0.0
+    return matrix
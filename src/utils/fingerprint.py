@@ -0,0 +1,82 @@
+import hashlib
+import json
+from pathlib import Path
+
+import pandas as pd
+
+_CHUNK_SIZE = 1 << 20
+
+# (resolved path, size, mtime_ns) -> content digest, so a file is hashed once per process
+_digest_cache: dict[tuple[str, int, int], str] = {}
+
+
+def file_digest(path: Path) -> str:
+    """
+    Compute a content digest of a file, memoized on its size and mtime.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        Hex digest of the file content
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    key = (str(path), stat.st_size, stat.st_mtime_ns)
+
+    if key not in _digest_cache:
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            while chunk := f.read(_CHUNK_SIZE):
+                digest.update(chunk)
+        _digest_cache[key] = digest.hexdigest()
+
+    return _digest_cache[key]
+
+
+def file_fingerprint(path: Path, **options) -> str:
+    """
+    Fingerprint a file together with the options used to read it.
+
+    The fingerprint changes whenever the file content, size, modification time
+    or any of the read options change.
+
+    Args:
+        path: File to fingerprint
+        **options: Read options that influence the parsed result (must be JSON serializable)
+
+    Returns:
+        Hex fingerprint string
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    payload = json.dumps(
+        {
+            "digest": file_digest(path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "options": options,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Fingerprint the content of a dataframe.
+
+    Covers column names, dtypes, index and values, so two frames with equal
+    fingerprints hold the same data.
+
+    Args:
+        df: Frame to fingerprint
+
+    Returns:
+        Hex fingerprint string
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps([list(map(str, df.columns)), list(map(str, df.dtypes))]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
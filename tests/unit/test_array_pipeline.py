@@ -0,0 +1,120 @@
+"""Test the NumPy execution mode against the pandas pipeline."""
+
+from pathlib import Path
+
+import numpy as np
+from omegaconf import open_dict
+import pandas as pd
+import pytest
+
+from src.config.hydra_loader import load_config
+from src.preprocessing.array_pipeline import ArrayPipeline
+from src.preprocessing.sklearn_pipeline_builder import CategoricalMapTransformer, build_pipeline
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture
+def houses():
+    rng = np.random.default_rng(0)
+    n = 50
+    return pd.DataFrame(
+        {
+            "Id": np.arange(n),
+            "PoolQC": ["Ex"] * n,
+            "FireplaceQu": rng.choice(["Ex", "TA", "Fa", None], size=n),
+            "Street": rng.choice(["Pave", "Grvl"], size=n),
+            "LotArea": rng.integers(5000, 15000, size=n).astype(float),
+            "GrLivArea": rng.integers(800, 3000, size=n),
+            "SalePrice": rng.integers(100000, 400000, size=n),
+        }
+    ).assign(LotArea=lambda df: df["LotArea"].mask(df.index % 7 == 0))
+
+
+def pandas_model_input(pipeline, X) -> pd.DataFrame:
+    """Numeric model input as SimpleExperiment builds it from the pandas pipeline."""
+    transformed = pipeline.transform(X)
+    return transformed.select_dtypes(include=["number"]).fillna(0)
+
+
+class TestArrayPipeline:
+    def test_matches_pandas_pipeline(self, houses):
+        """Test array mode gives the same values and columns as the pandas pipeline."""
+        cfg = load_config(PROJECT_ROOT / "tests" / "config", "experiment")
+        pipeline = build_pipeline(cfg).fit(houses)
+
+        arrays = ArrayPipeline(pipeline, houses)
+        expected = pandas_model_input(pipeline, houses)
+
+        result = arrays.transform(houses)
+        assert isinstance(result, np.ndarray)
+        assert arrays.feature_names_out_ == list(expected.columns)
+        np.testing.assert_allclose(result, expected.to_numpy(dtype=np.float64), atol=1e-9)
+
+    def test_with_feature_engineering_and_selection(self, houses):
+        """Test engineered and selected columns land in the same place."""
+        cfg = load_config(PROJECT_ROOT / "tests" / "config", "experiment")
+        with open_dict(cfg):
+            cfg.preprocessing.feature_engineering = {
+                "polynomial_features": [{"column": "GrLivArea", "degrees": [2]}],
+                "log_transforms": ["LotArea"],
+                "interactions": [{"name": "Area_x_Lot", "columns": ["GrLivArea", "LotArea"]}],
+            }
+            cfg.preprocessing.feature_selection = {
+                "method": "correlation",
+                "target_column": "SalePrice",
+                "params": {"threshold": 0.0},
+                "exclude_columns": ["Id"],
+            }
+            cfg.preprocessing.pipeline = [
+                {"step": "drop_columns"},
+                {"step": "categorical_transforms"},
+                {"step": "imputation"},
+                {"step": "feature_engineering"},
+                {"step": "feature_selection"},
+                {"step": "scaling"},
+            ]
+        pipeline = build_pipeline(cfg).fit(houses)
+
+        arrays = ArrayPipeline(pipeline, houses)
+        expected = pandas_model_input(pipeline, houses)
+
+        result = arrays.transform(houses.iloc[10:], as_frame=True)
+        pd.testing.assert_index_equal(result.index, houses.index[10:])
+        pd.testing.assert_frame_equal(
+            result, expected.iloc[10:].astype(np.float64), check_exact=False, atol=1e-9
+        )
+
+    def test_float32(self, houses):
+        """Test the array dtype is configurable."""
+        cfg = load_config(PROJECT_ROOT / "tests" / "config", "experiment")
+        pipeline = build_pipeline(cfg).fit(houses)
+
+        result = ArrayPipeline(pipeline, houses, dtype=np.float32).transform(houses)
+
+        assert result.dtype == np.float32
+        expected = pandas_model_input(pipeline, houses).to_numpy(dtype=np.float64)
+        np.testing.assert_allclose(result, expected, rtol=1e-4, atol=1e-4)
+
+    def test_categorical_transforms_after_imputation_raises(self, houses):
+        """Test unsupported step orders fail noisily."""
+        cfg = load_config(PROJECT_ROOT / "tests" / "config", "experiment")
+        cfg.preprocessing.pipeline = [{"step": "imputation"}, {"step": "categorical_transforms"}]
+        pipeline = build_pipeline(cfg).fit(houses)
+
+        with pytest.raises(ValueError, match="before imputation"):
+            ArrayPipeline(pipeline, houses)
+
+    def test_mapping_uses_fitted_tables(self, houses, monkeypatch):
+        """Test categorical mappings are gathered from the fitted tables, not the pandas step."""
+        cfg = load_config(PROJECT_ROOT / "tests" / "config", "experiment")
+        pipeline = build_pipeline(cfg).fit(houses)
+        expected = pandas_model_input(pipeline, houses)
+        arrays = ArrayPipeline(pipeline, houses)
+
+        def fail(self, X):
+            raise AssertionError("array mode called CategoricalMapTransformer.transform")
+
+        monkeypatch.setattr(CategoricalMapTransformer, "transform", fail)
+        result = arrays.transform(houses)
+        np.testing.assert_allclose(result, expected.to_numpy(dtype=np.float64), atol=1e-9)
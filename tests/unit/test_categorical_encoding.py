@@ -0,0 +1,128 @@
+"""Test sparse one-hot and ordinal encoding of categorical columns."""
+
+from pathlib import Path
+
+import numpy as np
+from omegaconf import open_dict
+import pandas as pd
+import pytest
+from scipy import sparse
+from sklearn.linear_model import Ridge
+
+from src.config.hydra_loader import load_config
+from src.preprocessing.categorical_encoding import CategoricalEncodingTransformer
+from src.preprocessing.sklearn_pipeline_builder import build_pipeline
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture
+def houses():
+    return pd.DataFrame(
+        {
+            "GrLivArea": [1000.0, 1500.0, 2000.0, 1200.0, 1800.0, 900.0],
+            "Street": ["Pave", "Pave", "Grvl", "Pave", None, "Grvl"],
+            "Neighborhood": ["NAmes", "NAmes", "NAmes", "Edwards", "Edwards", "Mitchel"],
+        }
+    )
+
+
+class TestCategoricalEncodingTransformer:
+    def test_onehot_is_sparse(self, houses):
+        """Test one-hot columns land in a CSR matrix next to the numeric columns."""
+        config = {"max_categories": 10, "hash_buckets": 0}
+        encoder = CategoricalEncodingTransformer(config).fit(houses)
+
+        result = encoder.transform(houses)
+
+        assert sparse.issparse(result) and result.format == "csr"
+        dummies = pd.get_dummies(houses[["Street", "Neighborhood"]], prefix_sep="=")
+        expected = pd.concat([houses[["GrLivArea"]], dummies], axis=1)
+        dense = pd.DataFrame(result.toarray(), columns=encoder.feature_names_out_)
+        pd.testing.assert_frame_equal(
+            dense[expected.columns], expected.astype(np.float64), check_like=True
+        )
+        assert dense.shape[1] == expected.shape[1]
+
+    def test_missing_values_encode_as_zeros(self, houses):
+        """Test a missing level sets no one-hot column."""
+        encoder = CategoricalEncodingTransformer({"hash_buckets": 4}).fit(houses)
+
+        dense = pd.DataFrame(
+            encoder.transform(houses).toarray(), columns=encoder.feature_names_out_
+        )
+
+        street = dense.filter(like="Street=")
+        assert street.sum(axis=1).tolist() == [1, 1, 1, 1, 0, 1]
+
+    def test_rare_and_unseen_levels_are_hashed(self, houses):
+        """Test levels outside the vocabulary share a bounded number of hash columns."""
+        encoder = CategoricalEncodingTransformer({"max_categories": 1, "hash_buckets": 2})
+        encoder.fit(houses)
+        new = houses.assign(Neighborhood=["NAmes", "Edwards", "Unseen", "Other", "NAmes", "X"])
+
+        first = encoder.transform(new).toarray()
+        second = encoder.transform(new).toarray()
+
+        names = encoder.feature_names_out_
+        neighborhood = [i for i, name in enumerate(names) if name.startswith("Neighborhood=")]
+        assert [names[i] for i in neighborhood] == [
+            "Neighborhood=NAmes",
+            "Neighborhood=#0",
+            "Neighborhood=#1",
+        ]
+        assert (first[:, neighborhood].sum(axis=1) == 1).all()
+        np.testing.assert_array_equal(first, second)
+
+    def test_ordinal_codes(self, houses):
+        """Test ordinal encoding gives vocabulary codes and -1 for missing values."""
+        config = {"method": "ordinal", "hash_buckets": 0}
+        result = CategoricalEncodingTransformer(config).fit_transform(houses)
+
+        assert isinstance(result, pd.DataFrame)
+        # Pave is most frequent, so it gets code 0
+        assert result["Street"].tolist() == [0, 0, 1, 0, -1, 1]
+        assert result["Neighborhood"].tolist() == [0, 0, 0, 1, 1, 2]
+
+    def test_partial_fit_matches_fit(self, houses):
+        """Test vocabularies merged over batches equal the ones fit learns."""
+        expected = CategoricalEncodingTransformer({"max_categories": 2}).fit(houses)
+        encoder = CategoricalEncodingTransformer({"max_categories": 2})
+        for start in range(0, len(houses), 2):
+            encoder.partial_fit(houses.iloc[start : start + 2])
+
+        assert encoder.feature_names_out_ == expected.feature_names_out_
+        assert (encoder.transform(houses) != expected.transform(houses)).nnz == 0
+
+
+class TestCategoricalEncodingStep:
+    def test_sparse_pipeline_fits_ridge(self):
+        """Test the encoded pipeline output goes to Ridge without densifying."""
+        rng = np.random.default_rng(0)
+        n = 60
+        X = pd.DataFrame(
+            {
+                "Id": np.arange(n),
+                "Street": rng.choice(["Pave", "Grvl"], size=n),
+                "FireplaceQu": rng.choice(["Ex", "TA", "Fa"], size=n),
+                "GrLivArea": rng.integers(800, 3000, size=n).astype(float),
+            }
+        )
+        cfg = load_config(PROJECT_ROOT / "tests" / "config", "experiment")
+        with open_dict(cfg):
+            cfg.preprocessing.categorical_encoding = {"hash_buckets": 2}
+            cfg.preprocessing.pipeline.append({"step": "categorical_encoding"})
+
+        result = build_pipeline(cfg).fit_transform(X)
+
+        assert sparse.issparse(result)
+        Ridge().fit(result, rng.normal(size=n))
+
+    def test_sparse_encoding_must_be_last(self):
+        """Test a sparse encoding step in the middle fails noisily."""
+        cfg = load_config(PROJECT_ROOT / "tests" / "config", "experiment")
+        with open_dict(cfg):
+            cfg.preprocessing.pipeline.insert(0, {"step": "categorical_encoding"})
+
+        with pytest.raises(ValueError, match="must be the last step"):
+            build_pipeline(cfg)
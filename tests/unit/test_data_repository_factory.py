@@ -7,6 +7,7 @@ import pytest
 
 from src.adapters.factory import create_data_repository
 from src.adapters.filesystem_repository import FileSystemDataRepository
+from src.adapters.sqlite_repository import SQLiteDataRepository
 
 
 class TestDataRepositoryFactory:
@@ -28,6 +29,20 @@ class TestDataRepositoryFactory:
         repo = create_data_repository(config)
         assert isinstance(repo, FileSystemDataRepository)
 
+    def test_create_sqlite_repository(self, tmp_path):
+        """Test creating SQLite repository."""
+        config = OmegaConf.create(
+            {
+                "data": {
+                    "repository_type": "sqlite",
+                    "sqlite": {"database_path": str(tmp_path / "test.sqlite")},
+                }
+            }
+        )
+
+        repo = create_data_repository(config)
+        assert isinstance(repo, SQLiteDataRepository)
+
     def test_create_repository_defaults_to_filesystem(self):
         """Test that factory defaults to filesystem if type not specified."""
         config = OmegaConf.create(
@@ -0,0 +1,98 @@
+"""
+Unit tests for dtype compaction.
+"""
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+from src.adapters.dtype_compaction import (
+    apply_compact_schema,
+    infer_categories,
+    infer_compact_schema,
+    infer_compact_schema_lazy,
+)
+
+
+class TestDtypeCompaction:
+    """Test schema inference and application."""
+
+    def test_infer_compact_schema(self):
+        """Test that each column gets its smallest safe dtype."""
+        df = pd.DataFrame(
+            {
+                "YearBuilt": [2003, 1976, 2001, 1915],
+                "OverallQual": [7, 6, 7, 8],
+                "Id": [1, 2, 3, 100_000],
+                "LotFrontage": [65.0, np.nan, 68.0, 60.0],
+                "Ratio": [0.1, 0.2, 0.3, 0.4],
+                "Street": ["Pave", "Pave", "Grvl", "Pave"],
+                "Name": ["a", "b", "c", "d"],
+            }
+        )
+
+        schema = infer_compact_schema(df, max_category_ratio=0.5)
+
+        assert schema["YearBuilt"] == "int16"
+        assert schema["OverallQual"] == "int8"
+        assert schema["Id"] == "int32"
+        assert schema["LotFrontage"] == "float32"
+        assert schema["Ratio"] == "float64"  # 0.1 does not round-trip through float32
+        assert schema["Street"] == "category"
+        assert schema["Name"] == "object"
+
+    def test_lazy_inference_matches_eager(self):
+        """Test the streaming inference gives the schema and categories of a loaded frame."""
+        df = pd.DataFrame(
+            {
+                "YearBuilt": [2003, 1976, 2001, 1915],
+                "LotFrontage": [65.0, None, 68.0, 60.0],
+                "Street": ["Pave", "Pave", "Grvl", None],
+                "Name": ["a", "b", "c", "d"],
+            }
+        )
+
+        schema, categories = infer_compact_schema_lazy(pl.from_pandas(df).lazy())
+
+        assert schema == infer_compact_schema(df)
+        assert categories == infer_categories(df, schema) == {"Street": ["Grvl", "Pave"]}
+
+    def test_apply_fixed_categories(self):
+        """Test persisted categories give one dtype, and unknown levels are not lost."""
+        categories = {"Street": ["Grvl", "Pave"]}
+
+        compacted, _ = apply_compact_schema(
+            pd.DataFrame({"Street": ["Pave", "Pave"]}), {"Street": "category"}, categories
+        )
+        unknown, report = apply_compact_schema(
+            pd.DataFrame({"Street": ["Pave", "Dirt"]}), {"Street": "category"}, categories
+        )
+
+        assert compacted["Street"].dtype == pd.CategoricalDtype(["Grvl", "Pave"])
+        assert unknown["Street"].tolist() == ["Pave", "Dirt"]
+        assert report == {}
+
+    def test_apply_compact_schema_reports_savings(self):
+        """Test that applying a schema preserves values and reports bytes saved."""
+        df = pd.DataFrame(
+            {"YearBuilt": [2003, 1976, 2001] * 100, "Street": ["Pave", "Grvl", "Pave"] * 100}
+        )
+
+        compacted, report = apply_compact_schema(
+            df, {"YearBuilt": "int16", "Street": "category"}
+        )
+
+        assert compacted["YearBuilt"].dtype == "int16"
+        assert isinstance(compacted["Street"].dtype, pd.CategoricalDtype)
+        assert report["YearBuilt"] == 300 * (8 - 2)
+        assert report["Street"] > 0
+        pd.testing.assert_frame_equal(compacted.astype(df.dtypes.to_dict()), df)
+
+    def test_apply_compact_schema_skips_unsafe_cast(self):
+        """Test that a persisted schema is not applied to values that no longer fit."""
+        df = pd.DataFrame({"Id": [1, 2, 70_000]})
+
+        compacted, report = apply_compact_schema(df, {"Id": "int16"})
+
+        assert compacted["Id"].dtype == "int64"
+        assert report == {}
@@ -2,6 +2,11 @@
 Unit tests for ExperimentManager.
 """
 
+import numpy as np
+from omegaconf import open_dict
+import pandas as pd
+
+from src.domain.models.data_models import RowFilter
 from src.domain.models.experiment_models import ExperimentSetup
 from src.services.experiment_manager import ExperimentManager
 
@@ -47,3 +52,57 @@ class TestExperimentManager:
         # The model seems to use struct mode which prevents attribute access
         # Either: 1) Make ExperimentSetup a dataclass, 2) Disable struct mode in config
         assert hasattr(experiment, "config")
+
+    def test_load_options_push_down_drops_and_outliers(self):
+        """Test that drop_columns and remove_outliers become repository load options."""
+        manager = ExperimentManager()
+        manager.setup_experiment(ExperimentSetup(config_name="config", run_name="my-run"))
+
+        options = manager._experiments[0]._load_options()
+
+        assert "PoolQC" in options["exclude_columns"]
+        assert RowFilter("GrLivArea", "<=", 4000) in options["filters"]
+
+    def test_outlier_conditions_on_target_apply(self):
+        """Test that statistical outlier conditions on the target remove rows from X and y."""
+        manager = ExperimentManager()
+        manager.setup_experiment(ExperimentSetup(config_name="config", run_name="my-run"))
+        experiment = manager._experiments[0]
+        with open_dict(experiment.config):
+            experiment.config.preprocessing.remove_outliers = {"SalePrice": {"zscore": 3.0}}
+
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame(
+            {"GrLivArea": rng.normal(1500, 300, 200), "SalePrice": rng.normal(2e5, 1e4, 200)}
+        )
+        df.loc[5, "SalePrice"] = 1e7
+
+        class Repository:
+            def load_raw(self, **options):
+                return df
+
+        experiment._data_repository = Repository()
+        X, y = experiment._load_data()
+
+        assert len(X) == len(y) == len(df) - 1
+        assert 5 not in y.index
+        assert "SalePrice" not in X.columns
+
+    def test_load_options_keep_columns_read_before_drop_columns(self):
+        """Test that columns an earlier step derives features from are still loaded."""
+        manager = ExperimentManager()
+        manager.setup_experiment(ExperimentSetup(config_name="config", run_name="my-run"))
+        experiment = manager._experiments[0]
+        with open_dict(experiment.config):
+            prep_cfg = experiment.config.preprocessing
+            prep_cfg.drop_columns = ["PoolQC", "LotFrontage"]
+            prep_cfg.feature_engineering = {"log_transforms": ["LotFrontage"]}
+            prep_cfg.pipeline = [
+                {"step": "categorical_transforms"},
+                {"step": "feature_engineering"},
+                {"step": "drop_columns"},
+            ]
+
+        options = experiment._load_options()
+
+        assert options["exclude_columns"] == ["PoolQC"]
@@ -1,7 +1,10 @@
 import numpy as np
 import pandas as pd
 
-from src.preprocessing.feature_engineering import FeatureEngineeringTransformer
+from src.preprocessing.feature_engineering import (
+    FeatureEngineeringTransformer,
+    compile_features,
+)
 
 
 class TestFeatureEngineeringTransformer:
@@ -69,6 +72,7 @@ class TestFeatureEngineeringTransformer:
         # Verify values
         assert result["HasBsmt"].tolist() == [0, 1, 1, 0]
         assert result["HasGarage"].tolist() == [0, 1, 1, 1]
+        assert result["HasBsmt"].dtype == "int64"
 
     def test_log_transforms(self):
         df = pd.DataFrame(
@@ -187,3 +191,86 @@ class TestFeatureEngineeringTransformer:
         # log1p(0) = 0, not -inf
         assert result["Value_log"].iloc[0] == 0
         assert np.isclose(result["Value_log"].iloc[1], np.log1p(10))
+
+    def test_narrow_integer_columns_do_not_overflow(self):
+        df = pd.DataFrame({"OverallQual": pd.Series([9, 10], dtype="int8")})
+
+        config = {"polynomial_features": [{"column": "OverallQual", "degrees": [3]}]}
+
+        transformer = FeatureEngineeringTransformer(config)
+        result = transformer.fit_transform(df)
+
+        assert result["OverallQual_cubed"].tolist() == [729, 1000]
+
+    def test_interactions_can_use_engineered_columns(self):
+        df = pd.DataFrame({"OverallQual": [2, 3], "GrLivArea": [1000, 1500]})
+
+        config = {
+            "polynomial_features": [{"column": "OverallQual", "degrees": [2]}],
+            "interactions": [
+                {"columns": ["OverallQual_squared", "GrLivArea"], "name": "Qual2_x_Area"}
+            ],
+        }
+
+        transformer = FeatureEngineeringTransformer(config)
+        result = transformer.fit_transform(df)
+
+        assert result["Qual2_x_Area"].tolist() == [4000, 13500]
+
+    def test_engineered_columns_are_appended_in_config_order(self):
+        df = pd.DataFrame({"A": [1.0, 2.0], "B": [3.0, 4.0]})
+
+        config = {
+            "polynomial_features": [{"column": "A", "degrees": [2, 3]}],
+            "log_transforms": ["B"],
+            "interactions": [{"columns": ["A", "B"], "name": "A_x_B"}],
+        }
+
+        transformer = FeatureEngineeringTransformer(config)
+        result = transformer.fit_transform(df)
+
+        assert list(result.columns) == ["A", "B", "A_squared", "A_cubed", "B_log", "A_x_B"]
+        # Input frame is left untouched
+        assert list(df.columns) == ["A", "B"]
+
+    def test_compiled_plan_reads_input_columns_only(self):
+        config = {
+            "polynomial_features": [{"column": "GrLivArea", "degrees": [2]}],
+            "binary_indicators": [
+                {
+                    "name": "IsLarge",
+                    "condition": {"column": "GrLivArea_squared", "operator": ">", "value": 2e6},
+                }
+            ],
+            "interactions": [{"columns": ["OverallQual", "GrLivArea"], "name": "Qual_x_Area"}],
+        }
+
+        expressions = compile_features(config, ["OverallQual", "GrLivArea"])
+
+        assert list(expressions) == ["GrLivArea_squared", "IsLarge", "Qual_x_Area"]
+        assert expressions["IsLarge"].meta.root_names() == ["GrLivArea"]
+        assert sorted(expressions["Qual_x_Area"].meta.root_names()) == ["GrLivArea", "OverallQual"]
+
+    def test_string_conditions_and_missing_values(self):
+        df = pd.DataFrame({"Street": ["Pave", "Grvl", None], "LotArea": [1.0, np.nan, 3.0]})
+
+        config = {
+            "binary_indicators": [
+                {
+                    "name": "IsPaved",
+                    "condition": {"column": "Street", "operator": "==", "value": "Pave"},
+                },
+                {
+                    "name": "HasLot",
+                    "condition": {"column": "LotArea", "operator": ">", "value": 0},
+                },
+            ],
+            "log_transforms": ["LotArea"],
+        }
+
+        transformer = FeatureEngineeringTransformer(config)
+        result = transformer.fit_transform(df)
+
+        assert result["IsPaved"].tolist() == [1, 0, 0]
+        assert result["HasLot"].tolist() == [1, 0, 1]
+        assert np.isnan(result["LotArea_log"].iloc[1])
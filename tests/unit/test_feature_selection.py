@@ -1,7 +1,14 @@
 import numpy as np
 import pandas as pd
+import pytest
 
-from src.preprocessing.feature_selection import FeatureSelectionTransformer
+from src.preprocessing import feature_selection
+from src.preprocessing.feature_selection import (
+    FeatureSelectionTransformer,
+    correlation_scores,
+    mutual_info_scores,
+    stratified_sample,
+)
 
 
 class TestFeatureSelectionTransformer:
@@ -224,3 +231,234 @@ class TestFeatureSelectionTransformer:
         # Other columns should be dropped
         assert "A" not in result.columns
         assert "B" not in result.columns
+
+    def test_partial_fit_matches_fit(self):
+        rng = np.random.default_rng(0)
+        target = rng.normal(size=200)
+        df = pd.DataFrame(
+            {
+                "HighCorr": target * 2 + rng.normal(0, 0.5, 200),
+                "LowCorr": rng.normal(size=200),
+                "Street": rng.choice(["Pave", "Grvl"], size=200),
+                "Target": target,
+            }
+        )
+        for method, threshold in [("correlation", 0.5), ("variance_threshold", 1.5)]:
+            config = {
+                "method": method,
+                "params": {"threshold": threshold},
+                "target_column": "Target",
+            }
+
+            expected = FeatureSelectionTransformer(config).fit(df)
+            transformer = FeatureSelectionTransformer(config)
+            for start in range(0, 200, 30):
+                transformer.partial_fit(df.iloc[start : start + 30])
+
+            assert sorted(transformer.selected_features_) == sorted(expected.selected_features_)
+            pd.testing.assert_series_equal(
+                transformer.scores_, expected.scores_, check_exact=False, atol=1e-9
+            )
+
+    def test_correlation_scores_match_corrwith(self):
+        rng = np.random.default_rng(1)
+        target = pd.Series(rng.normal(size=100), name="Target").mask(lambda s: s.index % 9 == 0)
+        df = pd.DataFrame(
+            {
+                "A": target * 3 + rng.normal(size=100),
+                "B": rng.normal(size=100),
+                "Constant": 1.0,
+                "Int": rng.integers(0, 10, size=100),
+            }
+        ).assign(B=lambda d: d["B"].mask(d.index % 4 == 0))
+
+        expected = df.corrwith(target).abs()
+
+        pd.testing.assert_series_equal(correlation_scores(df, target), expected)
+
+    def test_correlation_scores_reused_with_cache(self, monkeypatch):
+        rng = np.random.default_rng(2)
+        target = pd.Series(rng.normal(size=50))
+        df = pd.DataFrame({"A": target + rng.normal(0, 0.5, 50), "B": rng.normal(size=50)})
+        calls = []
+        compute = feature_selection._correlations
+        monkeypatch.setattr(
+            feature_selection,
+            "_correlations",
+            lambda *args: calls.append(1) or compute(*args),
+        )
+
+        scores = [correlation_scores(df, target, cache=True) for _ in range(3)]
+
+        assert len(calls) == 1
+        pd.testing.assert_series_equal(scores[0], scores[2])
+
+    def test_mutual_info_scores_reused_across_thresholds(self, monkeypatch):
+        rng = np.random.default_rng(2)
+        target = rng.normal(size=50)
+        df = pd.DataFrame(
+            {"A": target + rng.normal(0, 0.5, 50), "B": rng.normal(size=50), "Target": target}
+        )
+        calls = []
+        compute = feature_selection._mutual_info
+        monkeypatch.setattr(
+            feature_selection,
+            "_mutual_info",
+            lambda *args: calls.append(1) or compute(*args),
+        )
+
+        selections = []
+        for threshold in [0.0, 0.3, 0.9]:
+            config = {
+                "method": "mutual_info",
+                "params": {"threshold": threshold, "cache_scores": True},
+                "target_column": "Target",
+            }
+            transformer = FeatureSelectionTransformer(config).fit(df)
+            selections.append(len(transformer.selected_features_))
+
+        assert len(calls) == 1
+        assert selections == sorted(selections, reverse=True)
+        assert list(transformer.scores_.index) == ["A", "B"]
+
+    def test_scores_not_cached_by_default(self, monkeypatch):
+        rng = np.random.default_rng(2)
+        target = rng.normal(size=50)
+        df = pd.DataFrame({"A": target + rng.normal(0, 0.5, 50), "Target": target})
+
+        def fail(*args):
+            raise AssertionError("fit hashed the frame without cache_scores")
+
+        monkeypatch.setattr(feature_selection, "frame_fingerprint", fail)
+        config = {"method": "mutual_info", "params": {"threshold": 0.3}, "target_column": "Target"}
+
+        transformer = FeatureSelectionTransformer(config).fit(df)
+
+        assert "A" in transformer.selected_features_
+
+    def test_fit_selects_from_statistics_in_one_pass(self, monkeypatch):
+        rng = np.random.default_rng(4)
+        target = rng.normal(size=100)
+        df = pd.DataFrame(
+            {
+                "A": target + rng.normal(0, 0.5, 100),
+                "B": rng.normal(size=100),
+                "Constant": 1.0,
+                "Target": target,
+            }
+        )
+
+        def fail(*args):
+            raise AssertionError("fit scored the rows a second time")
+
+        monkeypatch.setattr(feature_selection, "_correlations", fail)
+        for method in ["correlation", "variance_threshold"]:
+            config = {"method": method, "params": {"threshold": 0.3}, "target_column": "Target"}
+
+            fitted = FeatureSelectionTransformer(config).fit(df)
+            streamed = FeatureSelectionTransformer(config).partial_fit(df)
+
+            assert fitted.selected_features_ == streamed.selected_features_
+            pd.testing.assert_series_equal(fitted.scores_, streamed.scores_, check_exact=True)
+
+    def test_parallel_mutual_info_matches_serial(self):
+        rng = np.random.default_rng(3)
+        target = pd.Series(rng.normal(size=300))
+        df = pd.DataFrame({f"F{i}": target * i + rng.normal(size=300) for i in range(5)})
+
+        serial = mutual_info_scores(df, target)
+        for executor in ["thread", "process"]:
+            parallel = mutual_info_scores(df, target, n_jobs=2, executor=executor)
+            pd.testing.assert_series_equal(parallel, serial, check_exact=False, atol=1e-6)
+
+    def test_mutual_info_unknown_executor_raises(self):
+        df = pd.DataFrame({"A": [1.0, 2.0, 3.0, 4.0, 5.0]})
+
+        with pytest.raises(ValueError, match="Unknown executor"):
+            mutual_info_scores(df, pd.Series([1.0, 2.0, 3.0, 4.0, 5.0]), executor="gpu")
+
+    def test_subsampled_mutual_info_selection(self):
+        rng = np.random.default_rng(4)
+        target = rng.normal(size=2000)
+        df = pd.DataFrame(
+            {"Relevant": target * 2, "Irrelevant": rng.normal(size=2000), "Target": target}
+        )
+        config = {
+            "method": "mutual_info",
+            "params": {"threshold": 0.5, "sample_size": 300, "n_jobs": 2},
+            "target_column": "Target",
+        }
+
+        result = FeatureSelectionTransformer(config).fit_transform(df)
+
+        assert "Relevant" in result.columns
+        assert "Irrelevant" not in result.columns
+
+    def test_stratified_sample_keeps_target_distribution(self):
+        target = np.random.default_rng(5).lognormal(size=1000)
+
+        rows = stratified_sample(target, 100)
+
+        assert len(rows) == 100
+        assert len(np.unique(rows)) == 100
+        deciles = np.quantile(target, np.linspace(0.1, 0.9, 9))
+        counts = np.bincount(np.searchsorted(deciles, target[rows]), minlength=10)
+        assert (counts == 10).all()
+        assert (stratified_sample(target, None) == np.arange(1000)).all()
+
+    def test_fit_then_partial_fit_matches_fit_on_all_rows(self):
+        rng = np.random.default_rng(6)
+        target = rng.normal(size=300)
+        df = pd.DataFrame(
+            {
+                "A": target + rng.normal(0, 1.0, 300),
+                "B": rng.normal(size=300),
+                "Target": target,
+            }
+        )
+        config = {"method": "correlation", "params": {"threshold": 0.5}, "target_column": "Target"}
+
+        expected = FeatureSelectionTransformer(config).fit(df)
+        transformer = FeatureSelectionTransformer(config).fit(df.iloc[:200])
+        transformer.partial_fit(df.iloc[200:])
+
+        assert sorted(transformer.selected_features_) == sorted(expected.selected_features_)
+        pd.testing.assert_series_equal(
+            transformer.scores_, expected.scores_, check_exact=False, atol=1e-9
+        )
+
+    def test_merge_shards_matches_fit(self):
+        rng = np.random.default_rng(7)
+        target = rng.normal(size=300)
+        df = pd.DataFrame(
+            {
+                "A": target * 2 + rng.normal(size=300),
+                "B": rng.normal(0, 2, 300),
+                "Street": rng.choice(["Pave", "Grvl"], size=300),
+                "Target": target,
+            }
+        )
+        config = {
+            "method": "variance_threshold",
+            "params": {"threshold": 3.0},
+            "target_column": "Target",
+        }
+
+        expected = FeatureSelectionTransformer(config).fit(df)
+        shards = [
+            FeatureSelectionTransformer(config).fit(df.iloc[start : start + 100])
+            for start in range(0, 300, 100)
+        ]
+        merged = shards[0].merge(shards[1]).merge(shards[2])
+
+        assert sorted(merged.selected_features_) == sorted(expected.selected_features_)
+        pd.testing.assert_series_equal(merged.scores_, expected.scores_, check_exact=False)
+
+    def test_merge_different_columns_raises(self):
+        config = {"method": "correlation", "target_column": "Target"}
+        frames = [pd.DataFrame({col: [1, 2], "Target": [1, 2]}) for col in ["A", "B"]]
+        left = FeatureSelectionTransformer(config).fit(frames[0])
+        right = FeatureSelectionTransformer(config).fit(frames[1])
+
+        with pytest.raises(ValueError, match="different columns"):
+            left.merge(right)
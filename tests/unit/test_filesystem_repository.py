@@ -7,8 +7,10 @@ from pathlib import Path
 
 from omegaconf import DictConfig, OmegaConf
 import pandas as pd
+import pytest
 
 from src.adapters.filesystem_repository import FileSystemDataRepository
+from src.domain.models.data_models import RowFilter
 
 
 class TestFileSystemDataRepository:
@@ -190,3 +192,418 @@ class TestFileSystemDataRepository:
         abs_path = "/absolute/path/test.csv"
         resolved = repo._resolve_path(abs_path)
         assert str(resolved) == abs_path
+
+    def test_load_raw_writes_and_reuses_cache(
+        self, sample_config_with_temp_paths: DictConfig, sample_dataframe: pd.DataFrame
+    ):
+        """Test that load_raw writes a sidecar cache and reads it on the next call."""
+        repo = FileSystemDataRepository(sample_config_with_temp_paths)
+        sample_dataframe.to_csv(repo.raw_path, index=False)
+
+        df_first = repo.load_raw()
+        cache_path = repo.raw_cache_path()
+        assert cache_path.exists()
+        assert cache_path.parent == repo.raw_path.parent
+
+        df_cached = repo.load_raw()
+        pd.testing.assert_frame_equal(df_cached, df_first)
+        pd.testing.assert_frame_equal(df_cached, sample_dataframe)
+
+    def test_raw_cache_invalidated_on_change(
+        self, sample_config_with_temp_paths: DictConfig, sample_dataframe: pd.DataFrame
+    ):
+        """Test that changing the CSV invalidates and replaces the cache."""
+        repo = FileSystemDataRepository(sample_config_with_temp_paths)
+        sample_dataframe.to_csv(repo.raw_path, index=False)
+        repo.load_raw()
+        old_cache = repo.raw_cache_path()
+
+        modified = sample_dataframe.copy()
+        modified["SalePrice"] = modified["SalePrice"] + 1
+        modified.to_csv(repo.raw_path, index=False)
+
+        df = repo.load_raw()
+        assert repo.raw_cache_path() != old_cache
+        assert not old_cache.exists()
+        pd.testing.assert_frame_equal(df, modified)
+
+    def test_raw_cache_disabled(self, tmp_path: Path, sample_dataframe: pd.DataFrame):
+        """Test that no sidecar is written when the raw cache is disabled."""
+        raw_path = tmp_path / "raw.csv"
+        sample_dataframe.to_csv(raw_path, index=False)
+        config = OmegaConf.create({"data": {"raw_path": str(raw_path), "raw_cache": False}})
+        repo = FileSystemDataRepository(config)
+
+        df = repo.load_raw()
+
+        pd.testing.assert_frame_equal(df, sample_dataframe)
+        assert list(tmp_path.glob("*.arrow")) == []
+
+    def test_save_and_load_interim_ipc(self, tmp_path: Path, sample_dataframe: pd.DataFrame):
+        """Test the memory-mapped Arrow IPC interim format."""
+        config = OmegaConf.create(
+            {
+                "data": {
+                    "interim_path": str(tmp_path / "interim.arrow"),
+                    "metadata_path": str(tmp_path / "metadata.json"),
+                }
+            }
+        )
+        repo = FileSystemDataRepository(config)
+        assert repo.interim_format == "ipc"
+
+        repo.save_interim(sample_dataframe, {"rows": len(sample_dataframe)})
+
+        df_loaded = repo.load_interim()
+        assert all(isinstance(dtype, pd.ArrowDtype) for dtype in df_loaded.dtypes)
+        pd.testing.assert_frame_equal(df_loaded, sample_dataframe, check_dtype=False)
+
+        df_polars = repo.load_interim_polars()
+        pd.testing.assert_frame_equal(df_polars.to_pandas(), sample_dataframe)
+
+    def test_load_interim_polars_parquet(self, tmp_path: Path, sample_dataframe: pd.DataFrame):
+        """Test loading Parquet interim data as a Polars frame."""
+        config = OmegaConf.create(
+            {
+                "data": {
+                    "interim_path": str(tmp_path / "interim.parquet"),
+                    "metadata_path": str(tmp_path / "metadata.json"),
+                }
+            }
+        )
+        repo = FileSystemDataRepository(config)
+        repo.save_interim(sample_dataframe, {})
+
+        df_polars = repo.load_interim_polars()
+        pd.testing.assert_frame_equal(df_polars.to_pandas(), sample_dataframe)
+
+    def test_unknown_interim_format_raises(self, tmp_path: Path):
+        """Test that an unsupported interim format is rejected."""
+        config = OmegaConf.create({"data": {"interim_format": "csv"}})
+
+        with pytest.raises(ValueError, match="Unknown interim format"):
+            FileSystemDataRepository(config)
+
+    def test_load_raw_with_projection_and_filters(
+        self, sample_config_with_temp_paths: DictConfig, sample_dataframe: pd.DataFrame
+    ):
+        """Test that column selection and row filters are pushed into load_raw."""
+        repo = FileSystemDataRepository(sample_config_with_temp_paths)
+        sample_dataframe.to_csv(repo.raw_path, index=False)
+
+        df = repo.load_raw(
+            exclude_columns=["MSSubClass", "BedroomAbvGr"],
+            filters=[RowFilter("GrLivArea", "<=", 2000), RowFilter("Missing", ">", 0)],
+        )
+
+        expected = (
+            sample_dataframe[sample_dataframe["GrLivArea"] <= 2000]
+            .drop(columns=["MSSubClass", "BedroomAbvGr"])
+            .reset_index(drop=True)
+        )
+        pd.testing.assert_frame_equal(df, expected)
+
+    def test_load_raw_filter_on_unselected_column(
+        self, sample_config_with_temp_paths: DictConfig, sample_dataframe: pd.DataFrame
+    ):
+        """Test that filters may reference columns that are not loaded."""
+        repo = FileSystemDataRepository(sample_config_with_temp_paths)
+        sample_dataframe.to_csv(repo.raw_path, index=False)
+
+        df = repo.load_raw(columns=["Id", "SalePrice"], filters=[RowFilter("YearBuilt", ">", 1990)])
+
+        assert list(df.columns) == ["Id", "SalePrice"]
+        assert df["Id"].tolist() == [1, 3, 5]
+
+    def test_load_interim_with_filters(
+        self, sample_config_with_temp_paths: DictConfig, sample_dataframe: pd.DataFrame
+    ):
+        """Test predicate pushdown on the Parquet interim store."""
+        repo = FileSystemDataRepository(sample_config_with_temp_paths)
+        repo.save_interim(sample_dataframe, {})
+
+        df = repo.load_interim(columns=["Id"], filters=[RowFilter("OverallQual", "==", 7)])
+
+        assert df["Id"].tolist() == [1, 3, 4]
+
+    def test_iter_raw_batches(
+        self, sample_config_with_temp_paths: DictConfig, sample_dataframe: pd.DataFrame
+    ):
+        """Test streaming raw data in bounded batches."""
+        repo = FileSystemDataRepository(sample_config_with_temp_paths)
+        sample_dataframe.to_csv(repo.raw_path, index=False)
+
+        batches = list(repo.iter_raw_batches(batch_rows=2))
+
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        pd.testing.assert_frame_equal(
+            pd.concat(batches, ignore_index=True), sample_dataframe
+        )
+
+    def test_iter_interim_batches_with_projection(
+        self, sample_config_with_temp_paths: DictConfig, sample_dataframe: pd.DataFrame
+    ):
+        """Test streaming interim data with column selection."""
+        repo = FileSystemDataRepository(sample_config_with_temp_paths)
+        repo.save_interim(sample_dataframe, {})
+
+        batches = list(repo.iter_interim_batches(batch_rows=3, columns=["Id", "SalePrice"]))
+
+        assert [len(batch) for batch in batches] == [3, 2]
+        pd.testing.assert_frame_equal(
+            pd.concat(batches, ignore_index=True), sample_dataframe[["Id", "SalePrice"]]
+        )
+
+    def test_partitioned_interim_with_partition_filter(
+        self, tmp_path: Path, sample_dataframe: pd.DataFrame
+    ):
+        """Test saving a hive-partitioned interim dataset and loading one partition."""
+        config = OmegaConf.create(
+            {
+                "data": {
+                    "interim_path": str(tmp_path / "interim.parquet"),
+                    "metadata_path": str(tmp_path / "metadata.json"),
+                    "interim_parquet": {
+                        "partition_by": ["OverallQual"],
+                        "row_group_size": 2,
+                        "compression": "zstd",
+                    },
+                }
+            }
+        )
+        repo = FileSystemDataRepository(config)
+
+        repo.save_interim(sample_dataframe, {})
+
+        assert repo.interim_path.is_dir()
+        assert (repo.interim_path / "OverallQual=7").is_dir()
+
+        df_all = repo.load_interim().sort_values("Id").reset_index(drop=True)
+        pd.testing.assert_frame_equal(df_all, sample_dataframe)
+
+        df_slice = repo.load_interim(filters=[RowFilter("OverallQual", "==", 7)])
+        assert sorted(df_slice["Id"].tolist()) == [1, 3, 4]
+
+    def test_partitioned_interim_requires_parquet(self, tmp_path: Path):
+        """Test that partitioning is rejected for the IPC interim format."""
+        config = OmegaConf.create(
+            {
+                "data": {
+                    "interim_path": str(tmp_path / "interim.arrow"),
+                    "interim_parquet": {"partition_by": ["YrSold"]},
+                }
+            }
+        )
+
+        with pytest.raises(ValueError, match="requires the parquet interim format"):
+            FileSystemDataRepository(config)
+
+    def test_load_raw_compact_dtypes_persists_schema(
+        self, sample_config_with_temp_paths: DictConfig, sample_dataframe: pd.DataFrame
+    ):
+        """Test opt-in dtype compaction driven by the schema in the metadata JSON."""
+        config = sample_config_with_temp_paths.copy()
+        config.data.compact_dtypes = True
+        repo = FileSystemDataRepository(config)
+        sample_dataframe.to_csv(repo.raw_path, index=False)
+
+        df = repo.load_raw()
+
+        assert df["YearBuilt"].dtype == "int16"
+        assert df["OverallQual"].dtype == "int8"
+        assert repo.last_compaction_report["YearBuilt"] == 5 * (8 - 2)
+        pd.testing.assert_frame_equal(df.astype(sample_dataframe.dtypes.to_dict()), sample_dataframe)
+        # Loading does not write metadata
+        assert not repo.metadata_path.exists()
+
+        # The raw schema is persisted when data is saved
+        repo.save_interim(sample_dataframe, {"step": "test"})
+        assert repo.load_metadata()["dtype_schema"]["raw"]["YearBuilt"] == "int16"
+        assert FileSystemDataRepository(config).load_raw()["YearBuilt"].dtype == "int16"
+
+    def test_compact_batches_share_categories(
+        self, sample_config_with_temp_paths: DictConfig, sample_dataframe: pd.DataFrame
+    ):
+        """Test every batch gets the same category dtype, so batches concatenate."""
+        config = sample_config_with_temp_paths.copy()
+        config.data.compact_dtypes = True
+        config.data.max_category_ratio = 0.6
+        repo = FileSystemDataRepository(config)
+        sample_dataframe.assign(Street=["Pave", "Pave", "Grvl", "Grvl", "Pave"]).to_csv(
+            repo.raw_path, index=False
+        )
+
+        batches = list(repo.iter_raw_batches(batch_rows=2))
+
+        dtypes = {batch["Street"].dtype for batch in batches}
+        assert dtypes == {pd.CategoricalDtype(["Grvl", "Pave"])}
+        assert pd.concat(batches)["Street"].dtype == pd.CategoricalDtype(["Grvl", "Pave"])
+
+        repo.save_interim(sample_dataframe, {"step": "test"})
+        assert repo.load_metadata()["dtype_categories"]["raw"]["Street"] == ["Grvl", "Pave"]
+
+    def test_save_interim_records_write_stats(
+        self, tmp_path: Path, sample_dataframe: pd.DataFrame
+    ):
+        """Test codec settings are applied and write statistics land in the metadata."""
+        config = OmegaConf.create(
+            {
+                "data": {
+                    "interim_path": str(tmp_path / "interim.parquet"),
+                    "metadata_path": str(tmp_path / "metadata.json"),
+                    "interim_parquet": {"compression": "zstd", "compression_level": 9},
+                }
+            }
+        )
+        repo = FileSystemDataRepository(config)
+
+        repo.save_interim(sample_dataframe, {"step": "test"})
+
+        stats = repo.load_metadata()["write_stats"]
+        assert stats["compression"] == "zstd"
+        assert stats["compression_level"] == 9
+        assert stats["bytes_written"] == repo.interim_path.stat().st_size
+        assert stats["compression_ratio"] == pytest.approx(
+            stats["bytes_in_memory"] / stats["bytes_written"], rel=1e-3
+        )
+        assert stats["duration_seconds"] >= 0
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_failed_save_interim_keeps_previous_data(
+        self, sample_config_with_temp_paths: DictConfig, sample_dataframe: pd.DataFrame
+    ):
+        """Test that a failing write leaves the previous file intact and no temp files."""
+        repo = FileSystemDataRepository(sample_config_with_temp_paths)
+        repo.save_interim(sample_dataframe, {"cycle": 1})
+
+        broken = sample_dataframe.assign(Mixed=[1, "a", 2.5, None, b"x"])
+        with pytest.raises(Exception):
+            repo.save_interim(broken, {"cycle": 2})
+
+        pd.testing.assert_frame_equal(repo.load_interim(), sample_dataframe)
+        assert repo.load_metadata()["cycle"] == 1
+        assert not list(repo.interim_path.parent.glob("*.tmp"))
+
+    def test_background_save_interim(
+        self, sample_config_with_temp_paths: DictConfig, sample_dataframe: pd.DataFrame
+    ):
+        """Test that background saves are visible to loads and report their errors."""
+        config = sample_config_with_temp_paths.copy()
+        config.data.background_save = True
+        repo = FileSystemDataRepository(config)
+
+        repo.save_interim(sample_dataframe, {"cycle": 1})
+
+        # Loads wait for the pending save
+        pd.testing.assert_frame_equal(repo.load_interim(), sample_dataframe)
+        assert repo.load_metadata()["cycle"] == 1
+
+        repo.save_interim(sample_dataframe.assign(Mixed=[1, "a", 2.5, None, b"x"]), {})
+        with pytest.raises(Exception):
+            repo.wait_for_save()
+        repo.wait_for_save()
+
+    def test_append_raw_skips_known_ids(
+        self, sample_config_with_temp_paths: DictConfig, sample_dataframe: pd.DataFrame
+    ):
+        """Test that only rows with unseen ids are appended to the raw CSV."""
+        repo = FileSystemDataRepository(sample_config_with_temp_paths)
+        sample_dataframe.iloc[:3].to_csv(repo.raw_path, index=False)
+
+        new_rows = sample_dataframe.iloc[2:].drop(columns=["MSSubClass"])
+        appended = repo.append_raw(new_rows)
+
+        assert appended["Id"].tolist() == [4, 5]
+        df = repo.load_raw()
+        assert df["Id"].tolist() == [1, 2, 3, 4, 5]
+        assert df["MSSubClass"].isna().tolist() == [False] * 3 + [True] * 2
+        assert df["YearBuilt"].dtype == "int64"
+
+    def test_append_raw_rejects_lossy_casts(
+        self, sample_config_with_temp_paths: DictConfig, sample_dataframe: pd.DataFrame
+    ):
+        """Test that values which do not fit the raw column type are not truncated."""
+        repo = FileSystemDataRepository(sample_config_with_temp_paths)
+        sample_dataframe.iloc[:3].to_csv(repo.raw_path, index=False)
+        before = repo.raw_path.read_bytes()
+
+        rows = sample_dataframe.iloc[3:].astype({"YearBuilt": float})
+        rows.loc[rows.index[0], "YearBuilt"] = 1999.5
+        with pytest.raises(ValueError, match="YearBuilt"):
+            repo.append_raw(rows)
+
+        assert repo.raw_path.read_bytes() == before
+        # Whole floats still fit
+        appended = repo.append_raw(rows.assign(YearBuilt=2001.0))
+        assert len(appended) == 2
+        assert repo.load_raw()["YearBuilt"].tolist()[-2:] == [2001, 2001]
+
+    def test_append_raw_extends_raw_cache(
+        self, sample_config_with_temp_paths: DictConfig, sample_dataframe: pd.DataFrame
+    ):
+        """Test that append_raw writes the new sidecar cache instead of dropping it."""
+        repo = FileSystemDataRepository(sample_config_with_temp_paths)
+        sample_dataframe.iloc[:3].to_csv(repo.raw_path, index=False)
+        old_cache = repo._ensure_raw_cache()
+
+        repo.append_raw(sample_dataframe.iloc[3:])
+
+        assert repo.raw_cache_path().exists()
+        assert not old_cache.exists()
+        cached = repo.load_raw()
+        repo.raw_cache_path().unlink()
+        pd.testing.assert_frame_equal(cached, repo.load_raw())
+
+    def test_upsert_interim_uses_id_index(
+        self, sample_config_with_temp_paths: DictConfig, sample_dataframe: pd.DataFrame
+    ):
+        """Test inserting and replacing interim rows by id."""
+        repo = FileSystemDataRepository(sample_config_with_temp_paths)
+        repo.save_interim(sample_dataframe.iloc[:3], {"step": "test"})
+        assert repo.id_index_path.exists()
+
+        changes = sample_dataframe.iloc[2:].assign(SalePrice=1)
+        counts = repo.upsert_interim(changes)
+
+        assert counts == {"inserted": 2, "updated": 1}
+        df = repo.load_interim().sort_values("Id")
+        assert df["Id"].tolist() == [1, 2, 3, 4, 5]
+        assert df["SalePrice"].tolist() == [208500, 181500, 1, 1, 1]
+
+        metadata = repo.load_metadata()
+        assert metadata["step"] == "test"
+        assert metadata["ingestion"] == counts
+
+        # The index is rebuilt from the data if it goes missing
+        repo.id_index_path.unlink()
+        assert repo.upsert_interim(changes.iloc[:1]) == {"inserted": 0, "updated": 1}
+
+    def test_upsert_interim_writes_deltas(
+        self, sample_config_with_temp_paths: DictConfig, sample_dataframe: pd.DataFrame
+    ):
+        """Test that upserts leave the interim data untouched until the deltas are merged."""
+        config = sample_config_with_temp_paths.copy()
+        config.data.max_interim_deltas = 3
+        repo = FileSystemDataRepository(config)
+        repo.save_interim(sample_dataframe.iloc[:3], {"step": "test"})
+        base_mtime = repo.interim_path.stat().st_mtime_ns
+
+        repo.upsert_interim(sample_dataframe.iloc[2:4].assign(SalePrice=1))
+        repo.upsert_interim(sample_dataframe.iloc[3:].assign(SalePrice=2))
+
+        assert repo.interim_path.stat().st_mtime_ns == base_mtime
+        assert len(list(repo.delta_dir.iterdir())) == 2
+        df = repo.load_interim().sort_values("Id")
+        assert df["Id"].tolist() == [1, 2, 3, 4, 5]
+        assert df["SalePrice"].tolist() == [208500, 181500, 1, 2, 2]
+        assert repo.load_interim(columns=["Id"], filters=[RowFilter("Id", ">", 3)]).shape == (2, 1)
+
+        # The third delta merges everything into the interim data
+        assert repo.upsert_interim(sample_dataframe.iloc[:1].assign(SalePrice=3)) == {
+            "inserted": 0,
+            "updated": 1,
+        }
+        assert not repo.delta_dir.exists()
+        df = repo.load_interim().sort_values("Id")
+        assert df["SalePrice"].tolist() == [3, 181500, 1, 2, 2]
+        assert repo.load_metadata()["step"] == "test"
@@ -0,0 +1,125 @@
+"""
+Unit tests for the process-wide frame cache.
+"""
+
+from omegaconf import DictConfig
+import pandas as pd
+import pytest
+
+from src.adapters.filesystem_repository import FileSystemDataRepository
+from src.adapters.frame_cache import FrameCache, shared_frame_cache
+
+
+def _frame(rows: int) -> pd.DataFrame:
+    return pd.DataFrame({"a": range(rows)}, dtype="int64")
+
+
+class TestFrameCache:
+    """Test FrameCache."""
+
+    def test_hit_returns_cached_frame(self):
+        """Test that a second lookup does not load again."""
+        cache = FrameCache()
+        loads = []
+
+        def load():
+            loads.append(1)
+            return _frame(3)
+
+        first = cache.get_or_load("key", load)
+        second = cache.get_or_load("key", load)
+
+        assert len(loads) == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_returned_frames_do_not_share_columns(self):
+        """Test that adding a column to a returned frame leaves the cache intact."""
+        cache = FrameCache()
+        df = cache.get_or_load("key", lambda: _frame(3))
+        df["b"] = 1
+
+        assert list(cache.get_or_load("key", lambda: _frame(3)).columns) == ["a"]
+
+    def test_returned_frames_do_not_share_values(self):
+        """Test that modifying values of a returned frame in place leaves the cache intact."""
+        cache = FrameCache()
+        df = cache.get_or_load("key", lambda: _frame(3))
+        expected = df.copy()
+        df.iloc[0, 0] = -1
+        df["a"].to_numpy()[1] = -1
+
+        pd.testing.assert_frame_equal(cache.get_or_load("key", lambda: _frame(3)), expected)
+
+    def test_lru_eviction_under_budget(self):
+        """Test that the least recently used entry is evicted to fit the budget."""
+        size = _frame(100).memory_usage(index=True, deep=True).sum()
+        cache = FrameCache(max_bytes=int(2.5 * size))
+
+        cache.get_or_load("a", lambda: _frame(100))
+        cache.get_or_load("b", lambda: _frame(100))
+        cache.get_or_load("a", lambda: _frame(100))  # a is now most recently used
+        cache.get_or_load("c", lambda: _frame(100))
+
+        assert len(cache) == 2
+        assert cache.size_bytes <= cache.max_bytes
+        cache.get_or_load("a", lambda: pytest.fail("a was evicted"))
+
+    def test_frame_larger_than_budget_is_not_cached(self):
+        """Test that an oversized frame is returned but not cached."""
+        cache = FrameCache(max_bytes=10)
+
+        df = cache.get_or_load("key", lambda: _frame(100))
+
+        assert len(df) == 100
+        assert len(cache) == 0
+
+
+class TestRepositoryFrameCache:
+    """Test that repositories share the process-wide frame cache."""
+
+    def test_raw_data_parsed_once_across_repositories(
+        self,
+        sample_config_with_temp_paths: DictConfig,
+        sample_dataframe: pd.DataFrame,
+        monkeypatch,
+    ):
+        """Test that N repositories on the same raw file scan it once."""
+        first = FileSystemDataRepository(sample_config_with_temp_paths)
+        sample_dataframe.to_csv(first.raw_path, index=False)
+
+        scans = []
+        original_scan = FileSystemDataRepository._scan_raw
+
+        def counting_scan(self):
+            scans.append(1)
+            return original_scan(self)
+
+        monkeypatch.setattr(FileSystemDataRepository, "_scan_raw", counting_scan)
+
+        for _ in range(3):
+            repo = FileSystemDataRepository(sample_config_with_temp_paths)
+            pd.testing.assert_frame_equal(repo.load_raw(), sample_dataframe)
+        assert len(scans) == 1
+
+        # Other load options are separate entries
+        FileSystemDataRepository(sample_config_with_temp_paths).load_raw(columns=["Id"])
+        assert len(scans) == 2
+
+        # A changed file is a new entry
+        sample_dataframe.iloc[:2].to_csv(first.raw_path, index=False)
+        assert len(first.load_raw()) == 2
+        assert len(scans) == 3
+
+    def test_frame_cache_disabled(
+        self, sample_config_with_temp_paths: DictConfig, sample_dataframe: pd.DataFrame
+    ):
+        """Test that the cache can be disabled per repository."""
+        config = sample_config_with_temp_paths.copy()
+        config.data.frame_cache = {"enabled": False}
+        repo = FileSystemDataRepository(config)
+
+        assert repo.frame_cache is None
+        assert shared_frame_cache() is FileSystemDataRepository(
+            sample_config_with_temp_paths
+        ).frame_cache
@@ -0,0 +1,130 @@
+"""
+Unit tests for incremental ingestion into the interim store.
+"""
+
+from pathlib import Path
+
+from omegaconf import DictConfig, OmegaConf, open_dict
+import pandas as pd
+import pytest
+
+from src.adapters.factory import create_data_repository
+from src.config.hydra_loader import load_config
+from src.preprocessing.sklearn_pipeline_builder import build_pipeline
+from src.preprocessing.step_cache import StepCache
+from src.services.interim_ingestion import InterimIngestion
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture
+def sales() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Id": [1, 2, 3, 4, 5, 6],
+            "PoolQC": [None] * 6,
+            "FireplaceQu": ["Ex", "Fa", None, "TA", "Gd", None],
+            "LotArea": [8000.0, None, 11250.0, 9550.0, 14260.0, None],
+            "SalePrice": [200000, 250000, 300000, 140000, 250000, 180000],
+        }
+    )
+
+
+def _repository_config(tmp_path: Path, repository_type: str) -> DictConfig:
+    return OmegaConf.create(
+        {
+            "data": {
+                "repository_type": repository_type,
+                "raw_path": str(tmp_path / "raw.csv"),
+                "interim_path": str(tmp_path / "interim.parquet"),
+                "metadata_path": str(tmp_path / "interim_metadata.json"),
+                "sqlite": {"database_path": str(tmp_path / "house_prices.sqlite")},
+            }
+        }
+    )
+
+
+class TestInterimIngestion:
+    @pytest.mark.parametrize("repository_type", ["filesystem", "sqlite"])
+    def test_ingest_reuses_fitted_statistics(
+        self, tmp_path: Path, sales: pd.DataFrame, repository_type: str
+    ):
+        """Test that ingesting new sales matches transforming them with the rebuilt pipeline."""
+        repository = create_data_repository(_repository_config(tmp_path, repository_type))
+        sales.iloc[:4].to_csv(tmp_path / "raw.csv", index=False)
+
+        cfg = load_config(PROJECT_ROOT / "tests" / "config", "experiment")
+        ingestion = InterimIngestion(
+            repository, build_pipeline(cfg), StepCache(tmp_path / "cache")
+        )
+        ingestion.rebuild()
+
+        counts = ingestion.ingest(sales.iloc[2:])
+
+        assert counts == {"appended": 2, "inserted": 2, "updated": 0}
+        interim = repository.load_interim().sort_values("Id").reset_index(drop=True)
+        assert interim["Id"].tolist() == [1, 2, 3, 4, 5, 6]
+
+        # New rows are imputed and scaled with the statistics of the first four rows
+        expected = ingestion.pipeline.transform(repository.load_raw().iloc[4:])
+        pd.testing.assert_frame_equal(
+            interim.iloc[4:].reset_index(drop=True),
+            expected.reset_index(drop=True)[interim.columns],
+            check_dtype=False,
+        )
+
+        # Sales already ingested are skipped
+        assert ingestion.ingest(sales.iloc[4:]) == {"appended": 0, "inserted": 0, "updated": 0}
+
+    def test_ingest_requires_fitted_pipeline(self, tmp_path: Path, sales: pd.DataFrame):
+        """Test that ingesting before any rebuild fails."""
+        repository = create_data_repository(_repository_config(tmp_path, "filesystem"))
+        cfg = load_config(PROJECT_ROOT / "tests" / "config", "experiment")
+        ingestion = InterimIngestion(
+            repository, build_pipeline(cfg), StepCache(tmp_path / "cache")
+        )
+
+        with pytest.raises(ValueError, match="run rebuild"):
+            ingestion.ingest(sales)
+
+    @pytest.mark.parametrize("repository_type", ["filesystem", "sqlite"])
+    def test_ingest_loads_pipeline_of_last_rebuild(
+        self, tmp_path: Path, sales: pd.DataFrame, repository_type: str
+    ):
+        """Test that a new process ingests with the stored pipeline instead of refitting."""
+        config = _repository_config(tmp_path, repository_type)
+        sales.iloc[:4].to_csv(tmp_path / "raw.csv", index=False)
+        cfg = load_config(PROJECT_ROOT / "tests" / "config", "experiment")
+        cache = StepCache(tmp_path / "cache")
+        rebuilt = InterimIngestion(create_data_repository(config), build_pipeline(cfg), cache)
+        rebuilt.rebuild()
+
+        # A later run only has the config, not the fitted pipeline
+        ingestion = InterimIngestion(create_data_repository(config), build_pipeline(cfg), cache)
+        counts = ingestion.ingest(sales.iloc[4:])
+
+        assert counts == {"appended": 2, "inserted": 2, "updated": 0}
+        expected = rebuilt.pipeline.transform(sales.iloc[4:])
+        pd.testing.assert_frame_equal(ingestion.pipeline.transform(sales.iloc[4:]), expected)
+
+    def test_ingest_rejects_stale_pipeline(self, tmp_path: Path, sales: pd.DataFrame):
+        """Test that a changed pipeline config requires a rebuild."""
+        config = _repository_config(tmp_path, "filesystem")
+        sales.iloc[:4].to_csv(tmp_path / "raw.csv", index=False)
+        cfg = load_config(PROJECT_ROOT / "tests" / "config", "experiment")
+        cache = StepCache(tmp_path / "cache")
+        InterimIngestion(create_data_repository(config), build_pipeline(cfg), cache).rebuild()
+
+        with open_dict(cfg):
+            cfg.preprocessing.imputation.numerical_strategy = "mean"
+        ingestion = InterimIngestion(create_data_repository(config), build_pipeline(cfg), cache)
+
+        with pytest.raises(ValueError, match="another pipeline config"):
+            ingestion.ingest(sales.iloc[4:])
+
+        cache.clear()
+        with open_dict(cfg):
+            cfg.preprocessing.imputation.numerical_strategy = "median"
+        ingestion = InterimIngestion(create_data_repository(config), build_pipeline(cfg), cache)
+        with pytest.raises(ValueError, match="missing from the step cache"):
+            ingestion.ingest(sales.iloc[4:])
@@ -0,0 +1,87 @@
+"""Test single-mask outlier removal."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.preprocessing.outliers import OutlierRemover, remove_outliers, uses_statistics
+from src.preprocessing.sklearn_pipeline_builder import RemoveOutliersTransformer
+
+
+@pytest.fixture
+def houses():
+    rng = np.random.default_rng(0)
+    n = 200
+    df = pd.DataFrame(
+        {
+            "GrLivArea": rng.normal(1500, 300, size=n),
+            "LotArea": rng.normal(10000, 1000, size=n),
+            "Street": rng.choice(["Pave", "Grvl"], size=n),
+        }
+    )
+    df.loc[3, "GrLivArea"] = 5000.0
+    df.loc[7, "LotArea"] = 60000.0
+    df.loc[11, "LotArea"] = np.nan
+    return df
+
+
+class TestOutlierRemover:
+    def test_thresholds_match_per_condition_slicing(self, houses):
+        """Test fixed thresholds keep the rows sequential boolean slicing keeps."""
+        config = {"GrLivArea": {"greaterthan": 2000, "lessthan": 1000}, "LotArea": {"lessthan": 0}}
+        expected = houses[houses["GrLivArea"] <= 2000]
+        expected = expected[expected["GrLivArea"] >= 1000]
+        expected = expected[expected["LotArea"] >= 0]
+
+        result = RemoveOutliersTransformer(config).fit_transform(houses)
+
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_iqr_and_zscore(self, houses):
+        """Test statistical detectors remove the planted outliers but keep missing values."""
+        config = {"GrLivArea": {"zscore": 4.0}, "LotArea": {"iqr": 3.0}}
+
+        rows = OutlierRemover(config).fit(houses).inlier_rows(houses)
+
+        assert 3 not in rows
+        assert 7 not in rows
+        assert 11 in rows
+        assert len(rows) == len(houses) - 2
+
+    def test_isolation_forest(self, houses):
+        """Test IsolationForest flags the rows far from the rest."""
+        config = {
+            "isolation_forest": {
+                "columns": ["GrLivArea", "LotArea"],
+                "contamination": 0.01,
+                "n_jobs": 2,
+            }
+        }
+
+        rows = OutlierRemover(config).fit(houses).inlier_rows(houses)
+
+        assert 3 not in rows
+        assert 7 not in rows
+
+    def test_x_and_y_stay_aligned(self, houses):
+        """Test X and y are gathered with the same rows."""
+        X = houses.set_index(np.arange(len(houses)) * 10)
+        y = pd.Series(np.arange(len(houses)), index=X.index)
+
+        X_kept, y_kept = remove_outliers(X, y, {"GrLivArea": {"zscore": 4.0}})
+
+        assert len(X_kept) == len(houses) - 1
+        pd.testing.assert_index_equal(X_kept.index, y_kept.index)
+        _, y_array = remove_outliers(X, y.to_numpy(), {"GrLivArea": {"zscore": 4.0}})
+        np.testing.assert_array_equal(y_array, y_kept.to_numpy())
+
+    def test_unknown_condition_fails(self, houses):
+        """Test a misspelled condition fails noisily."""
+        with pytest.raises(ValueError, match="Unknown outlier condition"):
+            OutlierRemover({"GrLivArea": {"greater_than": 4000}}).fit(houses)
+
+    def test_uses_statistics(self):
+        """Test only fixed thresholds can be pushed down into the repository."""
+        assert not uses_statistics({"GrLivArea": {"greaterthan": 4000}})
+        assert uses_statistics({"GrLivArea": {"iqr": 1.5}})
+        assert uses_statistics({"isolation_forest": {}})
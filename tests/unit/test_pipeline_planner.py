@@ -0,0 +1,139 @@
+"""Test step reordering and lineage pruning of the preprocessing pipeline."""
+
+from pathlib import Path
+
+import numpy as np
+from omegaconf import open_dict
+import pandas as pd
+import pytest
+
+from src.config.hydra_loader import load_config
+from src.preprocessing.array_pipeline import ArrayPipeline
+from src.preprocessing.pipeline_planner import prune_pipeline
+from src.preprocessing.sklearn_pipeline_builder import build_pipeline, plan_step_order
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture
+def houses():
+    rng = np.random.default_rng(0)
+    n = 80
+    price = rng.integers(100000, 400000, size=n)
+    return pd.DataFrame(
+        {
+            "Id": np.arange(n),
+            "PoolQC": ["Ex"] * n,
+            "FireplaceQu": rng.choice(["Ex", "TA", "Fa", None], size=n),
+            "Street": rng.choice(["Pave", "Grvl"], size=n),
+            "LotArea": rng.integers(5000, 15000, size=n).astype(float),
+            "GrLivArea": price / 100 + rng.normal(0, 50, size=n),
+            "Noise": rng.normal(size=n),
+            "SalePrice": price,
+        }
+    ).assign(LotArea=lambda df: df["LotArea"].mask(df.index % 7 == 0))
+
+
+@pytest.fixture
+def cfg():
+    cfg = load_config(PROJECT_ROOT / "tests" / "config", "experiment")
+    with open_dict(cfg):
+        cfg.preprocessing.feature_engineering = {
+            "polynomial_features": [{"column": "GrLivArea", "degrees": [2]}],
+            "log_transforms": ["LotArea", "Noise"],
+            "interactions": [{"name": "Area_x_Lot", "columns": ["GrLivArea", "LotArea"]}],
+        }
+        cfg.preprocessing.feature_selection = {
+            "method": "correlation",
+            "target_column": "SalePrice",
+            "params": {"threshold": 0.5},
+            "exclude_columns": ["Id"],
+        }
+        cfg.preprocessing.pipeline = [
+            {"step": "categorical_transforms"},
+            {"step": "imputation"},
+            {"step": "drop_columns"},
+            {"step": "feature_engineering"},
+            {"step": "feature_selection"},
+            {"step": "scaling"},
+        ]
+    return cfg
+
+
+class TestPlanStepOrder:
+    def test_drop_columns_moves_first(self, cfg):
+        """Test drop_columns moves ahead of column-wise steps."""
+        assert plan_step_order(cfg.preprocessing)[:3] == [
+            "drop_columns",
+            "categorical_transforms",
+            "imputation",
+        ]
+
+    def test_drop_columns_stays_after_features_reading_them(self, cfg):
+        """Test drop_columns does not move ahead of a step using a dropped column."""
+        with open_dict(cfg):
+            cfg.preprocessing.drop_columns = ["Noise"]
+            cfg.preprocessing.pipeline = [
+                {"step": "imputation"},
+                {"step": "feature_engineering"},
+                {"step": "drop_columns"},
+            ]
+
+        assert plan_step_order(cfg.preprocessing) == [
+            "imputation",
+            "feature_engineering",
+            "drop_columns",
+        ]
+
+    def test_planned_pipeline_matches(self, cfg, houses):
+        """Test the reordered pipeline gives the same output."""
+        expected = build_pipeline(cfg).fit_transform(houses)
+        with open_dict(cfg):
+            cfg.preprocessing.plan = True
+
+        pipeline = build_pipeline(cfg)
+
+        assert pipeline.steps[0][0] == "drop_columns"
+        pd.testing.assert_frame_equal(
+            pipeline.fit_transform(houses), expected, check_like=True, atol=1e-9
+        )
+
+
+class TestPrunePipeline:
+    def test_pruned_pipeline_matches(self, cfg, houses):
+        """Test pruning skips deselected columns without changing the output."""
+        pipeline = build_pipeline(cfg).fit(houses)
+        expected = pipeline.transform(houses)
+
+        plan = prune_pipeline(pipeline, houses)
+
+        pd.testing.assert_frame_equal(pipeline.transform(houses), expected)
+        skipped = {col for step in plan.steps for col in step.skipped}
+        assert "Noise_log" in skipped
+        assert "Noise" in skipped
+        assert "GrLivArea" not in skipped
+        assert 0 < plan.saved_cells < plan.computed_cells
+        assert "feature_engineering" in str(plan)
+
+    def test_array_mode_after_pruning(self, cfg, houses):
+        """Test array mode follows the pruned steps."""
+        pipeline = build_pipeline(cfg).fit(houses)
+        expected = pipeline.transform(houses).select_dtypes(include=["number"]).fillna(0)
+
+        prune_pipeline(pipeline, houses)
+        arrays = ArrayPipeline(pipeline, houses)
+
+        assert arrays.feature_names_out_ == list(expected.columns)
+        np.testing.assert_allclose(
+            arrays.transform(houses), expected.to_numpy(dtype=np.float64), atol=1e-9
+        )
+
+    def test_without_selection_nothing_is_pruned(self, houses):
+        """Test every column counts as used when nothing downstream selects."""
+        cfg = load_config(PROJECT_ROOT / "tests" / "config", "experiment")
+        pipeline = build_pipeline(cfg).fit(houses)
+
+        plan = prune_pipeline(pipeline, houses)
+
+        assert plan.steps == []
+        assert plan.saved_cells == 0
@@ -0,0 +1,122 @@
+"""Test the Polars preprocessing backend against the pandas backend."""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+
+from src.config.hydra_loader import load_config
+from src.preprocessing.feature_engineering import FeatureEngineeringTransformer
+from src.preprocessing.feature_selection import FeatureSelectionTransformer
+from src.preprocessing.polars_pipeline import (
+    PolarsFeatureEngineeringTransformer,
+    PolarsFeatureSelectionTransformer,
+    to_model_matrix,
+)
+from src.preprocessing.sklearn_pipeline_builder import build_pipeline
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture
+def houses():
+    rng = np.random.default_rng(0)
+    n = 50
+    return pd.DataFrame(
+        {
+            "Id": np.arange(n),
+            "PoolQC": ["Ex"] * n,
+            "FireplaceQu": rng.choice(["Ex", "TA", "Fa", None], size=n),
+            "LotArea": rng.integers(5000, 15000, size=n).astype(float),
+            "GrLivArea": rng.integers(800, 3000, size=n),
+            "SalePrice": rng.integers(100000, 400000, size=n),
+        }
+    ).assign(LotArea=lambda df: df["LotArea"].mask(df.index % 7 == 0))
+
+
+class TestPolarsPipeline:
+    def test_matches_pandas_backend(self, houses):
+        """Test the Polars backend produces the same values as the pandas backend."""
+        cfg = load_config(PROJECT_ROOT / "tests" / "config", "experiment")
+        expected = build_pipeline(cfg).fit_transform(houses)
+
+        cfg.preprocessing.backend = "polars"
+        result = build_pipeline(cfg).fit_transform(pl.from_pandas(houses))
+
+        assert isinstance(result, pl.LazyFrame)
+        matrix, names = to_model_matrix(result)
+        expected = expected[names].to_numpy(dtype=np.float64)
+        np.testing.assert_allclose(matrix, expected, rtol=1e-9, atol=1e-9)
+
+    def test_unknown_backend_raises(self):
+        """Test an unknown backend fails noisily."""
+        cfg = load_config(PROJECT_ROOT / "tests" / "config", "experiment")
+        cfg.preprocessing.backend = "spark"
+
+        with pytest.raises(ValueError, match="Unknown backend"):
+            build_pipeline(cfg)
+
+    def test_feature_engineering_matches_pandas(self, houses):
+        """Test engineered features match the pandas transformer, names included."""
+        config = {
+            "polynomial_features": [{"column": "GrLivArea", "degrees": [2, 3]}],
+            "binary_indicators": [
+                {
+                    "name": "BigLot",
+                    "condition": {"column": "LotArea", "operator": ">", "value": 10000},
+                }
+            ],
+            "log_transforms": ["LotArea"],
+            "interactions": [{"name": "Area_x_Lot", "columns": ["GrLivArea", "LotArea"]}],
+        }
+        df = houses.drop(columns=["PoolQC", "FireplaceQu"])
+
+        expected = FeatureEngineeringTransformer(config).fit_transform(df)
+        result = PolarsFeatureEngineeringTransformer(config).fit_transform(df.pipe(pl.from_pandas))
+        result = result.collect().to_pandas()
+
+        assert list(result.columns) == list(expected.columns)
+        np.testing.assert_allclose(
+            result.to_numpy(dtype=np.float64), expected.to_numpy(dtype=np.float64)
+        )
+
+    def test_feature_selection_matches_pandas(self, houses):
+        """Test correlation-based selection keeps the same columns."""
+        config = {
+            "method": "correlation",
+            "target_column": "SalePrice",
+            "params": {"threshold": 0.1},
+            "exclude_columns": ["Id"],
+        }
+        df = houses.drop(columns=["PoolQC", "FireplaceQu"]).fillna(0)
+
+        expected = FeatureSelectionTransformer(config).fit(df).selected_features_
+        result = PolarsFeatureSelectionTransformer(config).fit(pl.from_pandas(df))
+
+        assert set(result.selected_features_) == set(expected)
+
+    def test_fit_transform_runs_upstream_steps_once(self, houses):
+        """Test each data-dependent step collects its input once instead of re-running it."""
+        cfg = load_config(PROJECT_ROOT / "tests" / "config", "experiment")
+        cfg.preprocessing.backend = "polars"
+        executions = []
+
+        def count(values: pl.Series) -> pl.Series:
+            executions.append(len(values))
+            return values
+
+        lf = (
+            pl.from_pandas(houses)
+            .lazy()
+            .with_columns(pl.col("GrLivArea").map_batches(count, return_dtype=pl.Int64))
+        )
+        pipeline = build_pipeline(cfg)
+        result = pipeline.fit_transform(lf)
+
+        assert len(executions) == 1
+        to_model_matrix(result)
+        assert len(executions) == 1
+        expected, _ = to_model_matrix(pipeline.transform(pl.from_pandas(houses)))
+        np.testing.assert_allclose(to_model_matrix(result)[0], expected)
@@ -2,10 +2,22 @@
 
 from pathlib import Path
 
+import numpy as np
+from omegaconf import open_dict
 import pandas as pd
+import pytest
 
 from src.config.hydra_loader import load_config
-from src.preprocessing.sklearn_pipeline_builder import build_pipeline
+from src.domain.models.data_models import RowFilter
+from src.preprocessing.sklearn_pipeline_builder import (
+    CategoricalMapTransformer,
+    ImputationTransformer,
+    ScalingTransformer,
+    build_pipeline,
+    outlier_filters,
+    partial_fit_pipeline,
+    transform_batches,
+)
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 
@@ -92,3 +104,240 @@ class TestSklearnPipelineBuilder:
         assert abs(df_transformed["YearBuilt"].mean()) < 1e-10
         assert df_transformed["Id"].mean() == 2.5  # Original scale: (1+2+3+4)/4
         assert df_transformed["SalePrice"].mean() == 256250  # Original scale
+
+    def test_outlier_filters_keep_inliers(self):
+        """Test translating remove_outliers config into row filters."""
+        filters = outlier_filters({"GrLivArea": {"greaterthan": 4000, "lessthan": 300}})
+
+        assert filters == [
+            RowFilter("GrLivArea", "<=", 4000),
+            RowFilter("GrLivArea", ">=", 300),
+        ]
+
+    def test_transform_batches_matches_full_transform(self):
+        """Test that a fitted pipeline gives the same rows batch by batch."""
+        config_dir = PROJECT_ROOT / "tests" / "config"
+        cfg = load_config(config_dir, "experiment")
+        df = pd.DataFrame(
+            {
+                "Id": [1, 2, 3, 4, 5],
+                "FireplaceQu": ["Ex", "Fa", None, "Gd", "TA"],
+                "LotArea": [8000.0, None, 11250.0, 9600.0, 7000.0],
+                "SalePrice": [200000, 250000, 300000, 275000, 150000],
+            }
+        )
+        pipeline = build_pipeline(cfg).fit(df)
+
+        batches = transform_batches(pipeline, [df.iloc[:2], df.iloc[2:]])
+
+        pd.testing.assert_frame_equal(pd.concat(batches), pipeline.transform(df))
+
+    def test_inplace_pipeline_matches_copying_pipeline(self):
+        """Test inplace mode gives the same output without touching the caller's frame."""
+        config_dir = PROJECT_ROOT / "tests" / "config"
+        cfg = load_config(config_dir, "experiment")
+        df = pd.DataFrame(
+            {
+                "Id": [1, 2, 3, 4],
+                "FireplaceQu": ["Ex", "Fa", None, "Gd"],
+                "LotArea": [8000.0, None, 11250.0, 9600.0],
+                "SalePrice": [200000, 250000, 300000, 275000],
+            }
+        )
+        original = df.copy()
+        expected = build_pipeline(cfg).fit_transform(df)
+
+        with open_dict(cfg):
+            cfg.preprocessing.inplace = True
+        pipeline = build_pipeline(cfg)
+        result = pipeline.fit_transform(df)
+
+        pd.testing.assert_frame_equal(result, expected)
+        pd.testing.assert_frame_equal(df, original)
+        # drop_columns returns a new frame, so every later step may mutate it
+        assert [step.copy for _, step in pipeline.steps[1:]] == [False, False, False]
+
+    def test_inplace_first_step_still_copies(self):
+        """Test a mutating first step copies the caller's frame in inplace mode."""
+        config_dir = PROJECT_ROOT / "tests" / "config"
+        cfg = load_config(config_dir, "experiment")
+        with open_dict(cfg):
+            cfg.preprocessing.inplace = True
+            cfg.preprocessing.fuse_steps = False
+            cfg.preprocessing.pipeline = [{"step": "imputation"}, {"step": "scaling"}]
+        df = pd.DataFrame({"Id": [1, 2, 3], "LotArea": [8000.0, None, 11250.0]})
+        original = df.copy()
+
+        pipeline = build_pipeline(cfg)
+        pipeline.fit_transform(df)
+
+        assert [step.copy for _, step in pipeline.steps] == [True, False]
+        pd.testing.assert_frame_equal(df, original)
+
+    def test_inplace_steps_write_into_existing_block(self):
+        """Test copy=False imputes and scales float columns in the frame's own block."""
+        df = pd.DataFrame(
+            {
+                "LotArea": [8000.0, np.nan, 11250.0, 9600.0],
+                "GrLivArea": [1500.0, 1800.0, np.nan, 1200.0],
+                "YearBuilt": [1990, 2000, 2005, 1975],
+            }
+        )
+        block = df["LotArea"].to_numpy()
+        steps = [
+            ImputationTransformer("median", "most_frequent", None, copy=False),
+            ScalingTransformer("standard", None, copy=False),
+        ]
+        copying = [
+            ImputationTransformer("median", "most_frequent", None),
+            ScalingTransformer("standard", None),
+        ]
+        expected = copying[1].fit_transform(copying[0].fit_transform(df))
+
+        result = df
+        for step in steps:
+            result = step.fit_transform(result)
+
+        assert result is df
+        assert np.shares_memory(df["LotArea"].to_numpy(), block)
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_categorical_map_unseen_and_missing_values(self):
+        """Test unseen categories and missing values map to null_value."""
+        transformer = CategoricalMapTransformer(
+            {"FireplaceQu": {"mapping": {"Ex": 1, "TA": 1, "Fa": 0}, "null_value": -1}}
+        )
+        df = pd.DataFrame({"FireplaceQu": ["Ex", "Fa", None, "Unknown", "TA"]})
+
+        result = transformer.fit_transform(df)
+
+        assert result["FireplaceQu"].tolist() == [1, 0, -1, -1, 1]
+
+    def test_categorical_map_null_value_is_a_category(self):
+        """Test missing values are mapped as null_value while unseen values stay null_value."""
+        transformer = CategoricalMapTransformer(
+            {"Fence": {"mapping": {"GdPrv": 2, "MnPrv": 1, "NA": 0}, "null_value": "NA"}}
+        )
+        df = pd.DataFrame({"Fence": ["GdPrv", None, "Unknown", "NA", "MnPrv"]})
+        expected = df["Fence"].fillna("NA").map(transformer.mappings["Fence"]["mapping"])
+
+        result = transformer.fit_transform(df)
+
+        assert result["Fence"].tolist() == [2, 0, "NA", 0, 1]
+        assert result["Fence"].tolist() == expected.fillna("NA").tolist()
+
+    def test_categorical_map_categorical_dtype(self):
+        """Test pandas categorical columns are mapped by value, not by their own codes."""
+        transformer = CategoricalMapTransformer({"Street": {"mapping": {"Pave": 1, "Grvl": 0}}})
+        df = pd.DataFrame({"Street": pd.Categorical(["Grvl", "Pave", None, "Grvl"])})
+
+        result = transformer.fit_transform(df)
+
+        assert result["Street"].tolist() == [0, 1, 0, 0]
+
+    def test_categorical_map_groups_columns_with_the_same_categories(self):
+        """Test quality columns sharing a scale are encoded as one group."""
+        quality = {"Ex": 5, "Gd": 4, "TA": 3, "Fa": 2, "Po": 1}
+        columns = ["ExterQual", "KitchenQual", "BsmtQual", "GarageQual"]
+        mappings = {col: {"mapping": quality, "null_value": 0} for col in columns}
+        mappings["CentralAir"] = {"mapping": {"Y": 1, "N": 0}}
+        df = pd.DataFrame(
+            {
+                "ExterQual": ["Ex", "TA", "Gd"],
+                "KitchenQual": ["Gd", None, "Po"],
+                "BsmtQual": ["Fa", "TA", None],
+                "GarageQual": ["TA", "TA", "Ex"],
+                "CentralAir": ["Y", "N", "Y"],
+                "LotArea": [8000, 9600, 11250],
+            }
+        )
+
+        transformer = CategoricalMapTransformer(mappings).fit(df)
+        result = transformer.transform(df)
+
+        assert [group[0] for group in transformer.groups_] == [columns, ["CentralAir"]]
+        assert result[columns].to_numpy().tolist() == [[5, 4, 2, 3], [3, 0, 3, 3], [4, 1, 0, 5]]
+        assert result["CentralAir"].tolist() == [1, 0, 1]
+        assert result["LotArea"].tolist() == [8000, 9600, 11250]
+
+    def test_imputation_and_scaling_are_fused(self):
+        """Test the opt-in fused step gives the same output as separate imputation and scaling."""
+        config_dir = PROJECT_ROOT / "tests" / "config"
+        cfg = load_config(config_dir, "experiment")
+        df = pd.DataFrame(
+            {
+                "Id": [1, 2, 3, 4, 5],
+                "FireplaceQu": ["Ex", "Fa", None, "Gd", "TA"],
+                "Street": ["Pave", None, "Grvl", "Pave", "Pave"],
+                "LotArea": [8000.0, None, 11250.0, 9600.0, 7000.0],
+                "YearBuilt": [2000, 2000, 2000, 2000, 2000],
+                "SalePrice": [200000, 250000, 300000, 275000, 150000],
+            }
+        )
+
+        # Fusion is off by default
+        separate = build_pipeline(cfg)
+        expected = separate.fit_transform(df)
+
+        with open_dict(cfg):
+            cfg.preprocessing.fuse_steps = True
+        fused = build_pipeline(cfg)
+        result = fused.fit_transform(df)
+
+        assert [name for name, _ in fused.steps] == [
+            "drop_columns",
+            "categorical_transforms",
+            "imputation_scaling",
+        ]
+        assert [name for name, _ in separate.steps][-2:] == ["imputation", "scaling"]
+        pd.testing.assert_frame_equal(result, expected, check_exact=False, atol=1e-12)
+
+    def test_unsupported_strategy_is_not_fused(self):
+        """Test strategies the fused step does not compute keep the separate steps."""
+        config_dir = PROJECT_ROOT / "tests" / "config"
+        cfg = load_config(config_dir, "experiment")
+        cfg.preprocessing.imputation.numerical_strategy = "most_frequent"
+
+        pipeline = build_pipeline(cfg)
+
+        assert [name for name, _ in pipeline.steps][-2:] == ["imputation", "scaling"]
+
+    def test_partial_fit_pipeline_matches_fit(self):
+        """Test fitting batch by batch gives the same pipeline as fitting all rows."""
+        config_dir = PROJECT_ROOT / "tests" / "config"
+        rng = np.random.default_rng(0)
+        n = 200
+        df = pd.DataFrame(
+            {
+                "Id": np.arange(n),
+                "FireplaceQu": rng.choice(["Ex", "TA", "Fa", None], size=n),
+                "Street": rng.choice(["Pave", "Grvl", None], size=n),
+                "LotArea": rng.normal(10000, 2000, size=n),
+                "SalePrice": rng.integers(100000, 400000, size=n),
+            }
+        ).assign(LotArea=lambda df: df["LotArea"].mask(df.index % 7 == 0))
+
+        for fuse_steps in (True, False):
+            cfg = load_config(config_dir, "experiment")
+            with open_dict(cfg):
+                cfg.preprocessing.fuse_steps = fuse_steps
+            expected = build_pipeline(cfg).fit(df).transform(df)
+
+            passes = []
+
+            def batches():
+                passes.append(1)
+                return (df.iloc[start : start + 60] for start in range(0, n, 60))
+
+            pipeline = partial_fit_pipeline(build_pipeline(cfg), batches)
+
+            pd.testing.assert_frame_equal(pipeline.transform(df), expected, check_exact=False)
+            # One pass per data-dependent step: imputation and scaling, or the fused step
+            assert len(passes) == (1 if fuse_steps else 2)
+
+    def test_partial_fit_unsupported_strategy_raises(self):
+        """Test strategies without a mergeable statistic fail noisily."""
+        transformer = ImputationTransformer("constant", "mode", [])
+
+        with pytest.raises(ValueError, match="numerical_strategy"):
+            transformer.partial_fit(pd.DataFrame({"LotArea": [1.0, None]}))
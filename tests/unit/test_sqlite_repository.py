@@ -0,0 +1,173 @@
+"""
+Unit tests for SQLiteDataRepository adapter.
+"""
+
+from pathlib import Path
+
+from omegaconf import DictConfig, OmegaConf
+import pandas as pd
+import pytest
+
+from src.adapters.filesystem_repository import FileSystemDataRepository
+from src.adapters.sqlite_repository import SQLiteDataRepository
+from src.domain.models.data_models import Aggregation, RowFilter
+
+
+@pytest.fixture
+def sqlite_config(tmp_path: Path) -> DictConfig:
+    return OmegaConf.create(
+        {
+            "data": {
+                "repository_type": "sqlite",
+                "raw_path": str(tmp_path / "raw.csv"),
+                "sqlite": {"database_path": str(tmp_path / "house_prices.sqlite")},
+            }
+        }
+    )
+
+
+class TestSQLiteDataRepository:
+    """Test SQLiteDataRepository adapter."""
+
+    def test_load_raw_imports_csv(self, sqlite_config: DictConfig, sample_dataframe: pd.DataFrame):
+        """Test that the raw CSV is imported into the raw table on first load."""
+        repo = SQLiteDataRepository(sqlite_config)
+        sample_dataframe.to_csv(repo.raw_path, index=False)
+
+        df = repo.load_raw()
+        pd.testing.assert_frame_equal(df, sample_dataframe)
+
+        # Later loads read the table, not the CSV
+        repo.raw_path.unlink()
+        pd.testing.assert_frame_equal(repo.load_raw(), sample_dataframe)
+
+    def test_missing_raw_table_and_csv_raises(self, sqlite_config: DictConfig):
+        """Test a clear error without raw table and CSV."""
+        repo = SQLiteDataRepository(sqlite_config)
+
+        with pytest.raises(FileNotFoundError, match="No table 'raw'"):
+            repo.load_raw()
+
+    def test_load_raw_with_projection_and_filters(
+        self, sqlite_config: DictConfig, sample_dataframe: pd.DataFrame
+    ):
+        """Test that projection and filters are applied in SQL."""
+        repo = SQLiteDataRepository(sqlite_config)
+        sample_dataframe.to_csv(repo.raw_path, index=False)
+
+        df = repo.load_raw(
+            exclude_columns=["MSSubClass"],
+            filters=[RowFilter("GrLivArea", "<=", 2000), RowFilter("Missing", ">", 0)],
+        )
+
+        expected = sample_dataframe[sample_dataframe["GrLivArea"] <= 2000].drop(
+            columns=["MSSubClass"]
+        )
+        pd.testing.assert_frame_equal(df, expected.reset_index(drop=True))
+
+        df_polars = repo.load_raw_polars(columns=["Id"], filters=[RowFilter("Id", "==", 3)])
+        assert df_polars["Id"].to_list() == [3]
+
+    def test_iter_raw_batches(self, sqlite_config: DictConfig, sample_dataframe: pd.DataFrame):
+        """Test streaming the raw table in bounded batches."""
+        repo = SQLiteDataRepository(sqlite_config)
+        sample_dataframe.to_csv(repo.raw_path, index=False)
+
+        batches = list(repo.iter_raw_batches(batch_rows=2, columns=["Id", "SalePrice"]))
+
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        pd.testing.assert_frame_equal(
+            pd.concat(batches, ignore_index=True), sample_dataframe[["Id", "SalePrice"]]
+        )
+
+    def test_save_and_load_interim(self, sqlite_config: DictConfig):
+        """Test saving and loading interim data and metadata, with nulls and strings."""
+        repo = SQLiteDataRepository(sqlite_config)
+        df = pd.DataFrame(
+            {
+                "Id": [1, 2, 3],
+                "LotFrontage": [65.0, None, 80.0],
+                "FireplaceQu": ["Gd", None, "TA"],
+            }
+        )
+
+        repo.save_interim(df, {"step": "test"})
+        repo.save_interim(df.iloc[:2], {"step": "overwrite"})
+
+        pd.testing.assert_frame_equal(repo.load_interim(), df.iloc[:2])
+        assert repo.load_metadata() == {"step": "overwrite"}
+        assert list(repo.iter_interim_batches(filters=[RowFilter("Id", ">", 5)])) == []
+
+    def test_load_metadata_without_save_raises(self, sqlite_config: DictConfig):
+        """Test that metadata of a missing interim table raises KeyError."""
+        with pytest.raises(KeyError):
+            SQLiteDataRepository(sqlite_config).load_metadata()
+
+    def test_aggregate_matches_filesystem(
+        self, sqlite_config: DictConfig, sample_dataframe: pd.DataFrame, tmp_path: Path
+    ):
+        """Test that SQL aggregation matches the Polars aggregation of the filesystem adapter."""
+        sqlite_repo = SQLiteDataRepository(sqlite_config)
+        sample_dataframe.to_csv(sqlite_repo.raw_path, index=False)
+        fs_repo = FileSystemDataRepository(
+            OmegaConf.create({"data": {"raw_path": str(sqlite_repo.raw_path)}})
+        )
+
+        aggregations = [
+            Aggregation("SalePrice", "mean"),
+            Aggregation("SalePrice", "max"),
+            Aggregation("Id", "count", alias="Count"),
+        ]
+        filters = [RowFilter("GrLivArea", "<=", 2000)]
+
+        df_sql = sqlite_repo.aggregate(aggregations, group_by=["OverallQual"], filters=filters)
+        df_fs = fs_repo.aggregate(aggregations, group_by=["OverallQual"], filters=filters)
+
+        assert list(df_sql.columns) == ["OverallQual", "SalePrice_mean", "SalePrice_max", "Count"]
+        assert df_sql["Count"].tolist() == [1, 3]
+        pd.testing.assert_frame_equal(df_sql, df_fs, check_dtype=False)
+
+    def test_connection_is_pooled(self, sqlite_config: DictConfig):
+        """Test that repositories on the same database share one connection."""
+        first = SQLiteDataRepository(sqlite_config)
+        second = SQLiteDataRepository(sqlite_config)
+
+        assert first.connection is second.connection
+
+    def test_append_raw_and_upsert_interim(
+        self, sqlite_config: DictConfig, sample_dataframe: pd.DataFrame
+    ):
+        """Test incremental ingestion by id in the database."""
+        repo = SQLiteDataRepository(sqlite_config)
+        sample_dataframe.iloc[:3].to_csv(repo.raw_path, index=False)
+
+        appended = repo.append_raw(sample_dataframe.iloc[2:])
+        assert appended["Id"].tolist() == [4, 5]
+        pd.testing.assert_frame_equal(repo.load_raw(), sample_dataframe)
+
+        assert repo.upsert_interim(sample_dataframe.iloc[:3]) == {"inserted": 3, "updated": 0}
+        counts = repo.upsert_interim(sample_dataframe.iloc[2:].assign(SalePrice=1))
+
+        assert counts == {"inserted": 2, "updated": 1}
+        df = repo.load_interim().sort_values("Id")
+        assert df["SalePrice"].tolist() == [208500, 181500, 1, 1, 1]
+        assert repo.load_metadata()["ingestion"] == counts
+
+    def test_existing_ids_spans_several_queries(self, sqlite_config: DictConfig):
+        """Test the id lookup over more ids than one IN query binds."""
+        repo = SQLiteDataRepository(sqlite_config)
+        repo.save_interim(pd.DataFrame({"Id": range(0, 3000, 2)}), {})
+
+        existing = repo._existing_ids("interim", list(range(3000)))
+
+        assert sorted(existing) == list(range(0, 3000, 2))
+
+    def test_identifiers_are_quoted(self, sqlite_config: DictConfig):
+        """Test column names are quoted, not interpolated as SQL."""
+        repo = SQLiteDataRepository(sqlite_config)
+        column = 'Price" FROM interim; --'
+        repo.save_interim(pd.DataFrame({"Id": [1, 2], column: [1.0, 2.0]}), {})
+
+        df = repo.load_interim(columns=[column], filters=[RowFilter(column, ">", 1.5)])
+
+        assert df[column].tolist() == [2.0]
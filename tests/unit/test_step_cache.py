@@ -0,0 +1,93 @@
+"""Test the on-disk cache of fitted pipeline steps."""
+
+from pathlib import Path
+
+import numpy as np
+from omegaconf import open_dict
+import pandas as pd
+import pytest
+
+from src.config.hydra_loader import load_config
+from src.preprocessing.sklearn_pipeline_builder import build_pipeline
+from src.preprocessing.step_cache import StepCache, fit_transform_cached, step_keys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture
+def houses():
+    rng = np.random.default_rng(0)
+    n = 50
+    return pd.DataFrame(
+        {
+            "Id": np.arange(n),
+            "PoolQC": ["Ex"] * n,
+            "FireplaceQu": rng.choice(["Ex", "TA", "Fa", None], size=n),
+            "Street": rng.choice(["Pave", "Grvl"], size=n),
+            "LotArea": rng.integers(5000, 15000, size=n).astype(float),
+            "GrLivArea": rng.integers(800, 3000, size=n),
+            "SalePrice": rng.integers(100000, 400000, size=n),
+        }
+    ).assign(LotArea=lambda df: df["LotArea"].mask(df.index % 7 == 0))
+
+
+@pytest.fixture
+def cfg():
+    return load_config(PROJECT_ROOT / "tests" / "config", "experiment")
+
+
+class TestStepCache:
+    def test_second_fit_loads_all_steps(self, cfg, houses, tmp_path):
+        """Test an unchanged pipeline is loaded instead of refitted."""
+        original = houses.copy()
+        expected = build_pipeline(cfg).fit_transform(houses)
+
+        first = fit_transform_cached(build_pipeline(cfg), houses, StepCache(tmp_path))
+        cache = StepCache(tmp_path)
+        pipeline = build_pipeline(cfg)
+        second = fit_transform_cached(pipeline, houses, cache)
+
+        pd.testing.assert_frame_equal(first, expected)
+        pd.testing.assert_frame_equal(second, expected)
+        pd.testing.assert_frame_equal(pipeline.transform(houses), expected)
+        pd.testing.assert_frame_equal(houses, original)
+        assert cache.hits == len(pipeline.steps)
+        assert cache.misses == 0
+
+    def test_changed_last_step_reuses_prefix(self, cfg, houses, tmp_path):
+        """Test only steps after a config change are refitted."""
+        cache = StepCache(tmp_path)
+        fit_transform_cached(build_pipeline(cfg), houses, cache)
+
+        with open_dict(cfg):
+            cfg.preprocessing.scaling.exclude_columns = ["Id", "SalePrice", "LotArea"]
+        cache = StepCache(tmp_path)
+        pipeline = build_pipeline(cfg)
+        result = fit_transform_cached(pipeline, houses, cache)
+
+        pd.testing.assert_frame_equal(result, build_pipeline(cfg).fit_transform(houses))
+        assert cache.misses == 1
+        assert cache.hits == len(pipeline.steps) - 1
+
+    def test_keys_depend_on_data(self, cfg, houses):
+        """Test the same pipeline on other rows gets other keys."""
+        pipeline = build_pipeline(cfg)
+
+        assert step_keys(pipeline, houses) == step_keys(pipeline, houses.copy())
+        assert not set(step_keys(pipeline, houses)) & set(step_keys(pipeline, houses.iloc[1:]))
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Test the directory is kept within max_bytes, oldest entries first."""
+        cache = StepCache(tmp_path)
+        frame = pd.DataFrame({"a": np.arange(100, dtype=np.float64)})
+        cache.save("first", None, frame)
+        cache.max_bytes = int(2.5 * cache.size_bytes)
+
+        cache.save("second", None, frame)
+        cache.load("first")
+        cache.save("third", None, frame)
+
+        assert cache.size_bytes <= cache.max_bytes
+        assert "first" in cache
+        assert "second" not in cache
+        assert "third" in cache
@@ -0,0 +1,93 @@
+"""Test mergeable column statistics against single-pass numpy and pandas results."""
+
+import numpy as np
+import pandas as pd
+
+from src.preprocessing.streaming_stats import (
+    QuantileSummary,
+    RunningCorrelation,
+    RunningMoments,
+    TargetStatistics,
+    ValueCounts,
+)
+
+
+def make_block(rows: int = 1000, columns: int = 4, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    block = rng.normal(loc=100, scale=20, size=(rows, columns))
+    block[rng.random(size=block.shape) < 0.1] = np.nan
+    return block
+
+
+class TestStreamingStats:
+    def test_running_moments_match_single_pass(self):
+        block = make_block()
+        moments = RunningMoments(block.shape[1])
+
+        for batch in np.array_split(block, 7):
+            moments.update(batch)
+
+        np.testing.assert_allclose(moments.mean, np.nanmean(block, axis=0))
+        np.testing.assert_allclose(moments.var(ddof=1), np.nanvar(block, axis=0, ddof=1))
+        assert moments.count.tolist() == (~np.isnan(block)).sum(axis=0).tolist()
+
+    def test_running_correlation_matches_corrwith(self):
+        block = make_block()
+        target = block[:, 0] * 2 + np.random.default_rng(1).normal(size=len(block))
+        correlation = RunningCorrelation(block.shape[1])
+
+        for batch, target_batch in zip(np.array_split(block, 5), np.array_split(target, 5)):
+            correlation.update(batch, target_batch)
+
+        expected = pd.DataFrame(block).corrwith(pd.Series(target)).to_numpy()
+        np.testing.assert_allclose(correlation.correlation(), expected)
+
+    def test_target_statistics_merge_shards_exactly(self):
+        block = make_block()
+        target = block[:, 1] - block[:, 2] + np.random.default_rng(2).normal(size=len(block))
+        target[::13] = np.nan
+        shards = [TargetStatistics(block.shape[1]) for _ in range(3)]
+
+        for shard, batch, target_batch in zip(
+            shards, np.array_split(block, 3), np.array_split(target, 3)
+        ):
+            shard.update(batch, target_batch)
+        merged = shards[0]
+        merged.merge(shards[1])
+        merged.merge(shards[2])
+
+        expected = pd.DataFrame(block).corrwith(pd.Series(target)).to_numpy()
+        np.testing.assert_allclose(merged.correlation(), expected)
+        np.testing.assert_allclose(merged.var(ddof=1), np.nanvar(block, axis=0, ddof=1))
+
+    def test_quantile_summary_is_exact_for_small_data(self):
+        block = make_block(rows=200)
+        summary = QuantileSummary(block.shape[1], size=100)
+
+        for batch in np.array_split(block, 4):
+            summary.update(batch)
+
+        np.testing.assert_allclose(summary.quantile(0.5), np.nanmedian(block, axis=0))
+        assert (summary.rank_error == 0).all()
+
+    def test_quantile_summary_respects_error_bound(self):
+        block = make_block(rows=50_000)
+        summary = QuantileSummary(block.shape[1], size=200)
+
+        for batch in np.array_split(block, 25):
+            summary.update(batch)
+
+        median = summary.quantile(0.5)
+        for j in range(block.shape[1]):
+            values = block[:, j][~np.isnan(block[:, j])]
+            rank = (values < median[j]).mean()
+            assert abs(rank - 0.5) <= summary.relative_rank_error[j] + 1 / len(values)
+        assert (summary.relative_rank_error < 0.05).all()
+
+    def test_value_counts_most_frequent_breaks_ties_like_simple_imputer(self):
+        counts = ValueCounts(["Street"])
+
+        counts.update(pd.DataFrame({"Street": ["Pave", "Grvl", None]}))
+        counts.update(pd.DataFrame({"Street": ["Grvl", "Pave"]}))
+
+        assert counts.most_frequent() == ["Grvl"]